@@ -0,0 +1,283 @@
+"""
+Offline scraper benchmark.
+Starts the local stand-in server, runs each scraper profile against it in a separate process
+and reports throughput, per-film latency percentiles, CPU time and peak RSS.
+
+Usage:
+    python bench/run_benchmark.py --profiles legacy optimized async --films 500 --latency 50
+    python bench/run_benchmark.py --profiles async --http-backends aiohttp httpx --threads 50
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import functools
+import subprocess
+import contextlib
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(REPO_ROOT, 'bench')
+PROFILES = ('legacy', 'optimized', 'async')  # Mirrors src.scrapers.SCRAPER_PROFILES
+HTTP_BACKENDS = ('aiohttp', 'httpx')  # Mirrors src.fetch.HTTP_BACKENDS, async profile only
+BENCH_USER = 'benchuser'
+RECORDED_DIR = os.path.join(BENCH_DIR, 'fixtures', 'films')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def corpus_summary(films):
+    """Return (recorded, synthetic) film page counts of a stand-in corpus of `films` films."""
+    try:
+        recorded = sum(1 for name in os.listdir(RECORDED_DIR) if name.endswith('.html'))
+    except FileNotFoundError:
+        recorded = 0
+    recorded = min(recorded, films)
+    return recorded, films - recorded
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_server(port, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def _time_film_method(scraper, name, latencies):
+    """Wrap a scraper's per-film method on the instance to record wall time per film."""
+    original = getattr(scraper, name)
+    if name.endswith('_async'):
+        @functools.wraps(original)
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+    else:
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+    setattr(scraper, name, timed)
+
+
+def run_worker(args):
+    """Run one scraper profile in this process and print a JSON result line."""
+    sys.path.insert(0, REPO_ROOT)
+    from src.context import AppContext
+    from src.scrapers import create_scraper
+
+    app_context = AppContext()
+    config = app_context.config
+    config.scraper_profile = args.profile
+    config.max_threads = args.threads
+    config.base_url = args.base_url
+    config.film_cache_enabled = args.use_cache
+    config.film_index_enabled = False  # Keep stand-in films out of the local film index
+    if args.parser_backend:
+        config.parser_backend = args.parser_backend
+    if args.parser_processes is not None:
+        config.parser_processes = args.parser_processes
+    if args.http_backend:
+        config.http_backend = args.http_backend
+
+    scraper = create_scraper(app_context, args.profile)
+    film_method = {
+        'legacy': '_scrape_film_page',
+        'optimized': '_scrape_film_page_optimized',
+        'async': '_scrape_film_page_async',
+    }[args.profile]
+    latencies = []
+    _time_film_method(scraper, film_method, latencies)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    # Keep scraper progress output off stdout, which carries the JSON result
+    with contextlib.redirect_stdout(sys.stderr if args.verbose else open(os.devnull, 'w')):
+        scraper.scrape_user_profile(BENCH_USER)
+    wall_time = time.perf_counter() - wall_start
+
+    if resource is not None:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu_time = own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        rss_unit = 1 if sys.platform == 'darwin' else 1024
+        peak_rss_mb = max(own.ru_maxrss, children.ru_maxrss) * rss_unit / (1024 * 1024)
+    else:
+        cpu_time = time.process_time() - cpu_start
+        peak_rss_mb = None
+
+    latencies.sort()
+    films = app_context.stats_data.films_count
+    label = args.profile
+    if type(scraper.fetcher).__name__ == 'HttpxFetcher':
+        label += '+httpx'
+    result = {
+        'profile': label,
+        'films': films,
+        'wall_time_s': wall_time,
+        'films_per_s': films / wall_time if wall_time else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'cpu_time_s': cpu_time,
+        'peak_rss_mb': peak_rss_mb,
+        # Request counters of the shared fetch layer, comparable across profiles
+        'fetch': scraper.fetcher.stats.to_dict() if scraper.fetcher else None,
+        # New connections, traced by the async transports only
+        'connections': scraper.metrics.counters.get('connections_opened') if scraper.metrics else None,
+        # Per-stage timing breakdown (see src/metrics.py)
+        'stages': {
+            stage: {'count': h['count'], 'total_s': h['sum'], 'p50_ms': h['p50'] * 1000, 'p95_ms': h['p95'] * 1000}
+            for stage, h in scraper.metrics.summary()['stages'].items()
+        } if scraper.metrics else None,
+    }
+    print(json.dumps(result))
+
+
+def run_benchmark(args):
+    """Start the stand-in server and benchmark every requested profile against it."""
+    port = args.port or _free_port()
+    server_cmd = [
+        sys.executable, os.path.join(BENCH_DIR, 'stand_in_server.py'),
+        '--port', str(port),
+        '--films', str(args.films),
+        '--latency', str(args.latency),
+        '--jitter', str(args.jitter),
+        '--error-rate', str(args.error_rate),
+        '--retry-after', str(args.retry_after),
+    ]
+    if args.compress:
+        server_cmd.append('--compress')
+    if 'httpx' in args.http_backends:
+        # hypercorn serves HTTP/1.1 and h2c on one port, so every run hits the same server
+        server_cmd.append('--http2')
+    server = subprocess.Popen(server_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    results = []
+    try:
+        if not _wait_for_server(port):
+            print("Stand-in server did not start", file=sys.stderr)
+            return 1
+
+        runs = [
+            (profile, backend)
+            for profile in args.profiles
+            for backend in (args.http_backends if profile == 'async' else [None])
+        ]
+        for profile, backend in runs:
+            for repeat in range(args.repeat):
+                worker_cmd = [
+                    sys.executable, os.path.abspath(__file__), '--worker',
+                    '--profile', profile,
+                    '--threads', str(args.threads),
+                    '--base-url', f"http://127.0.0.1:{port}",
+                ]
+                if backend:
+                    worker_cmd += ['--http-backend', backend]
+                if args.use_cache:
+                    worker_cmd.append('--use-cache')
+                if args.parser_backend:
+                    worker_cmd += ['--parser-backend', args.parser_backend]
+                if args.parser_processes is not None:
+                    worker_cmd += ['--parser-processes', str(args.parser_processes)]
+                if args.verbose:
+                    worker_cmd.append('--verbose')
+
+                completed = subprocess.run(worker_cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+                lines = completed.stdout.strip().splitlines()
+                if completed.returncode != 0 or not lines:
+                    print(f"{profile}: benchmark run failed\n{completed.stderr}", file=sys.stderr)
+                    continue
+                result = json.loads(lines[-1])
+                result['run'] = repeat + 1
+                results.append(result)
+    finally:
+        server.terminate()
+        server.wait()
+
+    recorded, synthetic = corpus_summary(args.films)
+    # Synthetic pages follow Letterboxd's markup but not its page weight, see bench/README.md
+    print(f"Corpus: {recorded} recorded and {synthetic} synthetic film pages")
+    header = f"{'profile':<12}{'run':>4}{'films':>7}{'wall s':>9}{'films/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'cpu s':>8}{'rss MB':>8}{'requests':>10}{'retries':>9}{'conns':>7}{'wire MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] is not None else "n/a"
+        fetch = r.get('fetch') or {}
+        conns = r.get('connections')
+        print(f"{r['profile']:<12}{r['run']:>4}{r['films']:>7}{r['wall_time_s']:>9.2f}{r['films_per_s']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['cpu_time_s']:>8.2f}{rss:>8}"
+              f"{fetch.get('requests', 0):>10}{fetch.get('retries', 0):>9}{conns if conns is not None else 'n/a':>7}"
+              f"{fetch.get('wire_bytes', 0) / (1024 * 1024):>9.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'corpus': {'recorded': recorded, 'synthetic': synthetic},
+                       'results': results}, f, indent=2)
+    return 0 if results else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark LePrAn scraper profiles against a local stand-in server.")
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--films', type=int, default=500, help="Films in the benchmark profile")
+    parser.add_argument('--latency', type=float, default=50.0, help="Server latency in milliseconds")
+    parser.add_argument('--jitter', type=float, default=10.0, help="Server latency jitter in milliseconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--retry-after', type=int, default=0, help="Retry-After seconds sent with 503s")
+    parser.add_argument('--threads', type=int, default=20, help="workerThreadsNumber for the scrapers")
+    parser.add_argument('--parser-backend', choices=['bs4', 'lxml', 'selectolax'])
+    parser.add_argument('--parser-processes', type=int)
+    parser.add_argument('--http-backends', nargs='+', choices=HTTP_BACKENDS, default=['aiohttp'],
+                        help="Transports to run the async profile with; httpx (HTTP/2) needs httpx[http2] "
+                             "and serves the stand-in through hypercorn")
+    parser.add_argument('--use-cache', action='store_true', help="Keep the on-disk film cache enabled")
+    parser.add_argument('--compress', action='store_true',
+                        help="Let the stand-in server compress pages (zstd/brotli when installed, else gzip)")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per profile")
+    parser.add_argument('--port', type=int, default=0, help="Stand-in server port (default: any free port)")
+    parser.add_argument('--json', help="Write all results to this JSON file")
+    parser.add_argument('--verbose', action='store_true', help="Show scraper output on stderr")
+    # Internal: run a single profile inside a worker process
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    parser.add_argument('--http-backend', choices=HTTP_BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args)
+        return 0
+    return run_benchmark(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+Local stand-in for letterboxd.com used by the offline benchmark suite.
+Serves listing and film pages from the fixture corpus with configurable latency, jitter and errors.
+Pages carry an ETag and answer matching If-None-Match requests with 304 Not Modified.
+With --http2 the pages are served by hypercorn, which adds HTTP/2 over cleartext (h2c).
+With --compress pages are compressed with the best coding both sides support (zstd, br, gzip).
+"""
+import os
+import re
+import sys
+import time
+import random
+import gzip
+import string
+import hashlib
+import logging
+import asyncio
+import argparse
+import threading
+from importlib.util import find_spec
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FILMS_PER_PAGE = 72
+
+LISTING_PATTERN = re.compile(r'^/([^/]+)/films/(?:page/(\d+)/)?$')
+FILM_PATTERN = re.compile(r'^/film/([^/]+)/$')
+
+# Pools used to render deterministic synthetic film pages
+DIRECTORS = [f"Director {name}" for name in string.ascii_uppercase]
+ACTORS = [f"Actor {first} {last}" for first in string.ascii_uppercase for last in "ABCDEFGHIJKL"]
+COUNTRIES = ["USA", "UK", "France", "Italy", "Japan", "South Korea", "Germany", "Spain", "Canada", "Mexico"]
+LANGUAGES = ["English", "French", "Italian", "Japanese", "Korean", "German", "Spanish", "No spoken language"]
+GENRES = ["drama", "comedy", "thriller", "horror", "romance", "science fiction", "documentary", "crime", "animation"]
+
+
+def _compressors():
+    """
+    Content codings the server can produce, in order of preference, at levels typical of
+    on-the-fly compression by CDNs (brotli and zstd are only offered when installed).
+    """
+    compressors = {}
+    if find_spec('zstandard') is not None:
+        import zstandard
+        # Compressor objects are not thread-safe, so each page gets its own
+        compressors['zstd'] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+    if find_spec('brotli') is not None:
+        import brotli
+        compressors['br'] = lambda body: brotli.compress(body, quality=5)
+    compressors['gzip'] = lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+    return compressors
+
+
+def _slug(text):
+    """Turn a display name into a Letterboxd-style slug."""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def _links(names, prefix, css_class="text-slug"):
+    """Render a list of names as sluglist links."""
+    return "\n".join(
+        f'\t\t\t\t<a href="{prefix}{_slug(name)}/" class="{css_class}">{name}</a>' for name in names
+    )
+
+
+class FixtureCorpus:
+    """
+    Recorded and synthetic Letterboxd pages.
+    Recorded film pages placed in fixtures/films/<slug>.html are served verbatim and listed first;
+    the rest of the corpus is rendered from film_template.html with deterministic per-slug data.
+    No recorded pages ship with the repository (see bench/README.md), so by default the whole
+    corpus is synthetic.
+    """
+
+    def __init__(self, films, fixtures_dir=FIXTURES_DIR):
+        self.fixtures_dir = fixtures_dir
+        with open(os.path.join(fixtures_dir, 'film_template.html'), encoding='utf-8') as f:
+            self.film_template = string.Template(f.read())
+        with open(os.path.join(fixtures_dir, 'listing_template.html'), encoding='utf-8') as f:
+            self.listing_template = string.Template(f.read())
+        with open(os.path.join(fixtures_dir, 'not_found.html'), encoding='utf-8') as f:
+            self.not_found_page = f.read().encode('utf-8')
+
+        recorded_dir = os.path.join(fixtures_dir, 'films')
+        self.recorded = {}
+        if os.path.isdir(recorded_dir):
+            for name in sorted(os.listdir(recorded_dir)):
+                if name.endswith('.html'):
+                    self.recorded[name[:-5]] = os.path.join(recorded_dir, name)
+
+        self.slugs = list(self.recorded)[:films]
+        self.slugs += [f"bench-film-{i:05d}" for i in range(films - len(self.slugs))]
+        self.slug_set = set(self.slugs)
+        self._film_pages = {}
+        self._lock = threading.Lock()
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.slugs) // FILMS_PER_PAGE))
+
+    def listing_page(self, username, page_num):
+        """Render listing page page_num for any username, or None if out of range."""
+        if page_num < 1 or page_num > self.page_count:
+            return None
+        start = (page_num - 1) * FILMS_PER_PAGE
+        posters = "\n".join(
+            f'\t\t\t<li class="poster-container"><div class="react-component" '
+            f'data-component-class="LazyPoster" data-item-slug="{slug}" '
+            f'data-item-link="/film/{slug}/"></div></li>'
+            for slug in self.slugs[start:start + FILMS_PER_PAGE]
+        )
+        base = f"/{username}/films/page/"
+        previous_html = (
+            f'<div class="paginate-nextprev"><a class="previous" href="{base}{page_num - 1}/">Newer</a></div>'
+            if page_num > 1 else
+            '<div class="paginate-nextprev paginate-disabled"><span class="previous">Newer</span></div>'
+        )
+        next_html = (
+            f'<div class="paginate-nextprev"><a class="next" href="{base}{page_num + 1}/">Older</a></div>'
+            if page_num < self.page_count else
+            '<div class="paginate-nextprev paginate-disabled"><span class="next">Older</span></div>'
+        )
+        pages_html = "\n".join(
+            f'\t\t\t<li class="paginate-page"><a href="{base}{n}/">{n}</a></li>'
+            for n in range(1, self.page_count + 1)
+        )
+        return self.listing_template.substitute(
+            username=username,
+            posters_html=posters,
+            previous_html=previous_html,
+            next_html=next_html,
+            pages_html=pages_html,
+        ).encode('utf-8')
+
+    def film_page(self, slug):
+        """Return the recorded or rendered page for a film slug, or None if unknown."""
+        if slug not in self.slug_set:
+            return None
+        with self._lock:
+            page = self._film_pages.get(slug)
+        if page is not None:
+            return page
+
+        if slug in self.recorded:
+            with open(self.recorded[slug], 'rb') as f:
+                page = f.read()
+        else:
+            page = self._render_film(slug)
+        with self._lock:
+            self._film_pages[slug] = page
+        return page
+
+    def _render_film(self, slug):
+        """Render a synthetic film page whose content is fully determined by the slug."""
+        rng = random.Random(slug)
+        directors = rng.sample(DIRECTORS, rng.choice([1, 1, 1, 2]))
+        actors = rng.sample(ACTORS, rng.randint(5, 40))
+        languages = rng.sample(LANGUAGES, rng.randint(1, 3))
+        return self.film_template.substitute(
+            slug=slug,
+            title=slug.replace('-', ' ').title(),
+            year=rng.randint(1920, 2024),
+            runtime=rng.randint(70, 200),
+            director_names=", ".join(directors),
+            directors_html=_links(directors, "/director/", "contributor"),
+            actors_html=_links(actors, "/actor/", "text-slug tooltip"),
+            countries_html=_links(rng.sample(COUNTRIES, rng.randint(1, 3)), "/films/country/"),
+            primary_language_html=_links(languages[:1], "/films/language/"),
+            languages_html=_links(languages, "/films/language/"),
+            genres_html=_links(rng.sample(GENRES, rng.randint(1, 3)), "/films/genre/"),
+            synopsis=" ".join(rng.choice(ACTORS) for _ in range(40)),
+            reviews_html="\n".join(
+                f"<article class=\"review\"><p>{' '.join(rng.choice(GENRES) for _ in range(120))}</p></article>"
+                for _ in range(12)
+            ),
+        ).encode('utf-8')
+
+
+class StandInSite:
+    """
+    The corpus plus fault-injection settings, independent of the HTTP server in front of it:
+    decides the latency of each request and the response it gets.
+    """
+
+    def __init__(self, corpus, latency=0.0, jitter=0.0, error_rate=0.0, retry_after=0, seed=0, etags=True,
+                 compress=False):
+        self.corpus = corpus
+        self.etags = etags
+        self.compressors = _compressors() if compress else {}
+        self._compressed = {}  # (etag, coding) -> compressed body
+        self._compressed_lock = threading.Lock()
+        self.retry_after = retry_after
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def rng_uniform(self, low, high):
+        with self._rng_lock:
+            return self._rng.uniform(low, high)
+
+    def next_delay(self):
+        """Seconds to hold the next response back."""
+        return self.latency + self.rng_uniform(-self.jitter, self.jitter)
+
+    def respond(self, path, if_none_match=None, accept_encoding=None):
+        """Return (status, body, extra headers) for a GET of path."""
+        if self.error_rate and self.rng_uniform(0.0, 1.0) < self.error_rate:
+            headers = {'Retry-After': str(self.retry_after)} if self.retry_after else None
+            return 503, b"Service temporarily unavailable", headers
+
+        path = path.split('?', 1)[0]
+        match = LISTING_PATTERN.match(path)
+        if match and match.group(1) != 'missing':
+            body = self.corpus.listing_page(match.group(1), int(match.group(2) or 1))
+            if body is not None:
+                return self._page(body, if_none_match, accept_encoding)
+
+        match = FILM_PATTERN.match(path)
+        if match:
+            body = self.corpus.film_page(match.group(1))
+            if body is not None:
+                return self._page(body, if_none_match, accept_encoding)
+
+        return 404, self.corpus.not_found_page, None
+
+    def _page(self, body, if_none_match, accept_encoding=None):
+        """A page with its ETag, or 304 if the client already holds this version."""
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.etags and if_none_match == etag:
+            return 304, b"", {'ETag': etag}
+        headers = {'ETag': etag} if self.etags else {}
+        if self.compressors:
+            accepted = {coding.split(';')[0].strip() for coding in (accept_encoding or '').lower().split(',')}
+            coding = next((coding for coding in self.compressors if coding in accepted), None)
+            headers['Vary'] = 'Accept-Encoding'
+            if coding:
+                with self._compressed_lock:
+                    compressed = self._compressed.get((etag, coding))
+                if compressed is None:
+                    compressed = self.compressors[coding](body)
+                    with self._compressed_lock:
+                        self._compressed[(etag, coding)] = compressed
+                body = compressed
+                headers['Content-Encoding'] = coding
+        return 200, body, headers or None
+
+
+def response_headers(status, body, extra_headers=None):
+    """Header (name, value) pairs of a response."""
+    headers = []
+    if status != 304:
+        headers.append(('Content-Type', 'text/html; charset=utf-8'))
+        headers.append(('Content-Length', str(len(body))))
+    headers.extend((extra_headers or {}).items())
+    return headers
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler serving the fixture corpus with injected latency and errors."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        site = self.server.site
+        delay = site.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        status, body, extra_headers = site.respond(
+            self.path, self.headers.get('If-None-Match'), self.headers.get('Accept-Encoding')
+        )
+        self.send_response(status)
+        for name, value in response_headers(status, body, extra_headers):
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server in front of a StandInSite."""
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address, site):
+        super().__init__(address, StandInHandler)
+        self.site = site
+
+
+def make_asgi_app(site):
+    """ASGI application serving a StandInSite, for servers that also speak HTTP/2 (hypercorn)."""
+    async def app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        delay = site.next_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        request_headers = dict(scope['headers'])
+        if_none_match = request_headers.get(b'if-none-match')
+        accept_encoding = request_headers.get(b'accept-encoding')
+        status, body, extra_headers = site.respond(
+            scope['path'],
+            if_none_match.decode('latin-1') if if_none_match else None,
+            accept_encoding.decode('latin-1') if accept_encoding else None
+        )
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode(), value.encode()) for name, value in
+                        response_headers(status, body, extra_headers)],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+    return app
+
+
+def serve_http2(site, host, port):
+    """Serve a site with hypercorn: HTTP/1.1 and HTTP/2 with prior knowledge (h2c) on one port."""
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config as HypercornConfig
+
+    config = HypercornConfig()
+    config.bind = [f"{host}:{port}"]
+    config.accesslog = None
+    config.backlog = 256
+    asyncio.run(serve(make_asgi_app(site), config))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for letterboxd.com.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--films', type=int, default=500, help="Number of films in every user's profile")
+    parser.add_argument('--latency', type=float, default=50.0, help="Base response latency in milliseconds")
+    parser.add_argument('--jitter', type=float, default=10.0, help="Uniform latency jitter in milliseconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--retry-after', type=int, default=0, help="Retry-After seconds sent with 503s (0: none)")
+    parser.add_argument('--no-etags', action='store_true', help="Do not send ETags or answer conditional requests")
+    parser.add_argument('--compress', action='store_true',
+                        help="Compress pages with zstd, brotli (when installed) or gzip as the client accepts")
+    parser.add_argument('--http2', action='store_true',
+                        help="Serve with hypercorn, which also speaks HTTP/2 over cleartext (h2c)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.http2 and find_spec('hypercorn') is None:
+        parser.error("--http2 needs hypercorn (pip install hypercorn)")
+    corpus = FixtureCorpus(args.films)
+    site = StandInSite(
+        corpus,
+        latency=args.latency / 1000, jitter=args.jitter / 1000,
+        error_rate=args.error_rate, retry_after=args.retry_after, seed=args.seed,
+        etags=not args.no_etags, compress=args.compress
+    )
+    if args.http2:
+        logger.info(f"Stand-in server listening on http://{args.host}:{args.port} with HTTP/2 "
+                    f"({len(corpus.slugs)} films, {corpus.page_count} listing pages)")
+        sys.stdout.flush()
+        try:
+            serve_http2(site, args.host, args.port)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    server = StandInServer((args.host, args.port), site)
+    logger.info(f"Stand-in server listening on http://{args.host}:{server.server_address[1]} "
+                f"({len(corpus.slugs)} films, {corpus.page_count} listing pages)")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Startup import benchmark.
+Runs each startup scenario in a fresh interpreter with `-X importtime` and reports the total
+import time, the heavy dependencies that were loaded and the most expensive modules.
+
+Usage:
+    python bench/startup_importtime.py --scenarios gui cli --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code run by each scenario, in a fresh interpreter started from the repository root
+SCENARIOS = {
+    # Everything imported before MainWindow is constructed
+    'gui': "import lepran; from src.context import AppContext; from src.main_window import MainWindow",
+    # Headless entry point up to argument parsing
+    'cli': "import lepran; import src.cli",
+    # Deferred cost paid the first time each scraper profile runs
+    'scraper-legacy': "import src.scraper_legacy",
+    'scraper-optimized': "import src.scraper_optimized",
+    'scraper-async': "import src.scraper_async",
+    # Wall time until the main window has been shown once (offscreen)
+    'window': (
+        "import sys, lepran; from PyQt6 import QtWidgets; from src.context import AppContext; "
+        "from src.main_window import MainWindow; app = QtWidgets.QApplication(sys.argv[:1]); "
+        "w = MainWindow(AppContext()); w.show(); app.processEvents()"
+    ),
+}
+
+# Top-level packages whose presence is reported for each scenario
+HEAVY_MODULES = ('PyQt6', 'aiohttp', 'requests', 'urllib3', 'bs4', 'lxml', 'selectolax', 'concurrent.futures')
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into (module, self_us, cumulative_us) tuples."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header line
+        entries.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return entries
+
+
+def run_scenario(name, top=10):
+    """Run one scenario in a fresh interpreter and summarize its imports."""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SCENARIOS[name]],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    wall_time = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scenario '{name}' failed:\n{completed.stderr[-2000:]}")
+
+    entries = parse_importtime(completed.stderr)
+    loaded = {module for module, _, _ in entries}
+    return {
+        'scenario': name,
+        'wall_ms': wall_time * 1000,
+        'import_ms': sum(self_us for _, self_us, _ in entries) / 1000,
+        'modules': len(entries),
+        'heavy': [module for module in HEAVY_MODULES if module in loaded],
+        'top': [
+            {'module': module, 'self_ms': self_us / 1000}
+            for module, self_us, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure LePrAn startup import cost with -X importtime.")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=['gui', 'cli'])
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per scenario; the fastest run is reported")
+    parser.add_argument('--top', type=int, default=10, help="Slowest modules to list per scenario")
+    parser.add_argument('--json', help="Write all results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.scenarios:
+        runs = [run_scenario(name, args.top) for _ in range(args.repeat)]
+        results.append(min(runs, key=lambda r: r['import_ms']))
+
+    for r in results:
+        print(f"{r['scenario']}: {r['import_ms']:.1f} ms in imports ({r['modules']} modules), "
+              f"{r['wall_ms']:.0f} ms wall")
+        print(f"  heavy dependencies loaded: {', '.join(r['heavy']) or 'none'}")
+        for entry in r['top']:
+            print(f"  {entry['self_ms']:>8.1f} ms  {entry['module']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,13 @@
 """
 LePrAn - Letterboxd Profile Analyzer
 Main application entry point.
+Without arguments the GUI is started; with arguments (e.g. `python -m lepran <username>`)
+the headless CLI runs instead and PyQt6 is never imported.
 """
 import sys
 import logging
+import multiprocessing
 
-from PyQt6 import QtWidgets, QtGui
-from src.context import AppContext
-from src.main_window import MainWindow
 import colorama
 colorama.init()
 
@@ -20,14 +20,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Suppress urllib3 connection pool full warnings globally using logging
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
 
-
-def main():
-    """Main application entry point."""
+def run_gui():
+    """Start the Qt application."""
+    from PyQt6 import QtWidgets, QtGui
+    from src.context import AppContext
+    from src.main_window import MainWindow
+    
     try:
         # Create application context for dependency injection
         app_context = AppContext()
@@ -53,6 +52,17 @@ def main():
         sys.exit(1)
 
 
+def main(argv=None):
+    """Main application entry point."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        from src.cli import main as cli_main
+        sys.exit(cli_main(argv))
+    run_gui()
+
+
 if __name__ == "__main__":
+    # Required for the parser process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     colorama.init()
     main()
\ No newline at end of file
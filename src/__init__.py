@@ -1,5 +1,24 @@
 from .config import *
 from .data_models import *
 from .data_manager import *
-from .main_window import *
-from .scraper_optimized import *
\ No newline at end of file
+
+# Heavy or Qt-dependent names, imported on first access so startup only pays for what it uses
+_LAZY_NAMES = {
+    'MainWindow': 'main_window',
+    'LoginThread': 'main_window',
+    'GUIModels': 'gui_models',
+    'LetterboxdScraper': 'scraper_optimized',
+    'LegacyLetterboxdScraper': 'scraper_legacy',
+    'AsyncLetterboxdScraper': 'scraper_async',
+    'create_scraper': 'scrapers',
+}
+
+
+def __getattr__(name):
+    """Resolve lazily imported names on first access."""
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    module = importlib.import_module(f".{module_name}", __name__)
+    return getattr(module, name)
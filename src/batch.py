@@ -0,0 +1,176 @@
+"""
+Multi-user batch analysis.
+Analyzes many profiles in one run: each unique film is fetched once over a shared session
+and its record is fanned out into per-user statistics.
+"""
+import time
+import asyncio
+import logging
+from .data_models import StatisticsData
+from .film_cache import film_key
+from .film_index import index_profile
+from .metrics import finish_run
+from .progress import ProgressBar
+from .scraper_async import AsyncLetterboxdScraper
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class BatchAnalyzer(AsyncLetterboxdScraper):
+    """
+    Batch engine on top of the async scraper:
+    - One session, adaptive limiter, film cache and parser pool for all users
+    - Listing pages of several users are walked concurrently and feed a single film queue
+    - Film slugs are deduplicated across users, so films shared by many profiles are fetched once
+    - Extracted records are kept in memory and aggregated into one StatisticsData per user
+    """
+
+    def __init__(self, app_context, max_concurrent_users=8):
+        super().__init__(app_context)
+        self.max_concurrent_users = max_concurrent_users
+        self.records = {}  # film key -> extracted record
+        self.listed_films = 0  # film URLs across all users, before deduplication
+
+    async def _collect_user(self, username, queue, semaphore):
+        """
+        Walk one user's listing pages, queueing their films as each page arrives.
+        Returns the user's film URLs in listing order, or None if the user does not exist.
+        """
+        async with semaphore:
+            first_page = await self._fetch_listing_page(f"{self.base_url}/{username}/films/")
+            if first_page is None:
+                logger.error(f"User '{username}' not found")
+                return None
+            pages = {}
+            await self._produce_film_urls(username, first_page, queue, set(), pages)
+
+        film_urls = [url for page_num in sorted(pages) for url in pages[page_num]]
+        self.listed_films += len(film_urls)
+        return film_urls
+
+    async def _batch_worker(self, queue, scheduled):
+        """Fetch queued films until a None sentinel arrives, skipping films already scheduled."""
+        while True:
+            url = await queue.get()
+            if url is None:
+                return
+            self._observe_queue_wait(url)
+            key = film_key(url)
+            if key not in scheduled:
+                scheduled.add(key)
+                try:
+                    film_data = await self._fetch_film_record(url)
+                except Exception as e:
+                    logger.error(f"Error scraping {url}: {e}")
+                    film_data = None
+                if film_data is not None:
+                    self.records[key] = film_data
+
+            # Every queued film counts, so films shared by several users are done once fetched
+            self.processed_count += 1
+            self.progress.update(self.processed_count, self.total_films)
+
+    async def _run_workers(self, queue, producers):
+        """Run film workers until the producers are done and the queue is drained."""
+        scheduled = set()
+        workers = [
+            asyncio.create_task(self._batch_worker(queue, scheduled))
+            for _ in range(self.max_concurrency_limit)
+        ]
+        try:
+            results = await asyncio.gather(*producers)
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        return results
+
+    def _build_user_stats(self, film_urls):
+        """Aggregate the shared film records into a StatisticsData for one user."""
+        stats = StatisticsData()
+        runtime_total = 0
+        for url in film_urls:
+            stats.add_url(url)
+            film_data = self.records.get(film_key(url))
+            if film_data is None:
+                continue
+            with self.metrics.time('aggregate'):
+                stats.add_film_record(url, film_data)
+            if film_data['runtime'] > 0:
+                runtime_total += film_data['runtime']
+
+        # Films that could not be downloaded are left for the user's next incremental run
+        stats.defer_urls([url for url in film_urls if url not in stats.film_table])
+        stats.rebuild_counters()
+        hrs = runtime_total / 60
+        scraped_when = time.strftime("%d/%m/%Y", time.localtime())
+        stats.set_meta_data(len(stats.url_list), hrs, hrs / 24, scraped_when)
+        return stats
+
+    async def analyze_async(self, usernames):
+        """
+        Analyze all users in one run.
+        Returns {username: StatisticsData}, with None for users that could not be found.
+        """
+        usernames = list(dict.fromkeys(usernames))
+        results = {}
+        try:
+            await self._start()
+            print(f"Analyzing {len(usernames)} users with batch scraper...")
+            start_time = time.time()
+            self.processed_count = 0
+            self.total_films = 0
+            self.progress = ProgressBar()
+
+            queue = asyncio.Queue()
+            semaphore = asyncio.Semaphore(self.max_concurrent_users)
+            film_lists = await self._run_workers(
+                queue, [self._collect_user(username, queue, semaphore) for username in usernames]
+            )
+
+            # Give films that exhausted their retries one more pass at the adapted concurrency
+            failed_urls = self.fetcher.failed_urls
+            retry_urls = list(dict.fromkeys(
+                url for url in failed_urls if '/film/' in url and film_key(url) not in self.records
+            ))
+            self.progress.finish()
+            if retry_urls:
+                failed_urls[:] = [url for url in failed_urls if url not in retry_urls]
+                print(f"Retrying {len(retry_urls)} films that failed to download...")
+                self.processed_count = 0
+                self.total_films = len(retry_urls)
+                self.progress = ProgressBar(len(retry_urls))
+                retry_queue = asyncio.Queue()
+                for url in retry_urls:
+                    retry_queue.put_nowait(url)
+                await self._run_workers(retry_queue, [])
+                self.progress.finish()
+            if failed_urls:
+                logger.warning(f"{len(failed_urls)} pages could not be downloaded and were skipped")
+
+            for username, film_urls in zip(usernames, film_lists):
+                results[username] = self._build_user_stats(film_urls) if film_urls is not None else None
+                if results[username] is not None:
+                    index_profile(self.app_context, username, results[username])
+
+            total_time = time.time() - start_time
+            print(f"\nUsers analyzed: {sum(1 for stats in results.values() if stats is not None)}/{len(usernames)}")
+            print(f"Films listed: {self.listed_films}, unique films: {len(self.records)}")
+            print(f"Total time: {total_time:.1f}s")
+            finish_run(self.metrics, self.app_context.config, ','.join(usernames), profile='batch',
+                       films=len(self.records))
+
+        except Exception as e:
+            logger.error(f"Error in batch scraping: {e}")
+            raise
+        finally:
+            await self._close()
+        return results
+
+    def analyze(self, usernames):
+        """Synchronous wrapper for batch analysis."""
+        return asyncio.run(self.analyze_async(usernames))
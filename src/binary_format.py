@@ -0,0 +1,145 @@
+"""
+Binary columnar container used for saved statistics (.lpb files).
+
+Layout:
+    8 bytes   magic (MAGIC)
+    4 bytes   header length, little-endian uint32
+    N bytes   UTF-8 JSON header: {"version", "meta", "blocks": {name: [offset, length, kind]}}
+    ...       data blocks, each starting on an 8-byte boundary; offsets are relative to
+              the first block (the header end rounded up to 8 bytes)
+
+Block kinds are "str" (UTF-8 strings joined with NUL) or an array typecode ("I", "H")
+stored little-endian. Files are memory-mapped on load, so each block is materialized with
+a single bulk copy or decode instead of per-row parsing.
+"""
+import sys
+import json
+import mmap
+import struct
+from array import array
+
+
+MAGIC = b'LEPRANB\x01'
+FORMAT_VERSION = 1
+BINARY_SUFFIX = '.lpb'
+_ALIGN = 8
+_SEPARATOR = '\x00'
+
+
+def _aligned(size):
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def is_binary_file(path):
+    """Return True if the file starts with the binary statistics magic."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_file(path, meta, blocks):
+    """
+    Write a container. blocks maps block names to either a list of strings
+    or an array.array of a fixed-size integer typecode.
+    """
+    payloads = []
+    index = {}
+    offset = 0
+    for name, value in blocks.items():
+        if isinstance(value, array):
+            kind = value.typecode
+            if sys.byteorder != 'little':
+                value = array(value.typecode, value)
+                value.byteswap()
+            data = value.tobytes()
+        else:
+            kind = 'str'
+            if any(_SEPARATOR in item for item in value):
+                raise ValueError(f"Block {name} contains a NUL character")
+            data = _SEPARATOR.join(value).encode('utf-8') if value else b''
+        index[name] = [offset, len(data), kind, len(value)]
+        payloads.append((offset, data))
+        offset = _aligned(offset + len(data))
+
+    header = json.dumps(
+        {'version': FORMAT_VERSION, 'meta': meta, 'blocks': index}, ensure_ascii=False
+    ).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 4 + len(header))
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.write(b'\x00' * (data_start - f.tell()))
+        for block_offset, data in payloads:
+            f.write(b'\x00' * (data_start + block_offset - f.tell()))
+            f.write(data)
+
+
+class BinaryFile:
+    """Read-only, memory-mapped view of a container. Use as a context manager."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a binary statistics file")
+        try:
+            if self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a binary statistics file")
+            (header_len,) = struct.unpack_from('<I', self._map, len(MAGIC))
+            header_start = len(MAGIC) + 4
+            header = json.loads(self._map[header_start:header_start + header_len].decode('utf-8'))
+            if header.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported binary statistics version: {header.get('version')}")
+        except Exception:
+            self.close()
+            raise
+        self.meta = header.get('meta', {})
+        self.blocks = header.get('blocks', {})
+        self._data_start = _aligned(header_start + header_len)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __contains__(self, name):
+        return name in self.blocks
+
+    def _slice(self, name):
+        offset, length, kind, count = self.blocks[name]
+        start = self._data_start + offset
+        if start + length > len(self._map):
+            raise ValueError(f"Block {name} extends past the end of {self.path}")
+        return self._map[start:start + length], kind, count
+
+    def strings(self, name):
+        """Return a string block as a list."""
+        data, kind, count = self._slice(name)
+        if kind != 'str':
+            raise ValueError(f"Block {name} is not a string block")
+        if not count:
+            return []
+        return data.decode('utf-8').split(_SEPARATOR)
+
+    def ints(self, name):
+        """Return an integer block as an array.array."""
+        data, kind, _ = self._slice(name)
+        values = array(kind)
+        values.frombytes(data)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
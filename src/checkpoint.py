@@ -0,0 +1,235 @@
+"""
+Resumable scrape checkpoints.
+Periodically writes the state of a running scrape (collected film URLs, counted films,
+partial statistics, failed URLs) to disk so an interrupted run can continue where it stopped.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from typing import NamedTuple
+from .data_models import CATEGORY_FIELDS, InternedCounter
+from .film_table import FilmTable
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+# Older checkpoints describe a profile that has probably changed too much to be worth resuming
+MAX_CHECKPOINT_AGE = 7 * 86400
+
+COUNTER_ATTRS = tuple(attr for _, attr in CATEGORY_FIELDS) + ('decade_dict',)
+
+
+def checkpoint_path(config, username):
+    """Return the checkpoint file of a user."""
+    return os.path.join(config.checkpoint_dir, f"{username.lower()}.json")
+
+
+class ResumeState(NamedTuple):
+    """An interrupted scrape, as restored from its checkpoint."""
+    incremental: bool
+    previous_films: int        # Films of the result an incremental run extends
+    previous_hours: float
+    known_urls: list           # Film URLs of that result
+    film_urls: list            # New film URLs collected before the interruption, in listing order
+    listing_complete: bool     # Whether film_urls covers every listing page
+    done: set                  # Film URLs already counted into the restored statistics
+    done_minutes: int          # Total runtime of those films
+    failed_urls: list
+
+
+class Checkpointer:
+    """
+    Writes the checkpoint of one scrape. Scrapers call films_added() after counting films;
+    a checkpoint is written at most every `interval` seconds. Counted films are recovered
+    from the film table, so only films counted with add_film_records can be resumed.
+    Safe to call from several threads; a call arriving while a checkpoint is being
+    written returns immediately.
+    """
+
+    def __init__(self, path, stats_data, username, profile, base_url, interval=30.0):
+        self.path = path
+        self.stats_data = stats_data
+        self.username = username
+        self.profile = profile
+        self.base_url = base_url
+        self.interval = interval
+        self.incremental = False
+        self.previous_films = 0
+        self.previous_hours = 0.0
+        self.known_count = 0
+        self.film_urls = None          # Callable returning the new film URLs collected so far
+        self.failed_urls = None        # Callable returning the URLs that could not be downloaded
+        self.listing_complete = False
+        self.started = False
+        self.saves = 0
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_user(cls, app_context, username, profile):
+        """Return the checkpointer of a scrape, or None when checkpoints are disabled in config."""
+        config = app_context.config
+        if config.checkpoint_interval <= 0:
+            return None
+        return cls(checkpoint_path(config, username), app_context.stats_data, username, profile,
+                   config.base_url, config.checkpoint_interval)
+
+    def start(self, incremental, previous_films, previous_hours, known_count, film_urls, failed_urls):
+        """
+        Describe the run: the result it extends (the first known_count entries of the stats
+        URL list) and callables returning the collected and the failed film URLs.
+        No checkpoint is written before start, so an earlier one is never replaced by an empty one.
+        """
+        self.incremental = incremental
+        self.previous_films = previous_films
+        self.previous_hours = previous_hours
+        self.known_count = known_count
+        self.film_urls = film_urls
+        self.failed_urls = failed_urls
+        self.started = True
+        self._last_save = time.monotonic()
+
+    def films_added(self, count=1):
+        """Record newly counted films and write a checkpoint if one is due."""
+        if time.monotonic() - self._last_save < self.interval:
+            return
+        self.save()
+
+    def save(self):
+        """Write the checkpoint now (atomically: readers never see a partial file)."""
+        if not self.started or not self._lock.acquire(blocking=False):
+            return  # Not started yet, or another thread is writing one
+        try:
+            self._last_save = time.monotonic()
+            stats = self.stats_data
+            # Serialized under the stats lock so the counters, the film table and the
+            # URL lists describe the same set of counted films
+            with stats.lock:
+                document = json.dumps({
+                    'version': CHECKPOINT_VERSION,
+                    'username': self.username,
+                    'profile': self.profile,
+                    'base_url': self.base_url,
+                    'saved_at': time.time(),
+                    'incremental': self.incremental,
+                    'previous_films': self.previous_films,
+                    'previous_hours': self.previous_hours,
+                    'known_urls': stats.url_list[:self.known_count],
+                    'film_urls': list(self.film_urls()),
+                    'listing_complete': self.listing_complete,
+                    'failed_urls': list(self.failed_urls()),
+                    'counters': {
+                        attr: {'names': getattr(stats, attr).vocabulary(), 'counts': getattr(stats, attr).counts.tolist()}
+                        for attr in COUNTER_ATTRS
+                    },
+                    'film_table': stats.film_table.to_dict(),
+                    'table_complete': stats.table_complete,
+                }, ensure_ascii=False, separators=(',', ':'))
+            _write_atomic(self.path, document)
+            self.saves += 1
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write scrape checkpoint {self.path}: {e}")
+        finally:
+            self._lock.release()
+
+    def discard(self):
+        """Remove the checkpoint once the scrape has completed."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove scrape checkpoint {self.path}: {e}")
+
+
+def _write_atomic(path, text):
+    """Write a file through a temporary sibling and an atomic rename."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(app_context, username, profile):
+    """
+    Restore an interrupted scrape of a user into app_context.stats_data and return its
+    ResumeState, or None (leaving the statistics untouched) when resuming is disabled or
+    there is no usable checkpoint. Only checkpoints written by the same scraper profile
+    are resumed, since each profile extracts film records under its own rules.
+    """
+    config = app_context.config
+    if not config.resume_scrapes:
+        return None
+    path = checkpoint_path(config, username)
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable scrape checkpoint {path}: {e}")
+        return None
+
+    if data.get('version') != CHECKPOINT_VERSION:
+        logger.warning(f"Ignoring scrape checkpoint {path}: unsupported version {data.get('version')}")
+        return None
+    if data.get('base_url') != config.base_url:
+        logger.info(f"Ignoring scrape checkpoint {path}: it was written for {data.get('base_url')}")
+        return None
+    if data.get('profile') != profile:
+        logger.info(f"Ignoring scrape checkpoint {path}: it was written by the {data.get('profile')} profile")
+        return None
+    if time.time() - data.get('saved_at', 0) > MAX_CHECKPOINT_AGE:
+        logger.info(f"Ignoring scrape checkpoint {path}: older than {MAX_CHECKPOINT_AGE // 86400} days")
+        return None
+
+    try:
+        table = FilmTable.from_dict(data['film_table'])
+        counters = {
+            attr: InternedCounter.from_counts(data['counters'][attr]['names'], data['counters'][attr]['counts'])
+            for attr in COUNTER_ATTRS
+        }
+        film_urls = list(data['film_urls'])
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring corrupt scrape checkpoint {path}: {e}")
+        return None
+
+    done = {url for url in film_urls if url in table}
+    done_minutes = sum(table.runtimes[table.rows[url]] for url in done)
+
+    stats = app_context.stats_data
+    stats.reset()
+    with stats.lock:
+        for url in data['known_urls']:
+            if url not in stats.url_set:
+                stats.url_set.add(url)
+                stats.url_list.append(url)
+        for attr, counter in counters.items():
+            setattr(stats, attr, counter)
+        stats.film_table = table
+        stats.table_complete = data.get('table_complete', False)
+        stats.films_count = data['previous_films']
+        stats.total_hours = data['previous_hours']
+        stats.total_days = data['previous_hours'] / 24
+
+    print(f"Resuming interrupted scrape of {username}: {len(done)} of {len(film_urls)} "
+          f"{'' if data['listing_complete'] else 'collected '}films already analyzed")
+    return ResumeState(
+        incremental=data['incremental'],
+        previous_films=data['previous_films'],
+        previous_hours=data['previous_hours'],
+        known_urls=list(data['known_urls']),
+        film_urls=film_urls,
+        listing_complete=data['listing_complete'],
+        done=done,
+        done_minutes=done_minutes,
+        failed_urls=list(data['failed_urls']),
+    )
@@ -0,0 +1,242 @@
+"""
+Command line interface.
+Headless analysis of one or more profiles with JSON, CSV or binary (.lpb) output. Never imports PyQt6.
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+import contextlib
+
+from .context import AppContext
+from .data_manager import StatisticsCSVHandler, StatisticsBinaryHandler
+from .film_index import index_key
+from .ranking import top_items
+from .scrapers import SCRAPER_PROFILES, create_scraper, run_scrape
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+STAT_SECTIONS = (
+    ('languages', 'lang_dict'),
+    ('countries', 'country_dict'),
+    ('genres', 'genre_dict'),
+    ('directors', 'director_dict'),
+    ('actors', 'actor_dict'),
+    ('decades', 'decade_dict'),
+)
+
+# Film index filters: CLI option -> film category
+INDEX_FILTERS = (
+    ('director', 'directors'),
+    ('actor', 'actors'),
+    ('genre', 'genres'),
+    ('country', 'countries'),
+    ('language', 'languages'),
+)
+
+
+def stats_to_dict(username, stats_data, top=None):
+    """Build a JSON-serializable result for one user, each section ordered by count."""
+    result = {
+        'username': username,
+        'scraped_at': stats_data.gui_scraped_at,
+        'films': stats_data.films_count,
+        'hours': round(stats_data.total_hours, 2),
+        'days': round(stats_data.total_days, 2),
+    }
+    for section, attr in STAT_SECTIONS:
+        result[section] = dict(top_items(getattr(stats_data, attr), top or None))
+    return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='lepran',
+        description="Analyze Letterboxd profiles without the GUI. Run without arguments to start the GUI."
+    )
+    parser.add_argument('usernames', nargs='*', help="Letterboxd usernames to analyze")
+    parser.add_argument('--profile', choices=SCRAPER_PROFILES,
+                        help="Scraper profile (default: scraperProfile from the config)")
+    parser.add_argument('--format', choices=('json', 'csv', 'lpb'), default='json',
+                        help="Output format: JSON document, or one CSV / binary .lpb file per user (default: json)")
+    parser.add_argument('-o', '--output',
+                        help="JSON: output file (default: stdout). CSV/lpb: output directory (default: current directory)")
+    parser.add_argument('--top', type=int, help="JSON: only keep the N most frequent entries per section")
+    parser.add_argument('--incremental', action='store_true',
+                        help="CSV/lpb: only scrape films added since the user's existing file in the output directory")
+    parser.add_argument('--threads', type=int, help="Override workerThreadsNumber")
+    parser.add_argument('--http-backend', choices=('aiohttp', 'httpx'),
+                        help="Async transport: aiohttp (HTTP/1.1) or httpx (HTTP/2, needs httpx[http2])")
+    parser.add_argument('--base-url', help="Override baseUrl (e.g. a local stand-in server)")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the on-disk film cache for this run")
+    parser.add_argument('--no-batch', action='store_true',
+                        help="Analyze users one by one instead of with the shared batch engine")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="Start over instead of resuming an interrupted scrape from its checkpoint")
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help="Write per-stage timing metrics of each scrape to this JSON file "
+                             "('{username}' is replaced by the user)")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Hide scraper progress output")
+
+    query = parser.add_argument_group(
+        'film index queries',
+        "Answered from the local index of previously analyzed profiles, without network access. "
+        "Filters combine; the matching films are printed as JSON."
+    )
+    for option, category in INDEX_FILTERS:
+        query.add_argument(f'--{option}', metavar='NAME', help=f"Films whose {category} include NAME")
+    query.add_argument('--decade', help="Films of a decade (e.g. 1990s)")
+    query.add_argument('--year', type=int, help="Films released in a year")
+    query.add_argument('--watched-by', metavar='USER', help="Films watched by an analyzed user")
+    query.add_argument('--who-watched', metavar='FILM', help="Analyzed users who watched a film (slug or URL)")
+    return parser
+
+
+def query_index(film_index, args):
+    """Answer the film index options of the command line. Returns a JSON-serializable result."""
+    if args.who_watched:
+        return {'film': index_key(args.who_watched), 'users': film_index.watched_by(args.who_watched)}
+    criteria = {category: getattr(args, option) for option, category in INDEX_FILTERS if getattr(args, option)}
+    return film_index.find_films(args.decade, args.year, args.watched_by, **criteria)
+
+
+def analyze_user(app_context, username, profile=None, incremental=False):
+    """Scrape one profile into app_context.stats_data. Returns False if it could not be analyzed."""
+    scraper = create_scraper(app_context, profile)
+    return run_scrape(scraper, app_context.stats_data, username, incremental)
+
+
+def main(argv=None):
+    """Run the CLI. Returns the process exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    querying = args.who_watched or args.decade or args.year or args.watched_by or any(
+        getattr(args, option) for option, _ in INDEX_FILTERS
+    )
+    if querying and args.usernames:
+        parser.error("film index queries cannot be combined with usernames to analyze")
+    if not querying and not args.usernames:
+        parser.error("the following arguments are required: usernames")
+
+    app_context = AppContext()
+    config = app_context.config
+    if args.threads:
+        config.max_threads = args.threads
+    if args.base_url:
+        config.base_url = args.base_url
+    if args.http_backend:
+        config.http_backend = args.http_backend
+    if args.no_cache:
+        config.film_cache_enabled = False
+    if args.no_resume:
+        config.resume_scrapes = False
+    if args.metrics_json:
+        config.metrics_file = args.metrics_json
+    if args.metrics_port is not None:
+        config.metrics_port = args.metrics_port
+
+    if querying:
+        if app_context.film_index is None:
+            logger.error("The film index is disabled (filmIndexEnabled:false in cfg/config.txt)")
+            return 1
+        try:
+            document = query_index(app_context.film_index, args)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(document, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write('\n')
+        return 0
+
+    file_dir = (args.output or '.') if args.format != 'json' else None
+    if file_dir:
+        os.makedirs(file_dir, exist_ok=True)
+
+    def file_path_for(username):
+        return os.path.join(file_dir, f"{username}.{args.format}") if file_dir else None
+
+    results = []
+    failed = []
+
+    def write_result(username, stats):
+        path = file_path_for(username)
+        if path and args.format == 'lpb':
+            StatisticsBinaryHandler(stats).save_to_binary(
+                username, stats.gui_scraped_at, stats.films_count, stats.total_hours, stats.total_days, path
+            )
+        elif path:
+            StatisticsCSVHandler(stats).save_to_csv(
+                username, stats.gui_scraped_at, stats.films_count, stats.total_hours, stats.total_days, path
+            )
+        else:
+            results.append(stats_to_dict(username, stats, args.top))
+
+    # Several users without incremental state share one session and fetch each film once
+    use_batch = (len(args.usernames) > 1 and not args.incremental and not args.no_batch
+                 and (args.profile or config.scraper_profile) == 'async')
+    usernames = [] if use_batch else args.usernames
+    if use_batch:
+        from .batch import BatchAnalyzer
+        progress = open(os.devnull, 'w') if args.quiet else sys.stderr
+        try:
+            with contextlib.redirect_stdout(progress):
+                batch_results = BatchAnalyzer(app_context).analyze(args.usernames)
+        finally:
+            if args.quiet:
+                progress.close()
+        for username, stats in batch_results.items():
+            if stats is None:
+                failed.append(username)
+            else:
+                write_result(username, stats)
+
+    for username in usernames:
+        path = file_path_for(username)
+        incremental = False
+        app_context.reset_stats()
+        if args.incremental and path and os.path.exists(path):
+            if args.format == 'lpb':
+                loaded = StatisticsBinaryHandler(app_context.stats_data).load_from_binary(path)
+            else:
+                loaded = StatisticsCSVHandler(app_context.stats_data).load_from_csv(path)
+            incremental = loaded is not None
+
+        # Scraper progress goes to stderr so stdout only carries the results
+        progress = open(os.devnull, 'w') if args.quiet else sys.stderr
+        try:
+            with contextlib.redirect_stdout(progress):
+                ok = analyze_user(app_context, username, args.profile, incremental)
+        except Exception as e:
+            logger.error(f"Analysis of '{username}' failed: {e}")
+            ok = False
+        finally:
+            if args.quiet:
+                progress.close()
+
+        if not ok:
+            failed.append(username)
+            continue
+
+        write_result(username, app_context.stats_data)
+
+    if args.format == 'json':
+        document = results[0] if len(args.usernames) == 1 and results else results
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(document, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write('\n')
+
+    if failed:
+        logger.error(f"Could not analyze: {', '.join(failed)}")
+        return 1
+    return 0
@@ -0,0 +1,117 @@
+"""
+Adaptive concurrency control.
+AIMD limiter that sizes the number of in-flight requests from observed latency and server pushback.
+"""
+import time
+import asyncio
+import logging
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Request outcomes reported to the limiter
+OUTCOME_OK = 'ok'
+OUTCOME_THROTTLED = 'throttled'  # HTTP 429/503
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_ERROR = 'error'
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent requests.
+    - Each successful request grows the window by about one slot per full window of completions
+      while the p95 latency stays within latency_tolerance of the best p95 seen so far.
+    - HTTP 429/503, timeouts or a rising p95 shrink the window by decrease_factor,
+      at most once per cooldown period so a burst of failures counts as one signal.
+    - A Retry-After from the server pauses all new requests until it has elapsed.
+    """
+
+    def __init__(self, initial, min_limit=4, max_limit=200, decrease_factor=0.5,
+                 latency_window=100, latency_tolerance=2.0, cooldown=1.0):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.baseline_p95 = None
+        self.throttled_count = 0
+        self._completions = 0
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait for a free slot (and for any Retry-After pause) before sending a request."""
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+                if self._paused_until <= time.monotonic():
+                    self.in_flight += 1
+                    return
+
+    async def release(self, latency, outcome, retry_after=None):
+        """Return a slot and adjust the window from the request's latency and outcome."""
+        async with self._condition:
+            self.in_flight -= 1
+            if outcome == OUTCOME_OK:
+                self._on_success(latency)
+            elif outcome in (OUTCOME_THROTTLED, OUTCOME_TIMEOUT):
+                if outcome == OUTCOME_THROTTLED:
+                    self.throttled_count += 1
+                self._decrease(f"{outcome} response")
+                if retry_after:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self._condition.notify_all()
+
+    def _on_success(self, latency):
+        self.latencies.append(latency)
+        self._completions += 1
+
+        # Re-evaluate tail latency once per half window of completions
+        if self._completions % max(1, self.latencies.maxlen // 2) == 0 and len(self.latencies) >= 20:
+            ordered = sorted(self.latencies)
+            p95 = ordered[int(len(ordered) * 0.95) - 1]
+            if self.baseline_p95 is None or p95 < self.baseline_p95:
+                self.baseline_p95 = p95
+            elif p95 > self.baseline_p95 * self.latency_tolerance:
+                self._decrease(f"p95 latency rose to {p95 * 1000:.0f}ms")
+                return
+
+        # Additive increase: roughly +1 slot per window's worth of successful requests
+        self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def _decrease(self, reason):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        old_limit = self.limit
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        # Latency measured at the old window size no longer describes the new one
+        self.latencies.clear()
+        self.baseline_p95 = None
+        logger.debug(f"Concurrency limit {old_limit:.1f} -> {self.limit:.1f} ({reason})")
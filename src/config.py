@@ -18,6 +18,26 @@ class Config:
         self.max_threads = 20
         self.list_delim = 200
         self.scraper_profile = "async"  # Use "legacy", "optimized", or "async"
+        self.incremental_scrape = True
+        self.base_url = "https://letterboxd.com"
+        self.stream_film_pages = True
+        self.film_page_early_close = False  # Drop the connection instead of draining skipped page tails
+        self.compression = True  # Accept gzip/deflate plus brotli and zstd when installed, false asks for identity
+        self.parser_processes = 4  # Film page parser processes for the async scraper, 0 parses inline
+        self.parser_backend = "lxml"  # Use "bs4" (reference), "lxml" or "selectolax"
+        self.http_backend = "aiohttp"  # Async profile transport: "aiohttp" (HTTP/1.1) or "httpx" (HTTP/2)
+        self.film_cache_enabled = True
+        self.conditional_requests = True
+        self.film_cache_ttl_days = 30
+        self.film_cache_max_entries = 50000
+        self.film_cache_path = self.get_resource_path('cache/film_cache.sqlite')
+        self.metrics_file = ""  # JSON summary of each scrape's timings, empty disables it
+        self.metrics_port = 0  # Port of the Prometheus /metrics endpoint, 0 disables it
+        self.checkpoint_interval = 30  # Seconds between checkpoints of a running scrape, 0 disables them
+        self.resume_scrapes = True  # Continue an interrupted scrape of the same user from its checkpoint
+        self.checkpoint_dir = self.get_resource_path('cache/checkpoints')
+        self.film_index_enabled = True  # Index analyzed films and watch lists for offline queries
+        self.film_index_path = self.get_resource_path('cache/film_index.sqlite')
         self.config_path = self.get_resource_path('cfg/config.txt')
         self.load_config()
     
@@ -43,6 +63,42 @@ class Config:
                             elif key == 'scraperProfile':
                                 if value.lower() in ['legacy', 'optimized', 'async']:
                                     self.scraper_profile = value.lower()
+                            elif key == 'parserBackend':
+                                if value.lower() in ['bs4', 'lxml', 'selectolax']:
+                                    self.parser_backend = value.lower()
+                            elif key == 'httpBackend':
+                                if value.lower() in ['aiohttp', 'httpx']:
+                                    self.http_backend = value.lower()
+                            elif key == 'streamFilmPages':
+                                self.stream_film_pages = value.lower() == 'true'
+                            elif key == 'filmPageEarlyClose':
+                                self.film_page_early_close = value.lower() == 'true'
+                            elif key == 'compression':
+                                self.compression = value.lower() == 'true'
+                            elif key == 'parserProcesses':
+                                self.parser_processes = max(0, int(value))
+                            elif key == 'baseUrl':
+                                self.base_url = value.strip()
+                            elif key == 'incrementalScrape':
+                                self.incremental_scrape = value.lower() == 'true'
+                            elif key == 'filmCacheEnabled':
+                                self.film_cache_enabled = value.lower() == 'true'
+                            elif key == 'conditionalRequests':
+                                self.conditional_requests = value.lower() == 'true'
+                            elif key == 'filmCacheTTLDays':
+                                self.film_cache_ttl_days = int(value)
+                            elif key == 'filmCacheMaxEntries':
+                                self.film_cache_max_entries = int(value)
+                            elif key == 'metricsFile':
+                                self.metrics_file = value.strip()
+                            elif key == 'metricsPort':
+                                self.metrics_port = max(0, int(value))
+                            elif key == 'checkpointInterval':
+                                self.checkpoint_interval = max(0, int(value))
+                            elif key == 'resumeScrapes':
+                                self.resume_scrapes = value.lower() == 'true'
+                            elif key == 'filmIndexEnabled':
+                                self.film_index_enabled = value.lower() == 'true'
                 logger.info("Config file loaded.")
                 logger.debug(f"Config loaded: max_threads={self.max_threads}, scraper_profile={self.scraper_profile}")
             except (IOError, ValueError) as e:
@@ -59,6 +115,23 @@ class Config:
             with open(self.config_path, 'w') as f:
                 f.write("workerThreadsNumber:20\n")
                 f.write("scraperProfile:async\n")
+                f.write("parserBackend:lxml\n")
+                f.write("parserProcesses:4\n")
+                f.write("httpBackend:aiohttp\n")
+                f.write("streamFilmPages:true\n")
+                f.write("filmPageEarlyClose:false\n")
+                f.write("compression:true\n")
+                f.write("baseUrl:https://letterboxd.com\n")
+                f.write("incrementalScrape:true\n")
+                f.write("filmCacheEnabled:true\n")
+                f.write("conditionalRequests:true\n")
+                f.write("filmCacheTTLDays:30\n")
+                f.write("filmCacheMaxEntries:50000\n")
+                f.write("metricsFile:\n")
+                f.write("metricsPort:0\n")
+                f.write("checkpointInterval:30\n")
+                f.write("resumeScrapes:true\n")
+                f.write("filmIndexEnabled:true\n")
             logger.info("Config file created with async scraper as default.")
         except IOError as e:
             logger.error(f"Error creating config: {e}")
@@ -72,6 +145,23 @@ class Config:
             with open(self.config_path, 'w') as f:
                 f.write(f"workerThreadsNumber:{self.max_threads}\n")
                 f.write(f"scraperProfile:{self.scraper_profile}\n")
+                f.write(f"parserBackend:{self.parser_backend}\n")
+                f.write(f"parserProcesses:{self.parser_processes}\n")
+                f.write(f"httpBackend:{self.http_backend}\n")
+                f.write(f"streamFilmPages:{str(self.stream_film_pages).lower()}\n")
+                f.write(f"filmPageEarlyClose:{str(self.film_page_early_close).lower()}\n")
+                f.write(f"compression:{str(self.compression).lower()}\n")
+                f.write(f"baseUrl:{self.base_url}\n")
+                f.write(f"incrementalScrape:{str(self.incremental_scrape).lower()}\n")
+                f.write(f"filmCacheEnabled:{str(self.film_cache_enabled).lower()}\n")
+                f.write(f"conditionalRequests:{str(self.conditional_requests).lower()}\n")
+                f.write(f"filmCacheTTLDays:{self.film_cache_ttl_days}\n")
+                f.write(f"filmCacheMaxEntries:{self.film_cache_max_entries}\n")
+                f.write(f"metricsFile:{self.metrics_file}\n")
+                f.write(f"metricsPort:{self.metrics_port}\n")
+                f.write(f"checkpointInterval:{self.checkpoint_interval}\n")
+                f.write(f"resumeScrapes:{str(self.resume_scrapes).lower()}\n")
+                f.write(f"filmIndexEnabled:{str(self.film_index_enabled).lower()}\n")
             logger.info("Config saved.")
             logger.debug(f"Config saved: max_threads={self.max_threads}, scraper_profile={self.scraper_profile}")
         except IOError as e:
@@ -2,8 +2,15 @@
 Application context for dependency injection.
 Manages application-wide state without global singletons.
 """
-from .data_models import StatisticsData, GUIModels
+import logging
+from .data_models import StatisticsData
 from .config import Config
+from .film_cache import FilmCache, ValidatorStore
+from .film_index import FilmIndex
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
 
 
 class AppContext:
@@ -16,7 +23,65 @@ class AppContext:
         """Initialize application context with all required components."""
         self.config = Config()
         self.stats_data = StatisticsData()
-        self.gui_models = GUIModels()
+        self._gui_models = None
+        self._film_cache = None
+        self._validator_store = None
+        self._film_index = None
+        self.metrics = None  # Metrics of the current or latest scrape
+        self._metrics_server = None
+    
+    @property
+    def gui_models(self):
+        """Qt table models, created on first use so headless runs never import PyQt6."""
+        if self._gui_models is None:
+            from .gui_models import GUIModels
+            self._gui_models = GUIModels()
+        return self._gui_models
+    
+    @property
+    def film_cache(self):
+        """Shared on-disk film cache, opened on first use. None when disabled in config."""
+        if not self.config.film_cache_enabled:
+            return None
+        if self._film_cache is None:
+            self._film_cache = FilmCache(
+                self.config.film_cache_path,
+                ttl_seconds=self.config.film_cache_ttl_days * 86400,
+                max_entries=self.config.film_cache_max_entries
+            )
+        return self._film_cache
+    
+    @property
+    def validator_store(self):
+        """Shared store of HTTP validators for conditional requests. None when disabled in config."""
+        if not (self.config.conditional_requests and self.config.film_cache_enabled):
+            return None
+        if self._validator_store is None:
+            self._validator_store = ValidatorStore(self.config.film_cache_path)
+        return self._validator_store
+    
+    @property
+    def film_index(self):
+        """Shared index of analyzed films and watch lists, opened on first use. None when disabled in config."""
+        if not self.config.film_index_enabled:
+            return None
+        if self._film_index is None:
+            self._film_index = FilmIndex(self.config.film_index_path)
+        return self._film_index
+    
+    def track_metrics(self, metrics):
+        """
+        Make metrics the current scrape's instrumentation, starting the Prometheus
+        endpoint on first use when a metrics port is configured.
+        """
+        self.metrics = metrics
+        if self.config.metrics_port and self._metrics_server is None:
+            from .metrics import MetricsServer
+            try:
+                self._metrics_server = MetricsServer(self.config.metrics_port, lambda: self.metrics)
+            except OSError as e:
+                logger.warning(f"Could not start metrics endpoint on port {self.config.metrics_port}: {e}")
+                self.config.metrics_port = 0
     
     def reset_stats(self):
         """Reset statistics data."""
@@ -24,7 +89,8 @@ class AppContext:
     
     def reset_gui_models(self):
         """Reset GUI models."""
-        self.gui_models.clear_all()
+        if self._gui_models is not None:
+            self._gui_models.clear_all()
     
     def reset_all(self):
         """Reset all application state."""
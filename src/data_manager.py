@@ -1,11 +1,18 @@
 """
 Data management functionality.
-Handles saving and loading CSV files, GUI display formatting, and data population.
+Handles saving and loading CSV files (plus the per-film table stored next to them) or
+binary .lpb files, GUI display formatting, and data population.
 """
+import os
 import csv
 import logging
 from dataclasses import dataclass
 from typing import Optional
+from array import array
+from .film_table import FilmTable, CategoryColumn, sidecar_path
+from .data_models import InternedCounter
+from .binary_format import BinaryFile, BINARY_SUFFIX, is_binary_file, write_file
+from .ranking import top_items
 
 
 # Configure logging
@@ -57,6 +64,21 @@ class StatisticsCSVHandler:
                     writer.writerow(['ACTOR', k, v])
                 for k, v in self.stats_data.decade_dict.items():
                     writer.writerow(['DECADE', k, v])
+                
+                # Write the analyzed film URLs so later runs can scrape incrementally
+                for url in self.stats_data.url_list:
+                    writer.writerow(['FILM', url, ''])
+                # Listed films that could not be downloaded, retried by the next incremental run
+                for url in self.stats_data.pending_urls:
+                    writer.writerow(['PENDING', url, ''])
+            
+            # Per-film records go to a sidecar file so statistics can be re-aggregated later.
+            # A table missing some counted films is not saved: loading re-derives the counts from it
+            table_path = sidecar_path(csv_path)
+            if len(self.stats_data.film_table) and self.stats_data.table_complete:
+                self.stats_data.film_table.save(table_path)
+            elif os.path.exists(table_path):
+                os.remove(table_path)
                     
             logger.info(f"Successfully saved statistics to {csv_path}")
             return True
@@ -123,6 +145,10 @@ class StatisticsCSVHandler:
                             self.stats_data.decade_dict[name] += int(count)
                         except (ValueError, KeyError) as e:
                             logger.warning(f"Failed to process decade data '{name}': {count} - {e}")
+                    elif section == 'FILM':
+                        self.stats_data.add_url(name)
+                    elif section == 'PENDING':
+                        self.stats_data.pending_urls.append(name)
         except FileNotFoundError as e:
             error_msg = f"CSV file not found: {csv_path}"
             logger.error(error_msg)
@@ -145,6 +171,17 @@ class StatisticsCSVHandler:
         # Set meta data
         self.stats_data.set_meta_data(films_num, total_hours, total_days, loaded_scraped_at)
         
+        # The film table is optional: older saves only have the aggregated counts
+        table_path = sidecar_path(csv_path)
+        self.stats_data.table_complete = False
+        if os.path.exists(table_path):
+            try:
+                self.stats_data.film_table = FilmTable.load(table_path)
+                self.stats_data.table_complete = True
+            except (IOError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable film table {table_path}: {e}")
+        self.stats_data.rebuild_counters()
+        
         logger.info(f"Successfully loaded statistics from {csv_path} - {films_num} films, {total_hours:.2f} hours")
         return LoadedStats(
             films_num=films_num,
@@ -155,6 +192,127 @@ class StatisticsCSVHandler:
         )
 
 
+class StatisticsBinaryHandler:
+    """Handles the binary columnar (.lpb) save format, which also embeds the film table."""
+    
+    # Counter attribute -> block name prefix
+    COUNTERS = (
+        ('lang_dict', 'languages'),
+        ('country_dict', 'countries'),
+        ('genre_dict', 'genres'),
+        ('director_dict', 'directors'),
+        ('actor_dict', 'actors'),
+        ('decade_dict', 'decades'),
+    )
+    
+    def __init__(self, stats_data) -> None:
+        """Initialize with statistics data reference."""
+        self.stats_data = stats_data
+    
+    def save_to_binary(self, username: str, scraped_at: str, films_num: int,
+                       total_hours: float, total_days: float, path: str) -> bool:
+        """Save statistics to a binary file."""
+        stats = self.stats_data
+        meta = {
+            'username': username,
+            'scraped_at': scraped_at,
+            'films': films_num,
+            'hours': total_hours,
+            'days': total_days,
+        }
+        blocks = {}
+        with stats.lock:
+            for attr, name in self.COUNTERS:
+                items = list(getattr(stats, attr).items())
+                blocks[f'{name}.names'] = [k for k, _ in items]
+                blocks[f'{name}.counts'] = array('I', [v for _, v in items])
+            blocks['films.urls'] = list(stats.url_list)
+            blocks['films.pending'] = list(stats.pending_urls)
+            
+            table = stats.film_table
+            # A table missing some counted films is not saved: loading re-derives the counts from it
+            if len(table) and stats.table_complete:
+                blocks['table.urls'] = table.urls
+                blocks['table.years'] = table.years
+                blocks['table.decades'] = table.decades
+                blocks['table.runtimes'] = table.runtimes
+                for name, column in table.categories.items():
+                    blocks[f'table.{name}.names'] = column.names
+                    blocks[f'table.{name}.offsets'] = column.offsets
+                    blocks[f'table.{name}.ids'] = column.ids
+        try:
+            write_file(path, meta, blocks)
+        except (IOError, ValueError) as e:
+            error_msg = f"Failed to write binary statistics {path}: {e}"
+            logger.error(error_msg)
+            raise IOError(error_msg) from e
+        logger.info(f"Successfully saved statistics to {path}")
+        return True
+    
+    def load_from_binary(self, path: str) -> Optional[LoadedStats]:
+        """Load statistics from a binary file and return metadata."""
+        stats = self.stats_data
+        stats.reset()
+        try:
+            with BinaryFile(path) as f:
+                meta = f.meta
+                counters = {
+                    attr: InternedCounter.from_counts(f.strings(f'{name}.names'), f.ints(f'{name}.counts'))
+                    for attr, name in self.COUNTERS
+                }
+                url_list = f.strings('films.urls')
+                pending_urls = f.strings('films.pending') if 'films.pending' in f else []
+                table = self._read_table(f) if 'table.urls' in f else None
+        except (IOError, ValueError, KeyError, TypeError) as e:
+            error_msg = f"Failed to read binary statistics {path}: {e}"
+            logger.error(error_msg)
+            raise IOError(error_msg) from e
+        
+        films_num = int(meta.get('films', 0))
+        if films_num < 0:
+            error_msg = f"Invalid films count in {path}: {films_num} (cannot be negative)"
+            logger.error(error_msg)
+            raise IOError(error_msg)
+        
+        with stats.lock:
+            for attr, counter in counters.items():
+                setattr(stats, attr, counter)
+            stats.url_list = url_list
+            stats.url_set = set(url_list)
+            stats.pending_urls = pending_urls
+            if table is not None:
+                stats.film_table = table
+            stats.table_complete = table is not None
+        stats.rebuild_counters()
+        stats.set_meta_data(films_num, float(meta.get('hours', 0.0)), float(meta.get('days', 0.0)),
+                            meta.get('scraped_at', ''))
+        
+        logger.info(f"Successfully loaded statistics from {path} - {films_num} films")
+        return LoadedStats(
+            films_num=films_num,
+            total_hours=float(meta.get('hours', 0.0)),
+            total_days=float(meta.get('days', 0.0)),
+            username=meta.get('username', ''),
+            scraped_at=meta.get('scraped_at', ''),
+        )
+    
+    def _read_table(self, f) -> FilmTable:
+        table = FilmTable()
+        table.urls = f.strings('table.urls')
+        table.rows = dict(zip(table.urls, range(len(table.urls))))
+        table.years = f.ints('table.years')
+        table.decades = f.ints('table.decades')
+        table.runtimes = f.ints('table.runtimes')
+        for name in table.categories:
+            column = CategoryColumn()
+            column.names = f.strings(f'table.{name}.names')
+            column.index = dict(zip(column.names, range(len(column.names))))
+            column.offsets = f.ints(f'table.{name}.offsets')
+            column.ids = f.ints(f'table.{name}.ids')
+            table.categories[name] = column
+        return table
+
+
 class DataPopulator:
     """Handles populating GUI models with loaded data."""
     
@@ -210,39 +368,29 @@ class GUIStringGenerator:
     
     def _generate_language_strings(self, films_num: int) -> None:
         """Generate language statistics strings."""
-        sorted_lang = dict(sorted(self.stats_data.lang_dict.items(), key=lambda x: x[1], reverse=True))
         self.stats_data.gui_lang = "Language\tFilms\tPercentage\n\n"
         self.stats_data.gui_lang_list = [self.stats_data.gui_lang]
         
-        cnt_lang = 0
-        for k, v in sorted_lang.items():
-            cnt_lang += 1
-            if self.config.list_delim != -1 and cnt_lang > self.config.list_delim:
-                break
+        for k, v in top_items(self.stats_data.lang_dict, self.config.list_delim):
             percent = (format(v / films_num * 100, ".2f") + "%") if films_num else "0.00%"
             self.stats_data.gui_lang += k + "\t" + str(v) + "\t" + percent + "\n"
             self.stats_data.gui_lang_list.append(k + "\t" + str(v) + "\t" + percent + "\n")
     
     def _generate_country_strings(self, films_num: int) -> None:
         """Generate country statistics strings."""
-        sorted_country = dict(sorted(self.stats_data.country_dict.items(), key=lambda x: x[1], reverse=True))
         self.stats_data.gui_countries = "Country\tFilms\tPercentage\n\n"
         
-        cnt_country = 0
-        for k, v in sorted_country.items():
-            cnt_country += 1
-            if self.config.list_delim != -1 and cnt_country > self.config.list_delim:
-                break
+        for k, v in top_items(self.stats_data.country_dict, self.config.list_delim):
             percent = (format(v / films_num * 100, ".2f") + "%") if films_num else "0.00%"
             self.stats_data.gui_countries += k + "\t" + str(v) + "\t" + percent + "\n"
     
     def _print_decade_stats(self, films_num: int) -> None:
         """Print decade statistics to console."""
         try:
-            sorted_decades = dict(sorted(self.stats_data.decade_dict.items(), key=lambda x: x[1], reverse=True))
+            sorted_decades = top_items(self.stats_data.decade_dict)
             if sorted_decades:
                 print("\nDecade            Films        Percentage")
-                for k, v in sorted_decades.items():
+                for k, v in sorted_decades:
                     percent = (format(v / films_num * 100, ".2f") + "%") if films_num else "0.00%"
                     print(f"{k:<20}{v:>10}{percent:>15}")
         except Exception as e:
@@ -261,13 +409,16 @@ class DataManager:
         
         # Initialize specialized handlers
         self.csv_handler = StatisticsCSVHandler(self.stats_data)
+        self.binary_handler = StatisticsBinaryHandler(self.stats_data)
         self.data_populator = DataPopulator(self.gui_models, self.config)
         self.gui_generator = GUIStringGenerator(self.stats_data, self.config)
     
     def save_stats_to_csv(self, username: str, scraped_at: str, films_num: int, 
                           total_hours: float, total_days: float, csv_path: str) -> bool:
-        """Save all extracted statistics to a CSV file."""
+        """Save all extracted statistics to a CSV file, or to the binary format for .lpb paths."""
         try:
+            if csv_path.lower().endswith(BINARY_SUFFIX):
+                return self.binary_handler.save_to_binary(username, scraped_at, films_num, total_hours, total_days, csv_path)
             return self.csv_handler.save_to_csv(username, scraped_at, films_num, total_hours, total_days, csv_path)
         except IOError:
             raise  
@@ -277,13 +428,16 @@ class DataManager:
             raise RuntimeError(error_msg) from e
     
     def load_stats_from_csv(self, csv_path: str) -> Optional[LoadedStats]:
-        """Load statistics from a CSV file into data structures."""
+        """Load statistics from a CSV or binary file (detected from its contents) into data structures."""
         try:
             # Reset GUI models
             self.gui_models.clear_all()
             
-            # Load data using CSV handler
-            meta = self.csv_handler.load_from_csv(csv_path)
+            # Load data using the handler matching the file format
+            if is_binary_file(csv_path):
+                meta = self.binary_handler.load_from_binary(csv_path)
+            else:
+                meta = self.csv_handler.load_from_csv(csv_path)
             
             if meta:
                 # Populate GUI models with loaded data
@@ -1,10 +1,143 @@
 """
 Data models and structures.
-Manages statistics data and GUI models.
+Manages statistics data in compact interned counters. Qt table models live in gui_models so this module stays importable without PyQt6.
 """
 import threading
-from collections import defaultdict
-from PyQt6.QtGui import QStandardItemModel, QStandardItem
+from array import array
+from collections.abc import MutableMapping
+from .film_table import FilmTable
+from .ranking import top_ids, top_items
+
+
+# Film record fields and the StatisticsData counters they are counted into
+CATEGORY_FIELDS = (
+    ('languages', 'lang_dict'),
+    ('countries', 'country_dict'),
+    ('genres', 'genre_dict'),
+    ('directors', 'director_dict'),
+    ('actors', 'actor_dict'),
+)
+
+
+class InternedCounter(MutableMapping):
+    """
+    Compact str -> int counter.
+    Each name is interned once into a per-counter vocabulary and mapped to an integer ID;
+    counts live in an array('I') indexed by ID, which NumPy can wrap without copying
+    (numpy.frombuffer(counter.counts, dtype=numpy.uint32)).
+    Reads like the dicts it replaces, with Counter semantics: missing names read as 0
+    (so `counter[name] += 1` works) and names whose count drops to 0 are no longer listed.
+    IDs stay stable for the lifetime of the counter. `version` changes on every update.
+    """
+    
+    def __init__(self, data=None):
+        self._ids = {}
+        self._names = []
+        self.counts = array('I')
+        self._live = 0
+        self.version = 0
+        self._ranking = None  # (version, k, ranked items), see ranked()
+        if data:
+            self.update(data)
+    
+    @classmethod
+    def from_counts(cls, names, counts):
+        """Build a counter from a vocabulary and an aligned sequence of counts."""
+        counter = cls()
+        counter._names = list(names)
+        counter._ids = dict(zip(counter._names, range(len(counter._names))))
+        counter.counts = array('I', counts)
+        counter._live = sum(1 for count in counter.counts if count)
+        return counter
+    
+    def intern(self, name):
+        """Return the ID of a name, adding it to the vocabulary if needed."""
+        idx = self._ids.get(name)
+        if idx is None:
+            idx = len(self._names)
+            self._ids[name] = idx
+            self._names.append(name)
+            self.counts.append(0)
+        return idx
+    
+    def name_of(self, idx):
+        """Return the name interned under an ID."""
+        return self._names[idx]
+    
+    def vocabulary(self):
+        """Return a copy of the interned names in ID order, aligned with counts (see from_counts)."""
+        return list(self._names)
+    
+    def add_ids(self, ids, amount=1):
+        """Increment the counts of already interned IDs."""
+        counts = self.counts
+        for idx in ids:
+            if not counts[idx]:
+                self._live += 1
+            counts[idx] += amount
+        self.version += 1
+    
+    def ranked(self, k=None):
+        """
+        Return the k most frequent (name, count) pairs (all of them if k is None), in
+        ranking.top_ids order. The longest ranking computed so far is kept and reused
+        until the counts change.
+        """
+        cached = self._ranking
+        if cached is not None:
+            version, cached_k, ranked = cached
+            # A longer (or complete) ranking of the same counts also answers shorter requests
+            if version == self.version and (cached_k is None or (k is not None and k <= cached_k)):
+                return ranked[:k]
+        
+        ranked = [(self._names[idx], self.counts[idx]) for idx in top_ids(self.counts, k)]
+        self._ranking = (self.version, k, ranked)
+        return ranked[:]
+    
+    def most_common(self, n=None):
+        """Return (name, count) pairs ordered by count, like collections.Counter.most_common."""
+        return top_items(self, n)
+    
+    def __getitem__(self, name):
+        idx = self._ids.get(name)
+        return self.counts[idx] if idx is not None else 0
+    
+    def __setitem__(self, name, value):
+        if value < 0:
+            raise ValueError(f"Counts cannot be negative: {name!r} = {value}")
+        idx = self.intern(name)
+        old = self.counts[idx]
+        self.counts[idx] = value
+        self._live += (value > 0) - (old > 0)
+        self.version += 1
+    
+    def __delitem__(self, name):
+        idx = self._ids.get(name)
+        if idx is None or not self.counts[idx]:
+            raise KeyError(name)
+        self.counts[idx] = 0
+        self._live -= 1
+        self.version += 1
+    
+    def __contains__(self, name):
+        idx = self._ids.get(name)
+        return idx is not None and self.counts[idx] > 0
+    
+    def __iter__(self):
+        counts = self.counts
+        return (name for idx, name in enumerate(self._names) if counts[idx])
+    
+    def __len__(self):
+        return self._live
+    
+    def get(self, name, default=None):
+        idx = self._ids.get(name)
+        if idx is None or not self.counts[idx]:
+            return default
+        return self.counts[idx]
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
 
 
 class StatisticsData:
@@ -19,12 +152,19 @@ class StatisticsData:
         with self.lock:
             self.url_list = []
             self.url_set = set()
-            self.lang_dict = {}
-            self.country_dict = {}
-            self.genre_dict = {}
-            self.director_dict = {}
-            self.actor_dict = {}
-            self.decade_dict = defaultdict(int)
+            # Listed films that could not be downloaded: not counted, retried by the next incremental run
+            self.pending_urls = []
+            self.lang_dict = InternedCounter()
+            self.country_dict = InternedCounter()
+            self.genre_dict = InternedCounter()
+            self.director_dict = InternedCounter()
+            self.actor_dict = InternedCounter()
+            self.decade_dict = InternedCounter()
+            
+            # Per-film records, from which the counters above are re-derived
+            self.film_table = FilmTable()
+            # False once films are counted without a table row (legacy scraper, saves without table)
+            self.table_complete = True
             
             # GUI display strings
             self.gui_watched1 = ""
@@ -44,6 +184,7 @@ class StatisticsData:
                      film_directors, film_actors, decade):
         """Add data from a single film to the statistics."""
         with self.lock:
+            self.table_complete = False  # Counted without a film table row
             if film_languages:
                 for lang in film_languages:
                     self.lang_dict[lang] = self.lang_dict.get(lang, 0) + 1
@@ -67,6 +208,61 @@ class StatisticsData:
             if decade:
                 self.decade_dict[decade] += 1
     
+    def add_film_record(self, url, film_data):
+        """Count one extracted film record and keep it in the film table."""
+        self.add_film_records(((url, film_data),))
+    
+    def add_film_records(self, records):
+        """Count (url, film_data) records under a single lock acquisition."""
+        counters = [getattr(self, attr) for _, attr in CATEGORY_FIELDS]
+        with self.lock:
+            for url, film_data in records:
+                if url in self.film_table:
+                    continue  # Already counted
+                self.film_table.add(url, film_data)
+                for (field, _), counter in zip(CATEGORY_FIELDS, counters):
+                    names = film_data.get(field)
+                    if names:
+                        counter.add_ids([counter.intern(name) for name in names])
+                
+                if film_data.get('decade'):
+                    self.decade_dict[film_data['decade']] += 1
+    
+    def aggregate(self, decade=None, year=None, **criteria):
+        """
+        Re-aggregate the film table, optionally filtered (e.g. decade='1990s', genres='Drama').
+        Returns {counter attribute: InternedCounter} plus 'films' and 'runtime_minutes'.
+        """
+        with self.lock:
+            table = self.film_table
+            rows = table.select(decade, year, **criteria) if (decade or year or criteria) else None
+            totals = table.aggregate(rows)
+        result = {
+            'films': totals['films'],
+            'runtime_minutes': totals['runtime_minutes'],
+            'decade_dict': InternedCounter(totals['decades']),
+        }
+        for field, attr in CATEGORY_FIELDS:
+            names, counts = totals[field]
+            result[attr] = InternedCounter.from_counts(names, counts)
+        return result
+    
+    def rebuild_counters(self):
+        """
+        Re-derive every counter from the film table, which makes the table the single source
+        of the counts. Scrapers call it once a scrape is complete and loaders after reading a
+        saved table. Returns the totals, or None (counters untouched) when some counted films
+        have no row in the table.
+        """
+        if not self.table_complete:
+            return None
+        totals = self.aggregate()
+        with self.lock:
+            for _, attr in CATEGORY_FIELDS:
+                setattr(self, attr, totals[attr])
+            self.decade_dict = totals['decade_dict']
+        return totals
+    
     def add_url(self, url):
         """Add a film URL to the list if not already present."""
         with self.lock:
@@ -74,6 +270,29 @@ class StatisticsData:
                 self.url_set.add(url)
                 self.url_list.append(url)
     
+    def defer_urls(self, urls):
+        """
+        Move films that could not be analyzed from the URL list to pending_urls, so a later
+        incremental run does not take them for analyzed films and scrapes them again.
+        """
+        deferred = set(urls)
+        if not deferred:
+            return
+        with self.lock:
+            self.url_list = [url for url in self.url_list if url not in deferred]
+            self.url_set -= deferred
+            pending = set(self.pending_urls)
+            for url in urls:
+                if url not in pending:
+                    pending.add(url)
+                    self.pending_urls.append(url)
+    
+    def take_pending_urls(self):
+        """Return the pending film URLs and clear them, for a run that scrapes them again."""
+        with self.lock:
+            pending, self.pending_urls = self.pending_urls, []
+        return pending
+    
     def set_meta_data(self, films_count, total_hours, total_days, scraped_at):
         """Set meta information about the analysis."""
         with self.lock:
@@ -81,53 +300,3 @@ class StatisticsData:
             self.total_hours = total_hours
             self.total_days = total_days
             self.gui_scraped_at = scraped_at
-
-
-class GUIModels:
-    """Manages Qt models for displaying statistics in tables."""
-    
-    def __init__(self):
-        self.models = {
-            'countries': QStandardItemModel(0, 3),
-            'languages': QStandardItemModel(0, 3),
-            'genres': QStandardItemModel(0, 3),
-            'directors': QStandardItemModel(0, 3),
-            'actors': QStandardItemModel(0, 3)
-        }
-        
-        # Set headers
-        headers = ['Name', 'Films', 'Percentage']
-        for model in self.models.values():
-            model.setHorizontalHeaderLabels(headers)
-    
-    def clear_all(self):
-        """Clear all models."""
-        for model in self.models.values():
-            model.removeRows(0, model.rowCount())
-    
-    def populate_model(self, model_name, data_dict, films_count, limit=None):
-        """Populate a specific model with sorted data."""
-        if model_name not in self.models:
-            return
-        
-        model = self.models[model_name]
-        model.removeRows(0, model.rowCount())
-        
-        sorted_data = dict(sorted(data_dict.items(), key=lambda x: x[1], reverse=True))
-        
-        count = 0
-        for name, count_value in sorted_data.items():
-            if limit and count >= limit:
-                break
-            
-            percent = (format(count_value / films_count * 100, ".2f") + "%") if films_count else "0.00%"
-            model.appendRow([
-                QStandardItem(name),
-                QStandardItem(str(count_value)),
-                QStandardItem(percent)
-            ])
-            count += 1
-    
-    def get_model(self, name):
-        """Get a specific model by name."""
-        return self.models.get(name)
@@ -0,0 +1,607 @@
+"""
+HTTP fetch layer shared by all scraper profiles.
+SyncFetcher (requests, for thread pools) and AsyncFetcher (aiohttp, for the event loop) expose
+the same interface and own connection pooling, default headers, timeouts, retries with jittered
+exponential backoff, conditional requests, film page streaming, the adaptive concurrency
+limiter (async) and request statistics. Scrapers only decide what to fetch and how to parse it.
+HttpxFetcher is an optional HTTP/2 transport for the event loop (httpx with h2).
+"""
+import time
+import zlib
+import random
+import asyncio
+import logging
+import threading
+from importlib.util import find_spec
+from typing import NamedTuple, Optional
+from .film_cache import conditional_headers
+from .film_parser import FilmPageScanner
+from .concurrency import (AdaptiveConcurrencyLimiter, parse_retry_after,
+                          OUTCOME_OK, OUTCOME_THROTTLED, OUTCOME_TIMEOUT, OUTCOME_ERROR)
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def supported_encodings():
+    """Content codings this process can decode: gzip and deflate always, brotli and zstd when installed."""
+    encodings = ['gzip', 'deflate']
+    if find_spec('brotli') is not None or find_spec('brotlicffi') is not None:
+        encodings.append('br')
+    if find_spec('zstandard') is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ', '.join(supported_encodings()),
+    'Connection': 'keep-alive',
+}
+
+STREAM_CHUNK_SIZE = 16384
+MAX_BACKOFF = 10.0
+
+# Transports of the async fetcher; 'aiohttp' is the default HTTP/1.1 client
+HTTP_BACKENDS = ('aiohttp', 'httpx')
+
+
+def resolve_http_backend(name):
+    """Return a usable async HTTP backend name, falling back to aiohttp."""
+    if name not in HTTP_BACKENDS:
+        logger.warning(f"Unknown HTTP backend '{name}', using aiohttp")
+        return 'aiohttp'
+    if name == 'httpx' and (find_spec('httpx') is None or find_spec('h2') is None):
+        logger.warning("httpx with HTTP/2 support is not installed (pip install 'httpx[http2]'), using aiohttp")
+        return 'aiohttp'
+    return name
+
+
+def async_fetcher_class(name):
+    """Return the async fetcher implementing an HTTP backend."""
+    return HttpxFetcher if resolve_http_backend(name) == 'httpx' else AsyncFetcher
+
+
+class FetchResult(NamedTuple):
+    """
+    Outcome of a fetch. content is set for 200 responses only; status is 304 for a conditional
+    request answered Not Modified and 0 when no response was received.
+    validators are the (etag, last_modified) of a 200 response, or None.
+    """
+    status: int
+    content: Optional[bytes] = None
+    validators: Optional[tuple] = None
+
+    @property
+    def ok(self):
+        return self.status == 200
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+class FetchStats:
+    """Request counters of one fetcher. Safe to update from several threads."""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.failed = 0
+        self.bytes = 0
+        self.wire_bytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, status, nbytes, attempt):
+        with self._lock:
+            self.requests += 1
+            self.retries += attempt > 0
+            self.not_modified += status == 304
+            self.bytes += nbytes
+
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+
+    def record_wire(self, nbytes):
+        with self._lock:
+            self.wire_bytes += nbytes
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'not_modified': self.not_modified,
+            'failed': self.failed,
+            'bytes': self.bytes,
+            'wire_bytes': self.wire_bytes,
+        }
+
+
+class ContentDecodingError(ValueError):
+    """A response body could not be decoded from its Content-Encoding."""
+
+
+def _decompressor(encoding):
+    """Return the incremental decompress function of a content coding, or None for identity."""
+    if encoding in ('', 'identity'):
+        return None
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == 'deflate':
+        return zlib.decompressobj(32 + zlib.MAX_WBITS).decompress  # zlib or gzip wrapped
+    if encoding == 'br':
+        try:
+            import brotli
+            return brotli.Decompressor().process
+        except ImportError:
+            import brotlicffi
+            return brotlicffi.Decompressor().decompress
+    if encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj().decompress
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+class BodyReader:
+    """
+    Accumulates a response body from the raw chunks received on the wire.
+    Decodes the Content-Encoding itself, so the bytes on the wire, the decoded bytes and the
+    CPU time spent decompressing are known per response. With scan, the decoded film page
+    goes through a FilmPageScanner and feed() reports when the rest is not needed.
+    """
+
+    def __init__(self, content_encoding=None, scan=False):
+        self.encoding = (content_encoding or 'identity').strip().lower()
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.decode_time = 0.0
+        try:
+            self._decompress = _decompressor(self.encoding)
+        except (ValueError, ImportError) as e:
+            raise ContentDecodingError(f"Cannot decode Content-Encoding {self.encoding}: {e}") from e
+        self._scanner = FilmPageScanner() if scan else None
+        self._body = bytearray()
+
+    def feed(self, chunk):
+        """Add a raw chunk; returns True once a scanned film page has everything needed."""
+        self.wire_bytes += len(chunk)
+        if self._decompress is not None:
+            start = time.thread_time()
+            try:
+                chunk = self._decompress(chunk)
+            except Exception as e:  # zlib.error, brotli.error, zstandard.ZstdError...
+                raise ContentDecodingError(f"Corrupt {self.encoding} body: {e}") from e
+            self.decode_time += time.thread_time() - start
+        self.decoded_bytes += len(chunk)
+        if self._scanner is not None:
+            return self._scanner.feed(chunk)
+        self._body += chunk
+        return False
+
+    def skip(self, chunk):
+        """Account for a raw chunk that is drained without being decoded."""
+        self.wire_bytes += len(chunk)
+
+    def content(self):
+        if self._scanner is not None:
+            return self._scanner.content()
+        return bytes(self._body)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt + 1: Retry-After, else capped exponential, with jitter."""
+    base = retry_after or min(MAX_BACKOFF, 0.25 * 2 ** attempt)
+    return base * random.uniform(0.5, 1.5)
+
+
+def response_validators(headers):
+    """Return (etag, last_modified) from response headers, or None if they carry neither."""
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    return (etag, last_modified) if etag or last_modified else None
+
+
+class BaseFetcher:
+    """
+    Settings and bookkeeping shared by both fetchers.
+    hooks are called after every attempt as hook(url, outcome, status, elapsed, nbytes, attempt),
+    with outcome one of the concurrency.OUTCOME_* values and status 0 if no response arrived.
+    With a metrics.Metrics, attempts are recorded into it and successful responses are split
+    into time to first byte and body download.
+    """
+
+    def __init__(self, timeout=10.0, connect_timeout=10.0, max_retries=3, pool_size=50,
+                 stream_film_pages=False, film_page_early_close=False, headers=None, metrics=None):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max(1, max_retries)
+        self.pool_size = pool_size
+        self.stream_film_pages = stream_film_pages
+        self.film_page_early_close = film_page_early_close
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.stats = FetchStats()
+        self.failed_urls = []
+        self.hooks = []
+        self.metrics = metrics
+        if metrics is not None:
+            self.hooks.append(metrics.fetch_hook)
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """Create a fetcher with the streaming and compression settings of a Config."""
+        kwargs.setdefault('stream_film_pages', config.stream_film_pages)
+        kwargs.setdefault('film_page_early_close', config.film_page_early_close)
+        if not config.compression:
+            kwargs.setdefault('headers', {'Accept-Encoding': 'identity'})
+        return cls(**kwargs)
+
+    def _record_phases(self, start, headers_at):
+        """Record time to first byte and body download of a successful response."""
+        if self.metrics is not None:
+            done = time.perf_counter()
+            self.metrics.observe('ttfb', headers_at - start)
+            self.metrics.observe('download', done - headers_at)
+
+    def _record_transfer(self, reader):
+        """Record the wire and decoded size of a response body and its decompression time."""
+        self.stats.record_wire(reader.wire_bytes)
+        if self.metrics is not None:
+            self.metrics.inc('wire_bytes', reader.wire_bytes)
+            self.metrics.inc('decoded_bytes', reader.decoded_bytes)
+            self.metrics.inc(f'encoding_{reader.encoding}')
+            if reader.encoding != 'identity':
+                self.metrics.observe('decompress', reader.decode_time)
+
+    def _record_decode_error(self, url, error, attempt):
+        """Count a response whose body could not be decoded; the attempt is retried like a network error."""
+        logger.warning(f"{error} for {url} (attempt {attempt + 1})")
+        if self.metrics is not None:
+            self.metrics.inc('decode_errors')
+
+    def _record(self, url, outcome, status, elapsed, nbytes, attempt):
+        self.stats.record(status, nbytes, attempt)
+        for hook in self.hooks:
+            try:
+                hook(url, outcome, status, elapsed, nbytes, attempt)
+            except Exception as e:
+                logger.debug(f"Fetch hook failed: {e}")
+
+    def _give_up(self, url, status):
+        logger.warning(f"Giving up on {url} after {self.max_retries} attempts")
+        self.stats.record_failure()
+        self.failed_urls.append(url)
+        return FetchResult(status)
+
+
+class SyncFetcher(BaseFetcher):
+    """Blocking fetcher on a pooled requests session, safe to share between worker threads."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.session = None
+
+    def open(self):
+        import requests
+        import urllib3
+        # Keep pool-full and certificate warnings out of the progress output
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=self.pool_size,
+            max_retries=0,  # Retries are handled by get()
+            pool_block=False
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.headers)
+        return self
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, url, validators=None, film_page=False, timeout=None):
+        """
+        Fetch a page, retrying throttling (429/503), server errors, timeouts and connection errors.
+        With validators the request is conditional. Film pages are streamed when enabled.
+        """
+        import requests
+        headers = conditional_headers(validators)
+        scan = film_page and self.stream_film_pages
+        status = 0
+        for attempt in range(self.max_retries):
+            start = time.perf_counter()
+            outcome = OUTCOME_ERROR
+            status = 0
+            nbytes = 0
+            retry_after = None
+            try:
+                # Always streamed, so the body download is timed apart from the response headers
+                with self.session.get(url, headers=headers or None, stream=True,
+                                      timeout=(self.connect_timeout, timeout or self.timeout)) as response:
+                    headers_at = time.perf_counter()
+                    status = response.status_code
+                    if status == 304 and headers:
+                        outcome = OUTCOME_OK
+                        return FetchResult(304)
+                    if status == 200:
+                        content = self._read_body(response, scan)
+                        self._record_phases(start, headers_at)
+                        nbytes = len(content)
+                        outcome = OUTCOME_OK
+                        return FetchResult(200, content, response_validators(response.headers))
+                    if status in (429, 503):
+                        outcome = OUTCOME_THROTTLED
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        logger.debug(f"HTTP {status} for {url} (attempt {attempt + 1})")
+                    elif 400 <= status < 500:
+                        # Client errors (e.g. missing pages) will not succeed on retry
+                        outcome = OUTCOME_OK
+                        logger.debug(f"HTTP {status} for {url}")
+                        return FetchResult(status)
+                    else:
+                        logger.warning(f"HTTP {status} for {url} (attempt {attempt + 1})")
+            except requests.Timeout:
+                outcome = OUTCOME_TIMEOUT
+                logger.debug(f"Timeout for {url} (attempt {attempt + 1})")
+            except ContentDecodingError as e:
+                status = 0  # The body is unusable, whatever the status line said
+                self._record_decode_error(url, e, attempt)
+            except requests.RequestException as e:
+                logger.debug(f"Request failed for {url}: {e} (attempt {attempt + 1})")
+            finally:
+                self._record(url, outcome, status, time.perf_counter() - start, nbytes, attempt)
+
+            if attempt < self.max_retries - 1:
+                time.sleep(backoff_delay(attempt, retry_after))
+        return self._give_up(url, status)
+
+    def _read_body(self, response, scan=False):
+        """
+        Read the raw body and decode it. A scanned film page stops buffering once the needed
+        sections have arrived; the rest of the body is drained so the pooled connection stays
+        reusable, unless early close is enabled, in which case the connection is dropped instead.
+        """
+        reader = BodyReader(response.headers.get('Content-Encoding'), scan)
+        chunks = response.raw.stream(STREAM_CHUNK_SIZE, decode_content=False)
+        for chunk in chunks:
+            if reader.feed(chunk):
+                if not self.film_page_early_close:
+                    for chunk in chunks:
+                        reader.skip(chunk)
+                break
+        self._record_transfer(reader)
+        return reader.content()
+
+
+class AsyncFetcher(BaseFetcher):
+    """
+    Event-loop fetcher on a pooled aiohttp session. Every request passes through an
+    AdaptiveConcurrencyLimiter, which grows or shrinks the in-flight window from the
+    observed latency, throttling responses and timeouts.
+    Subclasses swap the transport by overriding open/close and the _request, _status,
+    _chunks and _abort hooks.
+    """
+    timeout_errors = (asyncio.TimeoutError,)
+
+    def __init__(self, initial_concurrency=50, max_concurrency=200, **kwargs):
+        kwargs.setdefault('pool_size', max_concurrency)
+        kwargs.setdefault('timeout', 30.0)
+        kwargs.setdefault('max_retries', 4)
+        super().__init__(**kwargs)
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.session = None
+        self.limiter = None
+
+    async def open(self):
+        import aiohttp
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,  # Never the bottleneck for the adaptive limiter
+            limit_per_host=self.pool_size,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        trace_configs = []
+        if self.metrics is not None:
+            from .metrics import make_trace_config
+            trace_configs.append(make_trace_config(self.metrics))
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout),
+            headers=self.headers,
+            trace_configs=trace_configs,
+            auto_decompress=False  # Bodies are decoded by BodyReader
+        )
+        self._open_limiter()
+        return self
+
+    def _open_limiter(self):
+        # Adaptive limit on concurrent requests, starting from the configured level
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=self.initial_concurrency,
+            max_limit=self.max_concurrency
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def get(self, url, validators=None, film_page=False):
+        """
+        Fetch a page through the adaptive concurrency limiter.
+        Throttling responses (429/503) and timeouts shrink the in-flight window and are retried
+        after the server's Retry-After or a jittered exponential backoff. Pages that still fail
+        are recorded in failed_urls instead of being dropped silently.
+        """
+        headers = conditional_headers(validators)
+        scan = film_page and self.stream_film_pages
+        status = 0
+        for attempt in range(self.max_retries):
+            await self.limiter.acquire()
+            start = time.perf_counter()
+            outcome = OUTCOME_ERROR
+            status = 0
+            nbytes = 0
+            retry_after = None
+            try:
+                async with self._request(url, headers) as response:
+                    headers_at = time.perf_counter()
+                    status = self._status(response)
+                    if status == 304 and headers:
+                        outcome = OUTCOME_OK
+                        return FetchResult(304)
+                    if status == 200:
+                        content = await self._read_body(response, scan)
+                        self._record_phases(start, headers_at)
+                        nbytes = len(content)
+                        outcome = OUTCOME_OK
+                        return FetchResult(200, content, response_validators(response.headers))
+                    if status in (429, 503):
+                        outcome = OUTCOME_THROTTLED
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        logger.debug(f"HTTP {status} for {url} (attempt {attempt + 1})")
+                    elif 400 <= status < 500:
+                        # Client errors (e.g. missing pages) will not succeed on retry
+                        outcome = OUTCOME_OK
+                        logger.debug(f"HTTP {status} for {url}")
+                        return FetchResult(status)
+                    else:
+                        logger.warning(f"HTTP {status} for {url} (attempt {attempt + 1})")
+            except self.timeout_errors:
+                outcome = OUTCOME_TIMEOUT
+                logger.debug(f"Timeout for {url} (attempt {attempt + 1})")
+            except ContentDecodingError as e:
+                status = 0  # The body is unusable, whatever the status line said
+                self._record_decode_error(url, e, attempt)
+            except Exception as e:
+                logger.debug(f"Request failed for {url}: {e} (attempt {attempt + 1})")
+            finally:
+                elapsed = time.perf_counter() - start
+                await self.limiter.release(elapsed, outcome, retry_after)
+                self._record(url, outcome, status, elapsed, nbytes, attempt)
+
+            if attempt < self.max_retries - 1:  # Don't delay on last attempt
+                await asyncio.sleep(backoff_delay(attempt, retry_after))
+        return self._give_up(url, status)
+
+    async def _read_body(self, response, scan=False):
+        """
+        Read the raw body and decode it. A scanned film page stops buffering once the needed
+        sections have arrived; the rest of the body is either drained (keeping the connection
+        reusable) or, with early close enabled, the connection is dropped to save the remaining bandwidth.
+        """
+        reader = BodyReader(response.headers.get('Content-Encoding'), scan)
+        chunks = self._chunks(response)
+        async for chunk in chunks:
+            if reader.feed(chunk):
+                if self.film_page_early_close:
+                    await self._abort(response)
+                else:
+                    async for chunk in chunks:
+                        reader.skip(chunk)
+                break
+        self._record_transfer(reader)
+        return reader.content()
+
+    def _request(self, url, headers):
+        """Return an async context manager sending a GET and yielding the response once its headers arrived."""
+        return self.session.get(url, headers=headers or None)
+
+    def _status(self, response):
+        return response.status
+
+    def _chunks(self, response):
+        """Raw (still encoded) body chunks."""
+        return response.content.iter_chunked(STREAM_CHUNK_SIZE)
+
+    async def _abort(self, response):
+        """Drop the connection of a response whose remaining body is not needed."""
+        response.close()
+
+
+class HttpxFetcher(AsyncFetcher):
+    """
+    AsyncFetcher on an httpx client speaking HTTP/2. All in-flight requests to a host are
+    multiplexed over a few connections instead of one connection (and TLS handshake) each.
+    HTTPS servers negotiate HTTP/2 through ALPN, falling back to HTTP/1.1; plain-HTTP servers
+    are spoken to with HTTP/2 prior knowledge (h2c) when prior_knowledge is set.
+    New connections are counted into the 'connect' stage and the connections_opened counter.
+    """
+
+    def __init__(self, prior_knowledge=False, **kwargs):
+        super().__init__(**kwargs)
+        self.prior_knowledge = prior_knowledge
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        kwargs.setdefault('prior_knowledge', config.base_url.startswith('http://'))
+        return super().from_config(config, **kwargs)
+
+    async def open(self):
+        import httpx
+        self.timeout_errors = (httpx.TimeoutException,)
+        self.session = httpx.AsyncClient(
+            http1=not self.prior_knowledge,
+            http2=True,
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            headers=self.headers
+        )
+        self._open_limiter()
+        return self
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.aclose()
+            self.session = None
+
+    def _request(self, url, headers):
+        extensions = {'trace': self._trace_callback()} if self.metrics is not None else None
+        return self.session.stream('GET', url, headers=headers or None, extensions=extensions)
+
+    def _trace_callback(self):
+        """httpcore trace hook timing the set-up of connections opened for one request."""
+        started = []
+
+        async def trace(event_name, info):
+            if event_name == 'connection.connect_tcp.started':
+                started.append(time.perf_counter())
+            elif started and event_name in ('http11.send_request_headers.started',
+                                            'http2.send_request_headers.started'):
+                # TCP connect, TLS handshake and HTTP/2 preface are done
+                self.metrics.observe('connect', time.perf_counter() - started.pop())
+                self.metrics.inc('connections_opened')
+        return trace
+
+    def _status(self, response):
+        return response.status_code
+
+    def _chunks(self, response):
+        return response.aiter_raw(STREAM_CHUNK_SIZE)
+
+    async def _abort(self, response):
+        await response.aclose()
@@ -0,0 +1,292 @@
+"""
+Persistent film cache.
+Stores extracted per-film records on disk so repeated analyses can skip film page requests,
+plus the HTTP validators used to revalidate pages with conditional requests.
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FILM_SLUG_PATTERN = re.compile(r'/film/([^/?#]+)')
+SET_FIELDS = ('languages', 'countries', 'genres', 'directors', 'actors')
+# Version 2 keys records by extraction rules as well as slug
+CACHE_SCHEMA_VERSION = 2
+# Cache hits whose access times are buffered before being written in one statement
+ACCESS_FLUSH_SIZE = 256
+# Version of the listing payloads stored with validators; payloads of other versions are not reused
+LISTING_PAYLOAD_VERSION = 2
+
+
+def film_key(url):
+    """Return the cache key ('/film/<slug>/') for a film URL."""
+    match = FILM_SLUG_PATTERN.search(url)
+    if match:
+        return f"/film/{match.group(1)}/"
+    return url
+
+
+def encode_record(film_data):
+    """Serialize an extracted film record to JSON."""
+    payload = {field: sorted(film_data.get(field) or ()) for field in SET_FIELDS}
+    payload['year'] = film_data.get('year')
+    payload['decade'] = film_data.get('decade')
+    payload['runtime'] = film_data.get('runtime', 0)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+
+def decode_record(raw):
+    """Deserialize a JSON film record back into the scraper's in-memory format."""
+    payload = json.loads(raw)
+    film_data = {field: set(payload.get(field) or ()) for field in SET_FIELDS}
+    film_data['year'] = payload.get('year')  # Missing in records cached before years were kept
+    film_data['decade'] = payload.get('decade')
+    film_data['runtime'] = payload.get('runtime', 0)
+    return film_data
+
+
+class FilmCache:
+    """
+    SQLite-backed cache of extracted film records keyed by film slug and by the name of the
+    extraction rules that built them, so profiles with different rules never share records.
+    Entries older than the TTL are treated as misses; once the cache holds more
+    than max_entries records the least recently used ones are evicted. Access times of
+    hits are buffered and written in batches.
+    """
+
+    def __init__(self, db_path, ttl_seconds=30 * 86400, max_entries=50000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._accessed = {}  # (slug, rules) -> access time not written yet
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < CACHE_SCHEMA_VERSION:
+            # Older records do not say which rules built them
+            self.conn.execute("DROP TABLE IF EXISTS films")
+            self.conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS films ("
+            "slug TEXT NOT NULL, "
+            "rules TEXT NOT NULL, "
+            "record TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, "
+            "last_access REAL NOT NULL, "
+            "PRIMARY KEY (slug, rules))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_films_last_access ON films(last_access)")
+        self.conn.commit()
+
+        self.prune()
+        self._count = self.conn.execute("SELECT COUNT(*) FROM films").fetchone()[0]
+        logger.debug(f"Film cache opened at {db_path} with {self._count} entries")
+
+    def get(self, url, rules, allow_stale=False):
+        """
+        Return the record cached for a film URL under the named extraction rules, or None
+        on a miss or expired entry. With allow_stale=True expired entries are returned too
+        (e.g. for revalidation).
+        """
+        key = film_key(url)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT record, stored_at FROM films WHERE slug = ? AND rules = ?", (key, rules)
+            ).fetchone()
+            if row is None or (not allow_stale and now - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            self._accessed[(key, rules)] = now
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                self._write_access_times()
+                self.conn.commit()
+            self.hits += 1
+        try:
+            return decode_record(row[0])
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Discarding corrupt cache entry for {key}: {e}")
+            return None
+
+    def put(self, url, rules, film_data):
+        """Store (or refresh) the record extracted for a film URL under the named extraction rules."""
+        key = film_key(url)
+        now = time.time()
+        record = encode_record(film_data)
+        with self.lock:
+            existed = self.conn.execute(
+                "SELECT 1 FROM films WHERE slug = ? AND rules = ?", (key, rules)
+            ).fetchone() is not None
+            self._accessed.pop((key, rules), None)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO films (slug, rules, record, stored_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, rules, record, now, now)
+            )
+            if not existed:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict_lru(self._count - self.max_entries)
+            self.conn.commit()
+
+    def _write_access_times(self):
+        """Write the buffered access times of cache hits. Caller must hold the lock and commit."""
+        if self._accessed:
+            self.conn.executemany(
+                "UPDATE films SET last_access = ? WHERE slug = ? AND rules = ?",
+                [(accessed_at, key, rules) for (key, rules), accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _evict_lru(self, excess):
+        """Remove the least recently used entries. Caller must hold the lock."""
+        self._write_access_times()
+        self.conn.execute(
+            "DELETE FROM films WHERE rowid IN "
+            "(SELECT rowid FROM films ORDER BY last_access ASC LIMIT ?)",
+            (excess,)
+        )
+        self._count -= excess
+
+    def flush(self):
+        """Write the buffered access times of cache hits."""
+        with self.lock:
+            self._write_access_times()
+            self.conn.commit()
+
+    def prune(self):
+        """Drop entries too old to be revalidated and enforce the size cap."""
+        with self.lock:
+            self._write_access_times()
+            # Expired entries are kept for one more TTL so conditional requests can revive them
+            cutoff = time.time() - 2 * self.ttl_seconds
+            self.conn.execute("DELETE FROM films WHERE stored_at < ?", (cutoff,))
+            count = self.conn.execute("SELECT COUNT(*) FROM films").fetchone()[0]
+            if count > self.max_entries:
+                self._count = count
+                self._evict_lru(count - self.max_entries)
+            self.conn.commit()
+
+    def close(self):
+        """Write the buffered access times and close the underlying database connection."""
+        with self.lock:
+            self._write_access_times()
+            self.conn.commit()
+            self.conn.close()
+
+
+class ValidatorStore:
+    """
+    SQLite-backed store of HTTP validators (ETag / Last-Modified) per URL.
+    Listing pages also keep their extracted payload so a 304 can be answered locally;
+    film pages rely on the FilmCache record instead.
+    """
+
+    def __init__(self, db_path, max_age_seconds=90 * 86400, max_entries=100000):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS validators ("
+            "url TEXT PRIMARY KEY, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "payload TEXT, "
+            "stored_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_validators_stored_at ON validators(stored_at)")
+        self.conn.execute("DELETE FROM validators WHERE stored_at < ?", (time.time() - max_age_seconds,))
+        self.conn.execute(
+            "DELETE FROM validators WHERE url IN "
+            "(SELECT url FROM validators ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (max_entries,)
+        )
+        self.conn.commit()
+
+    def get(self, url):
+        """Return (etag, last_modified, payload) for a URL, or None if nothing is stored."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, payload FROM validators WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, payload = row
+        try:
+            payload = json.loads(payload) if payload else None
+        except ValueError:
+            payload = None
+        return etag, last_modified, payload
+
+    def put(self, url, etag, last_modified, payload=None):
+        """Store the validators (and optional extracted payload) of a 200 response."""
+        if not etag and not last_modified:
+            return
+        raw_payload = json.dumps(payload, ensure_ascii=False) if payload is not None else None
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO validators (url, etag, last_modified, payload, stored_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, raw_payload, time.time())
+            )
+            self.conn.commit()
+
+    def get_listing(self, url):
+        """
+        Return (etag, last_modified, (film URLs, has_next, last_page)) for a listing page whose
+        stored payload can answer a 304, or None.
+        """
+        validators = self.get(url)
+        if validators is None:
+            return None
+        payload = validators[2]
+        if not isinstance(payload, dict) or payload.get('version') != LISTING_PAYLOAD_VERSION:
+            return None
+        return validators[0], validators[1], (payload['film_urls'], payload['has_next'], payload['last_page'])
+
+    def put_listing(self, url, etag, last_modified, film_urls, has_next, last_page):
+        """Store the validators of a listing page with its parsed, parser-independent payload."""
+        self.put(url, etag, last_modified, payload={
+            'version': LISTING_PAYLOAD_VERSION,
+            'film_urls': list(film_urls),
+            'has_next': has_next,
+            'last_page': last_page,
+        })
+
+    def touch(self, url):
+        """Record a 304 for a URL, keeping its validators alive."""
+        with self.lock:
+            self.conn.execute("UPDATE validators SET stored_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self.lock:
+            self.conn.close()
+
+
+def conditional_headers(validators):
+    """Build If-None-Match / If-Modified-Since request headers from stored validators."""
+    headers = {}
+    if validators:
+        etag, last_modified = validators[0], validators[1]
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    return headers
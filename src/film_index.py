@@ -0,0 +1,230 @@
+"""
+Local film index.
+Keeps the metadata of every analyzed film and the watch lists of every analyzed profile in
+SQLite, so questions such as "films by this director across all profiles" or "who watched
+this film" are answered from disk without scraping anything.
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from .film_cache import film_key
+from .film_table import CATEGORIES
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def index_key(film):
+    """Return the index key ('/film/<slug>/') of a film URL, key or bare slug."""
+    if '/film/' in film:
+        return film_key(film)
+    return f"/film/{film.strip('/')}/"
+
+
+def _decade_value(decade):
+    """'1990s' or 1990 -> 1990."""
+    return int(str(decade).rstrip('s'))
+
+
+class FilmIndex:
+    """
+    SQLite-backed index of analyzed films and of the profiles that watched them.
+    Films are keyed by slug and their multi-valued categories (directors, actors, genres,
+    countries, languages) are stored one name per row, indexed by (category, name);
+    names compare case-insensitively. Each indexed profile keeps its full watch list,
+    replaced whenever the profile is analyzed again.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS films ("
+            "slug TEXT PRIMARY KEY, "
+            "year INTEGER, "
+            "decade INTEGER, "
+            "runtime INTEGER NOT NULL, "
+            "indexed_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS film_names ("
+            "category TEXT NOT NULL, "
+            "name TEXT NOT NULL COLLATE NOCASE, "
+            "slug TEXT NOT NULL, "
+            "PRIMARY KEY (category, name, slug)) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "username TEXT PRIMARY KEY, "
+            "films INTEGER NOT NULL, "
+            "indexed_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS watched ("
+            "username TEXT NOT NULL, "
+            "slug TEXT NOT NULL, "
+            "PRIMARY KEY (username, slug)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_film_names_slug ON film_names(slug)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_films_decade ON films(decade)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_films_year ON films(year)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_watched_slug ON watched(slug)")
+        self.conn.commit()
+
+    def add_profile(self, username, stats_data):
+        """
+        Index an analyzed profile: its watch list (stats_data.url_list) replaces the one
+        stored for the user, and every film of its film table is added or refreshed.
+        Returns the number of films whose metadata was indexed.
+        """
+        username = username.lower()
+        now = time.time()
+        with stats_data.lock:
+            watched = list(dict.fromkeys(index_key(url) for url in stats_data.url_list))
+            table = stats_data.film_table
+            films = []
+            names = []
+            for row, url in enumerate(table.urls):
+                key = index_key(url)
+                films.append((key, table.years[row] or None, table.decades[row] or None, table.runtimes[row], now))
+                for category, column in table.categories.items():
+                    names.extend((category, name, key) for name in column.row_names(row))
+
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM watched WHERE username = ?", (username,))
+                self.conn.executemany("INSERT INTO watched (username, slug) VALUES (?, ?)",
+                                      ((username, key) for key in watched))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO profiles (username, films, indexed_at) VALUES (?, ?, ?)",
+                    (username, len(watched), now)
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO films (slug, year, decade, runtime, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                    films
+                )
+                # Film credits change rarely, but a refreshed record replaces the old names
+                self.conn.executemany("DELETE FROM film_names WHERE slug = ?", ((film[0],) for film in films))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO film_names (category, name, slug) VALUES (?, ?, ?)", names
+                )
+        logger.debug(f"Indexed {username}: {len(watched)} films watched, {len(films)} film records")
+        return len(films)
+
+    def find_films(self, decade=None, year=None, username=None, **criteria):
+        """
+        Return the indexed films matching every filter, ordered by year, e.g.
+        find_films(directors='Akira Kurosawa') or find_films(decade='1990s', genres='Drama', username='someuser').
+        Category filters accept one name or a list of names (a film matches if it has any of them).
+        Each film is a dict with its 'film' key, 'year', 'decade', 'runtime' and the indexed
+        'users' who watched it.
+        """
+        conditions = []
+        params = []
+        if decade is not None:
+            conditions.append("f.decade = ?")
+            params.append(_decade_value(decade))
+        if year is not None:
+            conditions.append("f.year = ?")
+            params.append(year)
+        if username is not None:
+            conditions.append("f.slug IN (SELECT slug FROM watched WHERE username = ?)")
+            params.append(username.lower())
+        for category, wanted in criteria.items():
+            if category not in CATEGORIES:
+                raise ValueError(f"Unknown film category: {category}")
+            names = [wanted] if isinstance(wanted, str) else list(wanted)
+            conditions.append(
+                f"f.slug IN (SELECT slug FROM film_names WHERE category = ? "
+                f"AND name IN ({', '.join('?' * len(names))}))"
+            )
+            params += [category, *names]
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT f.slug, f.year, f.decade, f.runtime, "
+                "(SELECT group_concat(w.username, char(10)) FROM watched w WHERE w.slug = f.slug) "
+                f"FROM films f {where}ORDER BY f.year, f.slug",
+                params
+            ).fetchall()
+        return [
+            {
+                'film': slug,
+                'year': year,
+                'decade': f"{decade}s" if decade else None,
+                'runtime': runtime,
+                'users': sorted(users.split('\n')) if users else [],
+            }
+            for slug, year, decade, runtime, users in rows
+        ]
+
+    def watched_by(self, film):
+        """Return the sorted usernames of the indexed profiles that watched a film (URL, key or slug)."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT username FROM watched WHERE slug = ? ORDER BY username", (index_key(film),)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def record(self, film):
+        """Return the indexed record of a film in the scrapers' format, or None if unknown."""
+        key = index_key(film)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT year, decade, runtime FROM films WHERE slug = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            names = self.conn.execute(
+                "SELECT category, name FROM film_names WHERE slug = ?", (key,)
+            ).fetchall()
+        film_data = {category: set() for category in CATEGORIES}
+        for category, name in names:
+            film_data.setdefault(category, set()).add(name)
+        film_data['year'] = row[0]
+        film_data['decade'] = f"{row[1]}s" if row[1] else None
+        film_data['runtime'] = row[2]
+        return film_data
+
+    def profiles(self):
+        """Return (username, films watched, indexed_at) for every indexed profile."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT username, films, indexed_at FROM profiles ORDER BY username"
+            ).fetchall()
+
+    def remove_profile(self, username):
+        """Forget a profile's watch list. Film metadata stays indexed."""
+        username = username.lower()
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM watched WHERE username = ?", (username,))
+                self.conn.execute("DELETE FROM profiles WHERE username = ?", (username,))
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self.lock:
+            self.conn.close()
+
+
+def index_profile(app_context, username, stats_data=None):
+    """
+    Add a completed analysis to the film index, when it is enabled in config.
+    An index that cannot be written only costs the index update, never the analysis.
+    """
+    film_index = app_context.film_index
+    if film_index is None:
+        return
+    try:
+        film_index.add_profile(username, stats_data or app_context.stats_data)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not update the film index for {username}: {e}")
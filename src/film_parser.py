@@ -0,0 +1,431 @@
+"""
+Film page parsing.
+Turns raw film page HTML into the compact per-film record used by the scrapers.
+Functions here are module-level so they can run inside worker processes.
+"""
+import re
+import json
+import time
+import logging
+from typing import NamedTuple
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Available extractor backends; 'bs4' is the reference implementation
+PARSER_BACKENDS = ('bs4', 'lxml', 'selectolax')
+
+
+def resolve_backend(name):
+    """Return a usable backend name, falling back to the BeautifulSoup reference."""
+    if name not in PARSER_BACKENDS:
+        logger.warning(f"Unknown parser backend '{name}', using bs4")
+        return 'bs4'
+    if name == 'selectolax' and SelectolaxParser is None:
+        logger.warning("selectolax is not installed, using bs4 parser backend")
+        return 'bs4'
+    return name
+
+
+# Films per listing page on Letterboxd
+LISTING_PAGE_SIZE = 72
+# Only enabled links: the last page renders its disabled "Older" button as <span class="next">
+_NEXT_PAGE_SELECTOR = 'div.pagination a.next, a.next[rel="next"], div.paginate-nextprev a.next, a.paginate-next'
+
+
+def parse_listing_page(content, base_url):
+    """
+    Extract (film URLs, next-page flag, highest listed page number or None) from a listing page.
+    Shared by the scrapers so the payloads they store with a page's validators are interchangeable.
+    """
+    soup = BeautifulSoup(content, 'lxml')
+    film_urls = []
+    for comp in soup.select('div.react-component[data-component-class="LazyPoster"]'):
+        link = comp.get('data-item-link') or ''
+        slug = comp.get('data-item-slug') or ''
+        if link:
+            film_urls.append(base_url + link)
+        elif slug:
+            film_urls.append(f"{base_url}/film/{slug}/")
+        if len(film_urls) >= LISTING_PAGE_SIZE:
+            break
+
+    has_next = soup.select_one(_NEXT_PAGE_SELECTOR) is not None
+
+    last_page = None
+    for a in soup.select('.paginate-pages a'):
+        text = a.get_text().strip()
+        if text.isdigit():
+            last_page = max(last_page or 0, int(text))
+    return film_urls, has_next, last_page
+
+
+class FilmPageScanner:
+    """
+    Detects when a streamed film page contains every section the extractors need.
+    The masthead (year, directors), cast, details and genres tabs all precede the runtime
+    footer paragraph, so everything after its closing tag can be skipped.
+    """
+    FOOTER_MARKER = b'text-footer'
+    PARAGRAPH_END = b'</p>'
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.cutoff = -1
+        self._footer_at = -1
+        self._scanned = 0
+
+    def feed(self, chunk):
+        """Append a chunk; returns True once the needed sections have been received."""
+        self.buffer += chunk
+        if self._footer_at < 0:
+            start = max(0, self._scanned - len(self.FOOTER_MARKER))
+            self._footer_at = self.buffer.find(self.FOOTER_MARKER, start)
+        if self._footer_at >= 0:
+            start = max(self._footer_at, self._scanned - len(self.PARAGRAPH_END))
+            end = self.buffer.find(self.PARAGRAPH_END, start)
+            if end >= 0:
+                self.cutoff = end + len(self.PARAGRAPH_END)
+        self._scanned = len(self.buffer)
+        return self.cutoff >= 0
+
+    def content(self):
+        """Page bytes up to the end of the needed sections (the whole buffer if not found)."""
+        if self.cutoff >= 0:
+            return bytes(self.buffer[:self.cutoff])
+        return bytes(self.buffer)
+
+
+def _has_class(name):
+    """XPath predicate equivalent to the CSS class selector '.name'."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Multi-valued record fields extracted with selectors, in record order
+SELECTED_FIELDS = ('languages', 'countries', 'genres', 'directors', 'actors')
+
+
+class ExtractionRules(NamedTuple):
+    """
+    The rules one scraper applies to turn a film page into a record.
+    Each field is a (scope, selector) pair of CSS selectors: the selector is matched inside
+    the first element matching scope, or in the whole page when scope is None. xpath holds the
+    equivalent (scope, path) pairs for the lxml backend, so all backends build the same record.
+    """
+    name: str
+    languages: tuple
+    countries: tuple
+    genres: tuple
+    directors: tuple
+    actors: tuple
+    xpath: dict
+    actor_limit: int = 0  # Actors kept in page order, 0 keeps them all
+    ld_json_limit: int = 0  # JSON-LD scripts searched for the year, 0 searches them all
+    ld_json_types: tuple = ()  # JSON-LD @type values trusted for the year, empty trusts any
+    footer_separator: str = ''  # Joins the text nodes of the runtime footer
+
+
+# Rules of the async profile (and the batch engine built on it)
+ASYNC_RULES = ExtractionRules(
+    name='async',
+    languages=('#tab-details', '.text-sluglist a[href*="/language/"]'),
+    countries=('#tab-details', 'a[href*="/country/"]'),
+    genres=(None, '#tab-genres a[href*="/genre/"]'),
+    directors=(None, 'section.production-masthead .credits a[href*="/director/"]'),
+    actors=(None, '#tab-cast .cast-list a.text-slug'),
+    xpath={
+        'languages': ("//*[@id='tab-details']",
+                      f".//*[{_has_class('text-sluglist')}]//a[contains(@href, '/language/')]"),
+        'countries': ("//*[@id='tab-details']", ".//a[contains(@href, '/country/')]"),
+        'genres': (None, "//*[@id='tab-genres']//a[contains(@href, '/genre/')]"),
+        'directors': (None, f"//section[{_has_class('production-masthead')}]//*[{_has_class('credits')}]"
+                            f"//a[contains(@href, '/director/')]"),
+        'actors': (None, f"//*[@id='tab-cast']//*[{_has_class('cast-list')}]//a[{_has_class('text-slug')}]"),
+    },
+    actor_limit=20,
+)
+
+# Rules of the optimized profile
+OPTIMIZED_RULES = ExtractionRules(
+    name='optimized',
+    languages=('#tab-details', '.text-sluglist a[href^="/films/language/"]'),
+    countries=('#tab-details', 'a[href^="/films/country/"]'),
+    genres=('#tab-genres', 'a[href^="/films/genre/"]'),
+    directors=('section.production-masthead .details .credits', 'a[href^="/director/"]'),
+    actors=(None, '#tab-cast .cast-list a.text-slug, .cast-list.text-sluglist a.text-slug'),
+    xpath={
+        'languages': ("//*[@id='tab-details']",
+                      f".//*[{_has_class('text-sluglist')}]//a[starts-with(@href, '/films/language/')]"),
+        'countries': ("//*[@id='tab-details']", ".//a[starts-with(@href, '/films/country/')]"),
+        'genres': ("//*[@id='tab-genres']", ".//a[starts-with(@href, '/films/genre/')]"),
+        'directors': (f"//section[{_has_class('production-masthead')}]//*[{_has_class('details')}]"
+                      f"//*[{_has_class('credits')}]", ".//a[starts-with(@href, '/director/')]"),
+        'actors': (None, f"//*[@id='tab-cast']//*[{_has_class('cast-list')}]//a[{_has_class('text-slug')}]"
+                         f" | //*[{_has_class('cast-list')} and {_has_class('text-sluglist')}]"
+                         f"//a[{_has_class('text-slug')}]"),
+    },
+    ld_json_limit=2,
+    ld_json_types=('Movie', 'VideoObject'),
+    footer_separator=' ',
+)
+
+EXTRACTION_RULES = {rules.name: rules for rules in (ASYNC_RULES, OPTIMIZED_RULES)}
+
+
+def parse_film_page(content, backend='bs4', rules=ASYNC_RULES):
+    """Parse raw film page bytes with the given backend and return the extracted film record."""
+    if backend == 'lxml':
+        return parse_film_page_lxml(content, rules)
+    if backend == 'selectolax':
+        return parse_film_page_selectolax(content, rules)
+    
+    # Use lxml parser for speed, parse only what we need
+    soup = BeautifulSoup(content, 'lxml')
+    return extract_film_data(soup, rules)
+
+
+def _bs4_texts(soup, scoped_selector):
+    """Texts of the elements matched by a (scope, selector) pair in a BeautifulSoup tree."""
+    scope, selector = scoped_selector
+    root = soup.select_one(scope) if scope else soup
+    if root is None:
+        return []
+    return [a.get_text() for a in root.select(selector)]
+
+
+def extract_film_data(soup, rules=ASYNC_RULES):
+    """Extract a film record from a BeautifulSoup tree (the reference backend)."""
+    release = soup.select_one('span.releasedate a')
+    footer = soup.select_one('.text-link.text-footer')
+    
+    return assemble_film_data(
+        release.get_text() if release else None,
+        lambda: [script.string for script in soup.select('script[type="application/ld+json"]')],
+        footer.get_text(rules.footer_separator) if footer else None,
+        *(_bs4_texts(soup, getattr(rules, field)) for field in SELECTED_FIELDS),
+        rules=rules,
+    )
+
+
+def year_from_ld_json(raw, types=()):
+    """
+    Extract a release year from a JSON-LD script body, or None if it has none.
+    When types is given, documents of any other @type are ignored.
+    """
+    try:
+        data = json.loads(raw or '{}')
+    except json.JSONDecodeError:
+        return None
+    if isinstance(data, dict) and (not types or data.get('@type') in types):
+        # Check release event
+        if isinstance(data.get('releasedEvent'), list) and data['releasedEvent']:
+            date = data['releasedEvent'][0].get('startDate')
+            if date:
+                match = re.search(r'(\d{4})', str(date))
+                if match:
+                    return int(match.group(1))
+        
+        # Check other date fields
+        for field in ['dateCreated', 'datePublished']:
+            date = data.get(field)
+            if date:
+                match = re.search(r'(\d{4})', str(date))
+                if match:
+                    return int(match.group(1))
+    return None
+
+
+def clean_text(text):
+    """Ultra-fast text cleaning."""
+    if not text:
+        return ""
+    cleaned = text.strip()
+    if ',' in cleaned:
+        cleaned = cleaned.partition(',')[0]
+    return cleaned
+
+
+def assemble_film_data(year_text, ld_json_texts, footer_text, languages, countries,
+                       genres, directors, actors, rules=ASYNC_RULES):
+    """
+    Build a film record from the raw text pieces every backend extracts, applying the
+    non-selector parts of the rules (year fallback, actor limit, text clean-up).
+    """
+    film_data = {
+        'languages': set(),
+        'countries': set(),
+        'genres': set(),
+        'directors': set(),
+        'actors': set(),
+        'year': None,
+        'decade': None,
+        'runtime': 0
+    }
+    
+    year = None
+    try:
+        if year_text is not None:
+            match = re.search(r'(\d{4})', year_text)
+            if match:
+                year = int(match.group(1))
+        if year is None:
+            scripts = ld_json_texts()
+            for raw in scripts[:rules.ld_json_limit] if rules.ld_json_limit else scripts:
+                year = year_from_ld_json(raw, rules.ld_json_types)
+                if year:
+                    break
+    except Exception:
+        year = None
+    if year:
+        film_data['year'] = year
+        film_data['decade'] = f"{year // 10 * 10}s"
+    
+    if footer_text:
+        match = re.search(r'(\d+)\s*min', footer_text, re.I)
+        if match:
+            film_data['runtime'] = int(match.group(1))
+    
+    try:
+        for text in languages:
+            lang = clean_text(text)
+            if lang and lang != "No spoken language":
+                film_data['languages'].add(lang)
+        
+        for text in countries:
+            country = clean_text(text)
+            if country:
+                film_data['countries'].add(country)
+        
+        for text in genres:
+            genre = clean_text(text)
+            if genre:
+                film_data['genres'].add(genre.capitalize())
+        
+        for text in directors:
+            director = clean_text(text)
+            if director:
+                film_data['directors'].add(director)
+        
+        for text in actors[:rules.actor_limit] if rules.actor_limit else actors:
+            actor = clean_text(text)
+            if actor and not any(x in actor.lower() for x in ['show all', 'show ']):
+                film_data['actors'].add(actor)
+    except Exception as e:
+        logger.error(f"Error in data extraction: {e}")
+    
+    return film_data
+
+
+# Precompiled XPath equivalents of the CSS selectors shared by every rule set
+_XP_RELEASEDATE = etree.XPath(f"//span[{_has_class('releasedate')}]//a")
+_XP_LD_JSON = etree.XPath("//script[@type='application/ld+json']")
+_XP_FOOTER = etree.XPath(f"//*[{_has_class('text-link')} and {_has_class('text-footer')}]")
+_XP_TEXT = etree.XPath(".//text()")
+_LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_compiled_xpaths = {}
+
+
+def _rule_xpaths(rules):
+    """Return the compiled (scope, path) XPath pairs of a rule set, in SELECTED_FIELDS order."""
+    compiled = _compiled_xpaths.get(rules.name)
+    if compiled is None:
+        compiled = [
+            (etree.XPath(scope) if scope else None, etree.XPath(path))
+            for scope, path in (rules.xpath[field] for field in SELECTED_FIELDS)
+        ]
+        _compiled_xpaths[rules.name] = compiled
+    return compiled
+
+
+def _lxml_texts(root, scope, path):
+    """Texts of the elements matched by a compiled (scope, path) pair in an lxml document."""
+    if scope is not None:
+        scopes = scope(root)
+        if not scopes:
+            return []
+        root = scopes[0]
+    return [a.text_content() for a in path(root)]
+
+
+def lxml_tree(content):
+    """Parse film page HTML into an lxml document."""
+    if isinstance(content, bytes):
+        return lxml.html.document_fromstring(content, parser=_LXML_PARSER)
+    return lxml.html.document_fromstring(content)
+
+
+def parse_film_page_lxml(content, rules=ASYNC_RULES):
+    """Extract a film record with direct lxml XPath queries (no BeautifulSoup tree)."""
+    return extract_film_data_lxml(lxml_tree(content), rules)
+
+
+def extract_film_data_lxml(root, rules=ASYNC_RULES):
+    """Extract a film record from an lxml document."""
+    release = _XP_RELEASEDATE(root)
+    footer = _XP_FOOTER(root)
+    
+    return assemble_film_data(
+        release[0].text_content() if release else None,
+        lambda: [script.text for script in _XP_LD_JSON(root)],
+        rules.footer_separator.join(_XP_TEXT(footer[0])) if footer else None,
+        *(_lxml_texts(root, scope, path) for scope, path in _rule_xpaths(rules)),
+        rules=rules,
+    )
+
+
+def _selectolax_texts(tree, scoped_selector):
+    """Texts of the elements matched by a (scope, selector) pair in a selectolax tree."""
+    scope, selector = scoped_selector
+    root = tree.css_first(scope) if scope else tree
+    if root is None:
+        return []
+    return [a.text() for a in root.css(selector)]
+
+
+def parse_film_page_selectolax(content, rules=ASYNC_RULES):
+    """Extract a film record with selectolax, using the rules' CSS selectors."""
+    return extract_film_data_selectolax(SelectolaxParser(content), rules)
+
+
+def extract_film_data_selectolax(tree, rules=ASYNC_RULES):
+    """Extract a film record from a selectolax tree."""
+    release = tree.css_first('span.releasedate a')
+    footer = tree.css_first('.text-link.text-footer')
+    
+    return assemble_film_data(
+        release.text() if release else None,
+        lambda: [script.text() for script in tree.css('script[type="application/ld+json"]')],
+        footer.text(separator=rules.footer_separator) if footer else None,
+        *(_selectolax_texts(tree, getattr(rules, field)) for field in SELECTED_FIELDS),
+        rules=rules,
+    )
+
+
+def parse_film_page_timed(content, backend='bs4', rules=ASYNC_RULES):
+    """
+    Like parse_film_page, but also time both halves of the work.
+    Returns (record, parse_seconds, extract_seconds): building the document tree, then
+    extracting the record from it.
+    """
+    start = time.perf_counter()
+    if backend == 'lxml':
+        tree, extract = lxml_tree(content), extract_film_data_lxml
+    elif backend == 'selectolax':
+        tree, extract = SelectolaxParser(content), extract_film_data_selectolax
+    else:
+        tree, extract = BeautifulSoup(content, 'lxml'), extract_film_data
+    parsed = time.perf_counter()
+    film_data = extract(tree, rules)
+    return film_data, parsed - start, time.perf_counter() - parsed
@@ -0,0 +1,230 @@
+"""
+Columnar per-film store.
+Keeps every analyzed film's extracted data so statistics can be re-aggregated, filtered
+or extended without scraping again.
+"""
+import os
+import json
+import logging
+from array import array
+
+try:
+    import numpy
+except ImportError:  # Optional: speeds up aggregation of large tables
+    numpy = None
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Multi-valued categories stored per film, in record field order
+CATEGORIES = ('languages', 'countries', 'genres', 'directors', 'actors')
+SIDECAR_SUFFIX = '.films.json'
+SIDECAR_VERSION = 1
+
+
+def sidecar_path(csv_path):
+    """Return the film table file stored next to a statistics CSV."""
+    return os.path.splitext(csv_path)[0] + SIDECAR_SUFFIX
+
+
+class CategoryColumn:
+    """
+    One multi-valued category in CSR layout: the IDs of row i are
+    ids[offsets[i]:offsets[i + 1]], and IDs index into the column's own vocabulary.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.offsets = array('I', [0])
+        self.ids = array('I')
+
+    def append_row(self, names):
+        index = self.index
+        for name in names or ():
+            idx = index.get(name)
+            if idx is None:
+                idx = len(self.names)
+                index[name] = idx
+                self.names.append(name)
+            self.ids.append(idx)
+        self.offsets.append(len(self.ids))
+
+    def row_names(self, row):
+        return [self.names[idx] for idx in self.ids[self.offsets[row]:self.offsets[row + 1]]]
+
+    def rows_with(self, names):
+        """Return the set of rows containing any of the given names."""
+        wanted = {self.index[name] for name in names if name in self.index}
+        if not wanted:
+            return set()
+        ids, offsets = self.ids, self.offsets
+        return {
+            row for row in range(len(offsets) - 1)
+            if not wanted.isdisjoint(ids[offsets[row]:offsets[row + 1]])
+        }
+
+    def count(self, rows=None):
+        """Return an array of per-ID counts over all rows or over the given rows."""
+        size = len(self.names)
+        if numpy is not None and len(self.ids):
+            ids = numpy.frombuffer(self.ids, dtype=numpy.uint32)
+            if rows is not None:
+                offsets = numpy.frombuffer(self.offsets, dtype=numpy.uint32)
+                lengths = numpy.diff(offsets)
+                mask = numpy.zeros(len(lengths), dtype=bool)
+                mask[numpy.fromiter(rows, dtype=numpy.int64)] = True
+                ids = ids[numpy.repeat(mask, lengths)]
+            return array('I', numpy.bincount(ids, minlength=size).astype(numpy.uint32).tobytes())
+
+        counts = array('I', bytes(4 * size))
+        if rows is None:
+            for idx in self.ids:
+                counts[idx] += 1
+        else:
+            ids, offsets = self.ids, self.offsets
+            for row in rows:
+                for idx in ids[offsets[row]:offsets[row + 1]]:
+                    counts[idx] += 1
+        return counts
+
+
+class FilmTable:
+    """
+    Columnar table of analyzed films.
+    Scalar columns (year, decade, runtime) are compact arrays with 0 for unknown values;
+    multi-valued categories are CategoryColumns. Rows are appended in analysis order
+    and looked up by film URL.
+    """
+
+    def __init__(self):
+        self.urls = []
+        self.rows = {}
+        self.years = array('H')
+        self.decades = array('H')
+        self.runtimes = array('H')
+        self.categories = {name: CategoryColumn() for name in CATEGORIES}
+
+    def __len__(self):
+        return len(self.urls)
+
+    def __contains__(self, url):
+        return url in self.rows
+
+    def add(self, url, film_data):
+        """Append a film record. Films already in the table are left unchanged."""
+        row = self.rows.get(url)
+        if row is not None:
+            return row
+        row = len(self.urls)
+        self.rows[url] = row
+        self.urls.append(url)
+
+        year = film_data.get('year') or 0
+        decade = film_data.get('decade')
+        self.years.append(year)
+        self.decades.append(int(decade[:-1]) if decade else year // 10 * 10)
+        self.runtimes.append(min(film_data.get('runtime') or 0, 0xFFFF))
+        for name, column in self.categories.items():
+            column.append_row(film_data.get(name))
+        return row
+
+    def record(self, url):
+        """Return the stored record of a film in the scrapers' format, or None if unknown."""
+        row = self.rows.get(url)
+        if row is None:
+            return None
+        film_data = {name: set(column.row_names(row)) for name, column in self.categories.items()}
+        film_data['year'] = self.years[row] or None
+        film_data['decade'] = f"{self.decades[row]}s" if self.decades[row] else None
+        film_data['runtime'] = self.runtimes[row]
+        return film_data
+
+    def select(self, decade=None, year=None, **criteria):
+        """
+        Return the sorted rows matching every filter, e.g. select(decade='1990s', genres='Drama').
+        Category filters accept one name or a list of names (a film matches if it has any of them).
+        """
+        rows = None
+        if decade is not None:
+            value = int(str(decade).rstrip('s'))
+            rows = {row for row, d in enumerate(self.decades) if d == value}
+        if year is not None:
+            matched = {row for row, y in enumerate(self.years) if y == year}
+            rows = matched if rows is None else rows & matched
+        for name, wanted in criteria.items():
+            if name not in self.categories:
+                raise ValueError(f"Unknown film category: {name}")
+            names = [wanted] if isinstance(wanted, str) else list(wanted)
+            matched = self.categories[name].rows_with(names)
+            rows = matched if rows is None else rows & matched
+        return sorted(rows) if rows is not None else list(range(len(self.urls)))
+
+    def aggregate(self, rows=None):
+        """
+        Count categories, decades and runtime over all rows or a selection.
+        Returns {'films', 'runtime_minutes', 'decades': {decade: count}, <category>: (names, counts)}
+        where counts is an array('I') aligned with the category's vocabulary.
+        """
+        selected = range(len(self.urls)) if rows is None else rows
+        decades = {}
+        runtime = 0
+        films = 0
+        for row in selected:
+            films += 1
+            runtime += self.runtimes[row]
+            if self.decades[row]:
+                key = f"{self.decades[row]}s"
+                decades[key] = decades.get(key, 0) + 1
+
+        result = {'films': films, 'runtime_minutes': runtime, 'decades': decades}
+        for name, column in self.categories.items():
+            result[name] = (column.names, column.count(rows))
+        return result
+
+    def to_dict(self):
+        """Serialize the table to JSON-compatible columns."""
+        return {
+            'version': SIDECAR_VERSION,
+            'urls': self.urls,
+            'years': self.years.tolist(),
+            'decades': self.decades.tolist(),
+            'runtimes': self.runtimes.tolist(),
+            'categories': {
+                name: {'names': column.names, 'offsets': column.offsets.tolist(), 'ids': column.ids.tolist()}
+                for name, column in self.categories.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a table serialized with to_dict."""
+        if data.get('version') != SIDECAR_VERSION:
+            raise ValueError(f"Unsupported film table version: {data.get('version')}")
+        table = cls()
+        table.urls = list(data['urls'])
+        table.rows = {url: row for row, url in enumerate(table.urls)}
+        table.years = array('H', data['years'])
+        table.decades = array('H', data['decades'])
+        table.runtimes = array('H', data['runtimes'])
+        for name, column_data in data['categories'].items():
+            if name not in table.categories:
+                continue
+            column = table.categories[name]
+            column.names = list(column_data['names'])
+            column.index = {n: idx for idx, n in enumerate(column.names)}
+            column.offsets = array('I', column_data['offsets'])
+            column.ids = array('I', column_data['ids'])
+        return table
+
+    def save(self, path):
+        """Write the table to a JSON sidecar file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        """Read a table written by save."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
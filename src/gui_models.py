@@ -0,0 +1,159 @@
+"""
+GUI table models.
+Qt models used to display statistics in the results window.
+"""
+from array import array
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from .ranking import top_items
+
+
+# Result table models and the StatisticsData counters they display
+MODEL_COUNTERS = {
+    'countries': 'country_dict',
+    'languages': 'lang_dict',
+    'genres': 'genre_dict',
+    'directors': 'director_dict',
+    'actors': 'actor_dict',
+}
+
+
+class StatsTableModel(QAbstractTableModel):
+    """
+    Read-only Name / Films / Percentage table backed by a names list and an array of counts.
+    No per-cell Qt objects are created: data() formats only the cells a view asks for,
+    so populating creates no per-row Qt objects and rendering only touches visible rows.
+    """
+    
+    HEADERS = ('Name', 'Films', 'Percentage')
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._counts = array('I')
+        self._films_count = 0
+        self._sort_column = 1
+        self._sort_order = Qt.SortOrder.DescendingOrder
+    
+    def set_data(self, data_dict, films_count, limit=None):
+        """Replace the rows with the most frequent entries of a name -> count mapping."""
+        self.set_items(top_items(data_dict, limit), films_count)
+    
+    def set_items(self, items, films_count):
+        """
+        Show ranked (name, count) pairs, updating the table in place: only rows whose
+        content changed are refreshed and rows are inserted or removed at the end,
+        so views keep their scroll position and selection during live updates.
+        """
+        names = [name for name, _ in items]
+        counts = array('I', [count for _, count in items])
+        if (self._sort_column, self._sort_order) != (1, Qt.SortOrder.DescendingOrder):
+            names, counts = self._sorted(names, counts)
+        
+        old_names, old_counts = self._names, self._counts
+        old_rows, new_rows = len(old_names), len(names)
+        common = min(old_rows, new_rows)
+        films_changed = films_count != self._films_count
+        
+        if new_rows < old_rows:
+            self.beginRemoveRows(QModelIndex(), new_rows, old_rows - 1)
+            self._names, self._counts = old_names[:new_rows], old_counts[:new_rows]
+            self.endRemoveRows()
+        
+        # Refresh the rows both tables share
+        self._names, self._counts, self._films_count = names[:common], counts[:common], films_count
+        changed = [
+            row for row in range(common)
+            if old_names[row] != names[row] or old_counts[row] != counts[row]
+        ]
+        if changed:
+            self.dataChanged.emit(self.index(changed[0], 0), self.index(changed[-1], 2))
+        if films_changed and common:
+            # Percentages depend on the film total
+            self.dataChanged.emit(self.index(0, 2), self.index(common - 1, 2))
+        
+        if new_rows > old_rows:
+            self.beginInsertRows(QModelIndex(), old_rows, new_rows - 1)
+            self._names, self._counts = names, counts
+            self.endInsertRows()
+    
+    def clear(self):
+        """Remove all rows."""
+        self.beginResetModel()
+        self._names = []
+        self._counts = array('I')
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return self._names[row]
+            if column == 1:
+                return str(self._counts[row])
+            if self._films_count:
+                return format(self._counts[row] / self._films_count * 100, ".2f") + "%"
+            return "0.00%"
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > 0:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section] if section < len(self.HEADERS) else None
+        return str(section + 1)
+    
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort by name, or by count (the Films and Percentage columns sort alike)."""
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._apply_sort()
+        self.layoutChanged.emit()
+    
+    def _apply_sort(self):
+        self._names, self._counts = self._sorted(self._names, self._counts)
+    
+    def _sorted(self, names, counts):
+        descending = self._sort_order == Qt.SortOrder.DescendingOrder
+        if self._sort_column == 0:
+            order = sorted(range(len(names)), key=lambda i: names[i].casefold(), reverse=descending)
+        else:
+            order = sorted(range(len(counts)), key=counts.__getitem__, reverse=descending)
+        return [names[i] for i in order], array('I', [counts[i] for i in order])
+
+
+class GUIModels:
+    """Manages Qt models for displaying statistics in tables."""
+    
+    def __init__(self):
+        self.models = {name: StatsTableModel() for name in MODEL_COUNTERS}
+    
+    def clear_all(self):
+        """Clear all models."""
+        for model in self.models.values():
+            model.clear()
+    
+    def populate_model(self, model_name, data_dict, films_count, limit=None):
+        """Populate a specific model with sorted data."""
+        if model_name not in self.models:
+            return
+        self.models[model_name].set_data(data_dict, films_count, limit)
+    
+    def apply_snapshot(self, snapshot):
+        """Update every model in place from a live results snapshot (see snapshots.take_snapshot)."""
+        for model_name, attr in MODEL_COUNTERS.items():
+            self.models[model_name].set_items(snapshot[attr], snapshot['films'])
+    
+    def get_model(self, name):
+        """Get a specific model by name."""
+        return self.models.get(name)
@@ -12,10 +12,9 @@ from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from gui.gui_main import Ui_MainWindow
 from gui.gui_results import Ui_Dialog
 from gui.gui_settings import Ui_Dialog as Ui_Dialog_Settings
-from .scraper_optimized import LetterboxdScraper
-from .scraper_legacy import LegacyLetterboxdScraper
-from .scraper_async import AsyncLetterboxdScraper
+from .scrapers import create_scraper, run_scrape
 from .data_manager import DataManager
+from .snapshots import SnapshotPublisher
 
 
 # Configure logging
@@ -24,24 +23,24 @@ logger = logging.getLogger(__name__)
 
 class LoginThread(QThread):
     """Thread for running the login/scraping process."""
-    doneSignal = pyqtSignal()
+    doneSignal = pyqtSignal(bool)  # Whether the analysis completed
+    snapshotSignal = pyqtSignal(object)  # Partial results, see snapshots.take_snapshot
 
-    def __init__(self, login: str, app_context):
+    def __init__(self, login: str, app_context, incremental: bool = False):
         super().__init__()
         self.login = login
         self.app_context = app_context
+        self.incremental = incremental
         
         # Select scraper based on configuration
-        if app_context.config.scraper_profile == "legacy":
-            self.scraper = LegacyLetterboxdScraper(app_context)
-        elif app_context.config.scraper_profile == "async":
-            self.scraper = AsyncLetterboxdScraper(app_context)
-        else:  # Default to optimized scraper
-            self.scraper = LetterboxdScraper(app_context)
+        self.scraper = create_scraper(app_context)
+        # Publish partial results while scraping
+        self.scraper.snapshots = SnapshotPublisher(
+            app_context.stats_data, self.snapshotSignal.emit, app_context.config.list_delim
+        )
 
     def run(self):
-        self.scraper.scrape_user_profile(self.login)
-        self.doneSignal.emit()
+        self.doneSignal.emit(run_scrape(self.scraper, self.app_context.stats_data, self.login, self.incremental))
 
 
 class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
@@ -73,6 +72,8 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.ui.pushButton_close.clicked.connect(self.dialog.accept)
         
         self.loginInput = None
+        self._table_views_ready = False
+        self._live_results_shown = False
         self.lineEdit.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
         self.pushButton.clicked.connect(self.analyze)
         # Wire Load button to open-file CSV loader
@@ -80,8 +81,18 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
     def analyze(self):
         """Start analyzing a user's Letterboxd profile."""
+        username = self.lineEdit.text()
+        
+        # Re-analyzing the currently loaded user only fetches films added since that result
+        incremental = (
+            self.app_context.config.incremental_scrape
+            and username == self.loginInput
+            and bool(self.app_context.stats_data.url_list)
+        )
+        
         # Reset data for new search
-        self.app_context.stats_data.reset()
+        if not incremental:
+            self.app_context.stats_data.reset()
         self.app_context.gui_models.clear_all()
 
         self.pushButton.setEnabled(False)
@@ -92,12 +103,14 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self.ui.pushButton_save.setEnabled(True)
             self.ui.pushButton_save.setText("Save results")
         
-        self.loginInput = self.lineEdit.text()
-        logger.info(f"Starting analysis for user: {self.loginInput}")
+        self.loginInput = username
+        self._live_results_shown = False
+        logger.info(f"Starting {'incremental ' if incremental else ''}analysis for user: {self.loginInput}")
 
         # Run login function inside of a thread
-        self.thread = LoginThread(self.loginInput, self.app_context)
-        self.thread.doneSignal.connect(self.loginComplete)
+        self.thread = LoginThread(self.loginInput, self.app_context, incremental)
+        self.thread.doneSignal.connect(self.analysisDone)
+        self.thread.snapshotSignal.connect(self.show_live_results)
         self.thread.start()
 
     def open_settings_dialog(self):
@@ -139,11 +152,40 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.dialogSettings.accepted.connect(save)
         self.dialogSettings.show()
 
+    def show_live_results(self, snapshot):
+        """Show partial results while the analysis is still running."""
+        if self.sender() is not getattr(self, 'thread', None):
+            return  # Late snapshot of a previous analysis
+        self.app_context.gui_models.apply_snapshot(snapshot)
+        self.ui.label_results.setText(f"Films analyzed so far: {snapshot['films']}")
+        if not self._live_results_shown:
+            self._live_results_shown = True
+            self.ui.label_username.setText("User: " + self.loginInput)
+            self.ui.label_results2.setText("Analysis in progress...")
+            self.ui.label_5.setText("-")
+            self._setup_table_views()
+            self.dialog.show()
+        # Partial results cannot be saved
+        self.ui.pushButton_save.setEnabled(False)
+
+    def analysisDone(self, succeeded):
+        """Show the results of a completed analysis, or ask for another username."""
+        if succeeded:
+            self.loginComplete()
+            return
+        self.pushButton.setText("Analyze")
+        self.pushButton.setEnabled(True)
+        QtWidgets.QMessageBox.warning(
+            self, "Analysis failed",
+            f"Could not analyze '{self.loginInput}'. Check the Letterboxd username and your connection, then try again."
+        )
+
     def loginComplete(self):
         """Handle completion of login/scraping process."""
         # Re-enable the Analyze button for new searches
         self.pushButton.setText("Analyze")
         self.pushButton.setEnabled(True)
+        self.ui.pushButton_save.setEnabled(True)
         
         # Generate GUI strings
         self.data_manager.generate_gui_strings(self.app_context.stats_data.films_count)
@@ -168,6 +210,13 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.app_context.gui_models.populate_model('genres', self.app_context.stats_data.genre_dict, self.app_context.stats_data.films_count, self.app_context.config.list_delim)
         self.app_context.gui_models.populate_model('directors', self.app_context.stats_data.director_dict, self.app_context.stats_data.films_count, self.app_context.config.list_delim)
         self.app_context.gui_models.populate_model('actors', self.app_context.stats_data.actor_dict, self.app_context.stats_data.films_count, self.app_context.config.list_delim)
+        self._setup_table_views()
+
+    def _setup_table_views(self):
+        """Attach the models to the results tables. The models are updated in place afterwards."""
+        if self._table_views_ready:
+            return
+        self._table_views_ready = True
 
         # Set models in table views
         self.ui.tableView_1.setModel(self.app_context.gui_models.get_model('countries'))
@@ -200,14 +249,20 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.header5.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.header5.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
 
+        # Models sort themselves; start from the most frequent entries
+        for view in (self.ui.tableView_1, self.ui.tableView_2, self.ui.tableView_3,
+                     self.ui.tableView_botLeft, self.ui.tableView_botCenter):
+            view.horizontalHeader().setSortIndicator(1, Qt.SortOrder.DescendingOrder)
+            view.setSortingEnabled(True)
+
     def load_from_csv(self):
-        """Load statistics from a CSV file."""
-        # Open file dialog restricted to CSV files
+        """Load statistics from a CSV or binary (.lpb) file."""
+        # Open file dialog restricted to saved statistics files
         file_path, _ = QFileDialog.getOpenFileName(
             self,
-            "Open statistics CSV",
+            "Open statistics",
             os.path.abspath('.'),
-            "CSV Files (*.csv)"
+            "Statistics Files (*.csv *.lpb);;CSV Files (*.csv);;LePrAn Binary Files (*.lpb)"
         )
         if not file_path:
             return
@@ -219,7 +274,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         
         meta = self.data_manager.load_stats_from_csv(file_path)
         # Set username label from CSV contents if present; fallback to filename
-        loaded_user = (meta or {}).get('username') if isinstance(meta, dict) else ''
+        loaded_user = meta.username if meta else ''
         if loaded_user:
             self.loginInput = loaded_user
         else:
@@ -238,15 +293,17 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         username = self.loginInput or "user"
         default_filename = f"{username}.csv"
         
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self.dialog,
-            "Save statistics CSV",
+            "Save statistics",
             default_filename,
-            "CSV Files (*.csv);;All Files (*)"
+            "CSV Files (*.csv);;LePrAn Binary Files (*.lpb);;All Files (*)"
         )
         
         if not file_path:
             return  # User cancelled the dialog
+        if '*.lpb' in selected_filter and not file_path.lower().endswith('.lpb'):
+            file_path = os.path.splitext(file_path)[0] + '.lpb'
         
         # Save the current statistics to CSV
         scraped_at = self.app_context.stats_data.gui_scraped_at or time.strftime("%d/%m/%Y", time.localtime())
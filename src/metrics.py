@@ -0,0 +1,270 @@
+"""
+Scrape instrumentation.
+Histograms of per-stage timings (network, parsing, aggregation, queueing) and counters,
+readable through an API, a JSON summary file and a Prometheus text endpoint.
+"""
+import json
+import time
+import bisect
+import logging
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds in seconds and in bytes; a final +Inf bucket is implied
+SECONDS_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Timed stages, in pipeline order
+STAGES = (
+    'dns',         # Host name resolution (async profile only)
+    'connect',     # New connection set-up (async profile only)
+    'ttfb',        # Request sent until response headers arrive
+    'download',    # Response headers until the body is read
+    'decompress',  # CPU time decoding compressed bodies
+    'request',     # One request attempt, failed attempts included
+    'queue_wait',  # Film queued until a worker picks it up
+    'parse',       # Page bytes to document tree
+    'extract',     # Document tree to film record
+    'aggregate',   # Counting records into the statistics, including lock waits
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with count, sum, min and max. Safe to update from several threads."""
+
+    def __init__(self, buckets=SECONDS_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside its bucket (as Prometheus does)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([*map(str, self.bounds), '+Inf'], self.counts)),
+        }
+
+
+class Metrics:
+    """
+    Instrumentation of one scrape: a histogram per stage (STAGES, in seconds), a histogram of
+    response sizes and named counters. fetch_hook plugs into a fetcher's hooks.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Record one duration of a stage."""
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, Histogram())
+        histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def time(self, stage):
+        """Context manager timing its block into a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def fetch_hook(self, url, outcome, status, elapsed, nbytes, attempt):
+        """Fetcher hook: time every attempt and count outcomes, retries and bytes."""
+        self.observe('request', elapsed)
+        self.inc(f'requests_{outcome}')
+        if attempt:
+            self.inc('retries')
+        if status == 304:
+            self.inc('not_modified')
+        if nbytes:
+            self.response_bytes.observe(nbytes)
+            self.inc('bytes', nbytes)
+
+    def summary(self):
+        """Return the metrics as a JSON-serializable dict (stages without samples are omitted)."""
+        return {
+            'started_at': self.started_at,
+            'duration_s': time.time() - self.started_at,
+            'stages': {stage: h.to_dict() for stage, h in self.stages.items() if h.count},
+            'response_bytes': self.response_bytes.to_dict(),
+            'counters': dict(self.counters),
+        }
+
+    def summary_lines(self):
+        """Human-readable per-stage breakdown: count, total, p50 and p95."""
+        lines = []
+        for stage, h in self.stages.items():
+            if h.count:
+                lines.append(f"  {stage:<11}{h.count:>7}x  total {h.sum:8.2f}s  "
+                             f"p50 {h.quantile(0.5) * 1000:8.1f}ms  p95 {h.quantile(0.95) * 1000:8.1f}ms")
+        return lines
+
+    def write_summary(self, path, **extra):
+        """Write summary() plus extra fields to a JSON file."""
+        document = dict(self.summary(), **extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+
+    def to_prometheus(self, prefix='lepran'):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Duration of each scrape stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, h in self.stages.items():
+            lines += _prometheus_histogram(f"{prefix}_stage_seconds", h, f'stage="{stage}"')
+        lines += [
+            f"# HELP {prefix}_response_bytes Size of downloaded response bodies.",
+            f"# TYPE {prefix}_response_bytes histogram",
+        ]
+        lines += _prometheus_histogram(f"{prefix}_response_bytes", self.response_bytes)
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        return '\n'.join(lines) + '\n'
+
+
+def finish_run(metrics, config, username=None, **extra):
+    """
+    Report a finished scrape: print the stage breakdown and, when metricsFile is configured,
+    write the JSON summary ('{username}' in the path is replaced by the analyzed user).
+    """
+    lines = metrics.summary_lines()
+    if lines:
+        print("Stage timings:")
+        print('\n'.join(lines))
+    if config.metrics_file:
+        path = config.metrics_file.replace('{username}', username or '')
+        try:
+            metrics.write_summary(path, username=username, **extra)
+        except OSError as e:
+            logger.warning(f"Could not write metrics summary to {path}: {e}")
+
+
+def _prometheus_histogram(name, histogram, labels=''):
+    sep = ',' if labels else ''
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip([*map(repr, histogram.bounds), '+Inf'], histogram.counts):
+        cumulative += bucket_count
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+    suffix = f'{{{labels}}}' if labels else ''
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def make_trace_config(metrics):
+    """
+    Return an aiohttp TraceConfig feeding DNS resolution and connection set-up times into metrics.
+    Connections reused from the pool produce no samples, so the counts show how often new
+    connections were needed.
+    """
+    import aiohttp
+
+    async def on_dns_start(session, ctx, params):
+        ctx.dns_start = time.perf_counter()
+
+    async def on_dns_end(session, ctx, params):
+        metrics.observe('dns', time.perf_counter() - ctx.dns_start)
+
+    async def on_connect_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def on_connect_end(session, ctx, params):
+        metrics.observe('connect', time.perf_counter() - ctx.connect_start)
+        metrics.inc('connections_opened')
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connect_start)
+    trace_config.on_connection_create_end.append(on_connect_end)
+    return trace_config
+
+
+class MetricsServer:
+    """
+    Background HTTP server exposing /metrics in the Prometheus text format.
+    source is a callable returning the Metrics to render (or None before the first scrape).
+    """
+
+    def __init__(self, port, source, host='127.0.0.1'):
+        self.source = source
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split('?')[0] != '/metrics':
+                    handler.send_error(404)
+                    return
+                metrics = self.source()
+                body = (metrics.to_prometheus() if metrics else '').encode('utf-8')
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                logger.debug(f"metrics endpoint: {format % args}")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+        self.thread.start()
+        logger.info(f"Serving metrics on http://{host}:{self.port}/metrics")
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,58 @@
+"""
+Console progress bar shared by the scrapers.
+"""
+import sys
+import time
+
+
+class ProgressBar:
+    """
+    Single-line progress bar with ETA, redrawn at most every `interval` seconds.
+    The total may grow while work is discovered (e.g. while listing pages arrive).
+    """
+
+    def __init__(self, total=0, interval=0.1, width=40, stream=None):
+        self.total = total
+        self.interval = interval
+        self.width = width
+        self.stream = stream
+        self.start_time = time.time()
+        self._last_draw = 0.0
+
+    def update(self, completed, total=None):
+        """Redraw the bar for `completed` items, unless it was drawn less than `interval` ago."""
+        if total is not None:
+            self.total = total
+        now = time.time()
+        if now - self._last_draw < self.interval and completed < self.total:
+            return
+        self._last_draw = now
+        self.draw(completed, now)
+
+    def draw(self, completed, now=None):
+        total = self.total
+        if total <= 0:
+            return
+        now = now or time.time()
+        elapsed_time = now - self.start_time
+        progress = completed / total * 100
+        filled = int(self.width * min(completed, total) / total)
+        bar = '█' * filled + '░' * (self.width - filled)
+        remaining = max(0, total - completed)
+        line = f"[{bar}] {progress:.1f}% | {completed}/{total} films | {remaining} remaining"
+        if completed > 0 and elapsed_time > 0:
+            speed = completed / elapsed_time
+            eta_seconds = remaining / speed if speed > 0 else 0
+            if eta_seconds < 60:
+                eta_str = f"{int(eta_seconds)}s"
+            else:
+                eta_str = f"{int(eta_seconds // 60)}m{int(eta_seconds % 60)}s"
+            line += f" | ETA: {eta_str}"
+        # Resolve the stream at draw time so redirect_stdout applies
+        stream = self.stream or sys.stdout
+        stream.write(f"\r{' ' * 120}\r{line}")
+        stream.flush()
+
+    def finish(self):
+        """End the progress line."""
+        (self.stream or sys.stdout).write("\n")
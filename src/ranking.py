@@ -0,0 +1,64 @@
+"""
+Ranking of statistics counters.
+Computes the top-K entries of a counter with a partial sort. InternedCounters rank
+themselves through top_ids and cache the result until their counts change.
+"""
+import heapq
+from itertools import compress
+
+try:
+    import numpy
+except ImportError:  # Optional: faster selection for large vocabularies
+    numpy = None
+
+
+# Below this many IDs heapq beats the cost of wrapping the counts in NumPy
+NUMPY_MIN_SIZE = 4096
+
+
+def _limit(k):
+    """Normalize a display limit: None or a negative value (list_delim -1) means no limit."""
+    return None if k is None or k < 0 else k
+
+
+def top_ids(counts, k=None):
+    """
+    Return the indices of the k largest non-zero counts, ordered by count descending and
+    then by index, i.e. the order of sorted(..., reverse=True) over the live indices.
+    """
+    k = _limit(k)
+    size = len(counts)
+    if k == 0 or not size:
+        return []
+
+    if numpy is not None and size >= NUMPY_MIN_SIZE:
+        values = numpy.frombuffer(counts, dtype=numpy.uint32) if counts.itemsize == 4 else numpy.asarray(counts)
+        live = numpy.flatnonzero(values)
+        if k is not None and k < len(live):
+            # Everything above the k-th largest count, then ties at that count in index order
+            kth = numpy.partition(values[live], len(live) - k)[len(live) - k]
+            above = live[values[live] > kth]
+            ties = live[values[live] == kth][:k - len(above)]
+            live = numpy.concatenate((above, ties))
+        order = numpy.lexsort((live, -values[live].astype(numpy.int64)))
+        return live[order].tolist()
+
+    live = compress(range(size), counts)
+    if k is None:
+        return sorted(live, key=counts.__getitem__, reverse=True)
+    return heapq.nlargest(k, live, key=counts.__getitem__)
+
+
+def top_items(counter, k=None):
+    """
+    Return the k most frequent (name, count) pairs of a counter (all of them if k is None or -1).
+    InternedCounters answer from their cached ranking (InternedCounter.ranked); plain dicts
+    are ranked on every call.
+    """
+    k = _limit(k)
+    if hasattr(counter, 'ranked'):
+        return counter.ranked(k)
+    items = ((name, count) for name, count in counter.items() if count)
+    if k is None:
+        return sorted(items, key=lambda x: x[1], reverse=True)
+    return heapq.nlargest(k, items, key=lambda x: x[1])
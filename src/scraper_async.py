@@ -2,15 +2,16 @@
 Ultra-fast async scraper with significant performance improvements.
 Expected 2-5x speed improvement over current implementation.
 """
-import sys
 import asyncio
-import aiohttp
 import time
-import json
-import re
 import logging
-from bs4 import BeautifulSoup
-from collections import defaultdict
+import concurrent.futures
+from .film_parser import ASYNC_RULES, parse_film_page_timed, parse_listing_page, resolve_backend
+from .fetch import async_fetcher_class
+from .checkpoint import Checkpointer, load_checkpoint
+from .film_index import index_profile
+from .metrics import Metrics, finish_run
+from .progress import ProgressBar
 
 
 # Configure logging
@@ -29,414 +30,420 @@ class AsyncLetterboxdScraper:
     
     def __init__(self, app_context):
         self.app_context = app_context
-        self.session = None
-        self.semaphore = None
+        self.base_url = app_context.config.base_url.rstrip('/')
+        self.fetcher = None
+        self.metrics = None
+        self._queued_at = {}  # film url -> time it was queued, for queue wait metrics
+        self.film_cache = None
+        self.validator_store = None
+        self.not_modified_count = 0
+        self.snapshots = None  # Optional SnapshotPublisher for live results
+        self.checkpoint = None
+        self.parse_executor = None
+        self.parser_backend = 'bs4'
+        self.extraction_rules = ASYNC_RULES  # Every parser backend applies these rules
         
         # Performance tuning parameters - aggressive for maximum speed
         self.max_concurrent_requests = min(50, self.app_context.config.max_threads * 4)  # Very aggressive
+        self.max_concurrency_limit = max(self.max_concurrent_requests, min(200, self.app_context.config.max_threads * 8))
+        self.max_retries = 4
         self.request_delay = 0  # No delay between requests
-        self.batch_delay = 0  # No delay between batches
-        self.timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        
-        # In-memory aggregation for better performance
-        self.stats_aggregator = {
-            'languages': defaultdict(int),
-            'countries': defaultdict(int),
-            'genres': defaultdict(int),
-            'directors': defaultdict(int),
-            'actors': defaultdict(int),
-            'decades': defaultdict(int),
-            'runtimes': []
-        }
         
         # Progress tracking
         self.processed_count = 0
+        self.total_films = 0
+        self.progress = None
 
-    async def _create_session(self):
-        """Create optimized async session with connection pooling."""
-        connector = aiohttp.TCPConnector(
-            limit=100,  # High total connection pool size
-            limit_per_host=25,  # Aggressive connections per host
-            ttl_dns_cache=300,
-            use_dns_cache=True,
-            keepalive_timeout=60,
-            enable_cleanup_closed=True
+    def _create_fetcher(self):
+        """Create the pooled, rate-adapted fetcher used for every request of a run."""
+        fetcher_class = async_fetcher_class(self.app_context.config.http_backend)
+        return fetcher_class.from_config(
+            self.app_context.config,
+            initial_concurrency=self.max_concurrent_requests,
+            max_concurrency=self.max_concurrency_limit,
+            max_retries=self.max_retries,
+            metrics=self.metrics
         )
+
+    async def _fetch_film_record(self, url):
+        """
+        Return the extracted record for a film page, or None if it could not be fetched or parsed.
+        Served from the on-disk cache when possible, revalidated when expired, downloaded otherwise.
+        """
+        # Serve previously extracted records from the on-disk cache without any request
+        film_data = self.film_cache.get(url, self.extraction_rules.name) if self.film_cache else None
+        if film_data is not None:
+            self.metrics.inc('cache_hits')
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=self.timeout,
-            headers=headers
-        )
+        if film_data is None:
+            # An expired record can still be revalidated with a conditional request
+            validators = self.validator_store.get(url) if self.film_cache and self.validator_store else None
+            result = await self.fetcher.get(url, validators=validators, film_page=True)
+            if result.not_modified:
+                film_data = self.film_cache.get(url, self.extraction_rules.name, allow_stale=True)
+                if film_data is None:
+                    # Record evicted since the validators were stored
+                    result = await self.fetcher.get(url, film_page=True)
+                else:
+                    self.film_cache.put(url, self.extraction_rules.name, film_data)  # Restart the TTL
+                    self.validator_store.touch(url)
+                    self.not_modified_count += 1
+            if film_data is None and not result.content:
+                return None
+            content = result.content
         
-        # Semaphore to control concurrent requests
-        self.semaphore = asyncio.Semaphore(self.max_concurrent_requests)
-
-    async def _fetch_page(self, url):
-        """Fetch a single page with aggressive performance settings."""
-        async with self.semaphore:
-            for attempt in range(3):  # Retry logic
-                try:
-                    async with self.session.get(url) as response:
-                        if response.status == 200:
-                            content = await response.read()
-                            return content
-                        else:
-                            logger.warning(f"HTTP {response.status} for {url}")
-                            
-                except asyncio.TimeoutError:
-                    if attempt < 2:  # Only log on final failure
-                        logger.warning(f"Timeout for {url} (attempt {attempt + 1})")
-                except Exception as e:
-                    if attempt < 2:  # Only log on final failure
-                        logger.warning(f"Request failed for {url}: {e} (attempt {attempt + 1})")
-                
-                if attempt < 2:  # Don't delay on last attempt
-                    await asyncio.sleep(0.1 * (attempt + 1))  # Minimal backoff
-            
-            return None
+        if film_data is None:
+            try:
+                # CPU-bound parsing runs in the process pool so the event loop only does I/O
+                if self.parse_executor:
+                    loop = asyncio.get_running_loop()
+                    film_data, parse_time, extract_time = await loop.run_in_executor(
+                        self.parse_executor, parse_film_page_timed, content, self.parser_backend,
+                        self.extraction_rules
+                    )
+                else:
+                    film_data, parse_time, extract_time = parse_film_page_timed(
+                        content, self.parser_backend, self.extraction_rules
+                    )
+                self.metrics.observe('parse', parse_time)
+                self.metrics.observe('extract', extract_time)
+            except Exception as e:
+                logger.error(f"Error parsing {url}: {e}")
+                return None
+            
+            if self.film_cache:
+                self.film_cache.put(url, self.extraction_rules.name, film_data)
+                if result.validators and self.validator_store:
+                    self.validator_store.put(url, *result.validators)
+        return film_data
 
-    async def _scrape_film_page_async(self, url, total_films=0, start_time=0):
+    async def _scrape_film_page_async(self, url, total_films=0):
         """Ultra-fast async film page scraping with minimal parsing."""
-        content = await self._fetch_page(url)
-        if not content:
+        film_data = await self._fetch_film_record(url)
+        if film_data is None:
             return 0
         
         try:
-            # Use lxml parser for speed, parse only what we need
-            soup = BeautifulSoup(content, 'lxml')
-            
-            # Extract data with minimal DOM traversals
-            film_data = self._extract_film_data_fast(soup)
-            
-            # Aggregate data immediately (no locking needed in async)
-            self._aggregate_film_data(film_data)
+            # Count the film immediately (the lock is uncontended on the event loop)
+            with self.metrics.time('aggregate'):
+                self.app_context.stats_data.add_film_record(url, film_data)
+            if self.snapshots:
+                self.snapshots.films_added()
+            if self.checkpoint:
+                self.checkpoint.films_added()
             
             # Update progress after each film
-            if total_films > 0 and start_time > 0:
-                self.processed_count += 1
-                elapsed_time = time.time() - start_time
-                progress = (self.processed_count / total_films) * 100
-                bar_length = 40
-                filled = int(bar_length * self.processed_count / total_films)
-                bar = '█' * filled + '░' * (bar_length - filled)
-                remaining = total_films - self.processed_count
-                
-                # Calculate ETA based on current speed
-                if self.processed_count > 0 and elapsed_time > 0:
-                    speed = self.processed_count / elapsed_time
-                    eta_seconds = remaining / speed if speed > 0 else 0
-                    
-                    # Format ETA as Xm Ys or just Xs
-                    if eta_seconds < 60:
-                        eta_str = f"{int(eta_seconds)}s"
-                    else:
-                        minutes = int(eta_seconds // 60)
-                        seconds = int(eta_seconds % 60)
-                        eta_str = f"{minutes}m{seconds}s"
-                    
-                    # Clear line first, then print progress using sys.stdout for better compatibility
-                    sys.stdout.write(f"\r{' ' * 120}\r[{bar}] {progress:.1f}% | {self.processed_count}/{total_films} films | {remaining} remaining | ETA: {eta_str}")
-                    sys.stdout.flush()
-                else:
-                    sys.stdout.write(f"\r{' ' * 120}\r[{bar}] {progress:.1f}% | {self.processed_count}/{total_films} films | {remaining} remaining")
-                    sys.stdout.flush()
+            self.processed_count += 1
+            if self.progress:
+                self.progress.update(self.processed_count, total_films)
             
             return film_data.get('runtime', 0)
             
         except Exception as e:
-            logger.error(f"Error parsing {url}: {e}")
+            logger.error(f"Error aggregating {url}: {e}")
             return 0
 
-    def _extract_film_data_fast(self, soup):
-        """Ultra-fast data extraction with optimized selectors."""
-        film_data = {
-            'languages': set(),
-            'countries': set(), 
-            'genres': set(),
-            'directors': set(),
-            'actors': set(),
-            'decade': None,
-            'runtime': 0
-        }
-        
-        # Year extraction (fastest method first)
-        year = self._extract_year_optimized(soup)
-        if year:
-            film_data['decade'] = f"{year // 10 * 10}s"
-        
-        # Runtime extraction
-        film_data['runtime'] = self._extract_runtime_optimized(soup)
-        
-        # Extract all metadata in one pass
-        try:
-            # Languages and countries from details section
-            details = soup.select_one('#tab-details')
-            if details:
-                # Languages
-                for a in details.select('.text-sluglist a[href*="/language/"]'):
-                    lang = self._clean_text_fast(a.get_text())
-                    if lang and lang != "No spoken language":
-                        film_data['languages'].add("None" if lang == "No spoken language" else lang)
-                
-                # Countries  
-                for a in details.select('a[href*="/country/"]'):
-                    country = self._clean_text_fast(a.get_text())
-                    if country:
-                        film_data['countries'].add(country)
-            
-            # Genres
-            genres = soup.select('#tab-genres a[href*="/genre/"]')
-            for a in genres:
-                genre = self._clean_text_fast(a.get_text())
-                if genre:
-                    film_data['genres'].add(genre.capitalize())
-            
-            # Directors (production masthead first, fastest)
-            directors = soup.select('section.production-masthead .credits a[href*="/director/"]')
-            for a in directors:
-                director = self._clean_text_fast(a.get_text())
-                if director:
-                    film_data['directors'].add(director)
-            
-            # Actors (limit to avoid performance impact)
-            actors = soup.select('#tab-cast .cast-list a.text-slug')[:20]  # Limit to first 20
-            for a in actors:
-                actor = self._clean_text_fast(a.get_text())
-                if actor and not any(x in actor.lower() for x in ['show all', 'show ']):
-                    film_data['actors'].add(actor)
-                    
-        except Exception as e:
-            logger.error(f"Error in data extraction: {e}")
-        
-        return film_data
+    async def _get_films_from_page_async(self, url):
+        """Async film URL collection from page."""
+        return await self._fetch_listing_page(url) or ([], False, None)
 
-    def _extract_year_optimized(self, soup):
-        """Optimized year extraction with early exits."""
-        try:
-            # Method 1: Release date link (fastest)
-            date_link = soup.select_one('span.releasedate a')
-            if date_link:
-                match = re.search(r'(\d{4})', date_link.get_text())
-                if match:
-                    return int(match.group(1))
-            
-            # Method 2: JSON-LD (if needed)
-            for script in soup.select('script[type="application/ld+json"]'):
-                try:
-                    data = json.loads(script.string or '{}')
-                    if isinstance(data, dict):
-                        # Check release event
-                        if 'releasedEvent' in data and data['releasedEvent']:
-                            date = data['releasedEvent'][0].get('startDate')
-                            if date:
-                                match = re.search(r'(\d{4})', str(date))
-                                if match:
-                                    return int(match.group(1))
-                        
-                        # Check other date fields
-                        for field in ['dateCreated', 'datePublished']:
-                            date = data.get(field)
-                            if date:
-                                match = re.search(r'(\d{4})', str(date))
-                                if match:
-                                    return int(match.group(1))
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception:
-            pass
-        return None
+    async def _fetch_listing_page(self, url):
+        """
+        Fetch and parse a listing page, or None if it is missing.
+        Parsed results are stored with the page's validators so an unchanged page
+        (304 Not Modified) is answered from the stored film URL list.
+        """
+        validators = self.validator_store.get_listing(url) if self.validator_store else None
+        result = await self.fetcher.get(url, validators=validators)
+        if result.not_modified:
+            self.validator_store.touch(url)
+            self.not_modified_count += 1
+            film_urls, has_next, last_page = validators[2]
+            return film_urls, has_next, last_page
+        if not result.content or b"Page not found" in result.content:
+            return None
+        
+        parsed = self._parse_films_page(result.content, url)
+        if result.validators and parsed[0] and self.validator_store:
+            self.validator_store.put_listing(url, *result.validators, *parsed)
+        return parsed
 
-    def _extract_runtime_optimized(self, soup):
-        """Optimized runtime extraction."""
+    def _parse_films_page(self, content, url):
+        """Extract film URLs, next-page flag and last page number from a listing page."""
         try:
-            footer = soup.select_one('.text-link.text-footer')
-            if footer:
-                match = re.search(r'(\d+)\s*min', footer.get_text(), re.I)
-                if match:
-                    return int(match.group(1))
-        except Exception:
-            pass
-        return 0
-
-    def _clean_text_fast(self, text):
-        """Ultra-fast text cleaning."""
-        if not text:
-            return ""
-        cleaned = text.strip()
-        if ',' in cleaned:
-            cleaned = cleaned.partition(',')[0]
-        return cleaned
+            return parse_listing_page(content, self.base_url)
+        except Exception as e:
+            logger.error(f"Error parsing page {url}: {e}")
+            return [], False, None
 
-    def _aggregate_film_data(self, film_data):
-        """Aggregate film data into global statistics."""
-        # Aggregate all data types
-        for lang in film_data['languages']:
-            self.stats_aggregator['languages'][lang] += 1
+    async def _produce_film_urls(self, username, first_page, queue, known_urls, pages, resume=None,
+                                 retry_urls=()):
+        """
+        Collect film URLs from the listing pages and push them onto the film queue as soon as
+        each page arrives. Once the page count is known from the pagination block, the
+        remaining pages are fetched in parallel. Incremental runs walk pages sequentially
+        and stop at the first known film. Per-page results are stored in pages[page_num].
+        Films a resumed run already counted are listed but not queued. retry_urls (films an
+        earlier run could not download) are queued first, as page 0.
+        """
+        seen = set()
+        done = resume.done if resume else ()
         
-        for country in film_data['countries']:
-            self.stats_aggregator['countries'][country] += 1
-            
-        for genre in film_data['genres']:
-            self.stats_aggregator['genres'][genre] += 1
-            
-        for director in film_data['directors']:
-            self.stats_aggregator['directors'][director] += 1
-            
-        for actor in film_data['actors']:
-            self.stats_aggregator['actors'][actor] += 1
-            
-        if film_data['decade']:
-            self.stats_aggregator['decades'][film_data['decade']] += 1
-            
-        if film_data['runtime'] > 0:
-            self.stats_aggregator['runtimes'].append(film_data['runtime'])
-
-    async def _get_films_from_page_async(self, url):
-        """Async film URL collection from page."""
-        content = await self._fetch_page(url)
-        if not content:
-            return [], False
+        def enqueue(page_num, film_urls):
+            """Queue unseen films from one page. Returns False once a known film is reached."""
+            new_urls = []
+            for url in film_urls:
+                if url in known_urls:
+                    pages[page_num] = new_urls
+                    return False
+                if url not in seen:
+                    seen.add(url)
+                    new_urls.append(url)
+                    self.total_films += 1
+                    if url in done:
+                        continue
+                    self._queued_at[url] = time.perf_counter()
+                    queue.put_nowait(url)
+            pages[page_num] = new_urls
+            return True
+        
+        if resume and resume.listing_complete:
+            # Interrupted after the listing was collected: no listing page is needed
+            enqueue(1, resume.film_urls)
+            return
+        if retry_urls:
+            enqueue(0, retry_urls)
+        
+        film_urls, has_next, last_page = first_page
+        if not enqueue(1, film_urls) or not has_next or not film_urls:
+            return
+        
+        if known_urls or not last_page:
+            # Sequential walk: needed to stop early, or when the page count is unknown
+            page_num = 2
+            while True:
+                url = f"{self.base_url}/{username}/films/page/{page_num}/"
+                film_urls, has_next, _ = await self._get_films_from_page_async(url)
+                if not enqueue(page_num, film_urls) or not has_next or not film_urls:
+                    break
+                page_num += 1
+                await asyncio.sleep(self.request_delay)  # Rate limiting
+            return
         
+        # Speculatively fetch all remaining listing pages in parallel
+        async def fetch_listing(page_num):
+            url = f"{self.base_url}/{username}/films/page/{page_num}/"
+            film_urls, _, _ = await self._get_films_from_page_async(url)
+            return page_num, film_urls
+        
+        listing_tasks = [asyncio.create_task(fetch_listing(n)) for n in range(2, last_page + 1)]
         try:
-            soup = BeautifulSoup(content, 'lxml')
-            base_url = "https://letterboxd.com"
-            
-            # Extract film URLs efficiently
-            film_urls = []
-            posters = soup.select('div.react-component[data-component-class="LazyPoster"]')
-            
-            for comp in posters[:72]:  # Letterboxd page limit
-                link = comp.get('data-item-link') or ''
-                slug = comp.get('data-item-slug') or ''
-                
-                if link:
-                    film_urls.append(base_url + link)
-                elif slug:
-                    film_urls.append(f"{base_url}/film/{slug}/")
-            
-            # Check for next page
-            next_link = soup.select_one('.paginate-next, .next')
-            has_next = next_link is not None
-            
-            return film_urls, has_next
-            
-        except Exception as e:
-            logger.error(f"Error parsing page {url}: {e}")
-            return [], False
+            for next_done in asyncio.as_completed(listing_tasks):
+                page_num, film_urls = await next_done
+                enqueue(page_num, film_urls)
+        finally:
+            for task in listing_tasks:
+                task.cancel()
+
+    async def _film_worker(self, queue, runtime_list):
+        """Consume film URLs from the queue until a None sentinel is received."""
+        while True:
+            url = await queue.get()
+            if url is None:
+                return
+            self._observe_queue_wait(url)
+            try:
+                runtime = await self._scrape_film_page_async(url, self.total_films)
+                if isinstance(runtime, (int, float)) and runtime > 0:
+                    runtime_list.append(runtime)
+            except Exception as e:
+                logger.error(f"Error scraping {url}: {e}")
+
+    def _observe_queue_wait(self, url):
+        """Record how long a film waited in the queue before a worker took it."""
+        queued_at = self._queued_at.pop(url, None)
+        if queued_at is not None:
+            self.metrics.observe('queue_wait', time.perf_counter() - queued_at)
 
-    async def scrape_user_profile_async(self, username):
-        """Ultra-fast async user profile scraping."""
+    async def scrape_user_profile_async(self, username, incremental=False):
+        """
+        Ultra-fast async user profile scraping.
+        Listing pages and film pages are pipelined: film workers start on each page's films
+        as soon as it is parsed instead of waiting for the whole URL collection.
+        With incremental=True the statistics already held in the app context (e.g. loaded
+        from a saved CSV) are kept, pagination stops at the first already-known film and
+        only the newly added films are scraped and merged into the existing counts.
+        An interrupted scrape of the same user is resumed from its checkpoint instead.
+        """
+        self.checkpoint = Checkpointer.for_user(self.app_context, username, 'async')
         try:
-            await self._create_session()
-            
-            # Verify user exists
-            test_url = f"https://letterboxd.com/{username}/films/"
-            content = await self._fetch_page(test_url)
-            if not content or b"Page not found" in content:
+            await self._start()
+            stats = self.app_context.stats_data
+            
+            resume = load_checkpoint(self.app_context, username, 'async')
+            if resume:
+                incremental = resume.incremental
+            # Incremental runs need the film URL list of the previous result
+            elif incremental and not stats.url_list:
+                logger.warning("No previous film list available, running a full scrape")
+                incremental = False
+            known_urls = set(stats.url_set) if incremental else set()
+            
+            # Verify user exists (the films page doubles as listing page 1)
+            test_url = f"{self.base_url}/{username}/films/"
+            first_page = await self._fetch_listing_page(test_url)
+            if first_page is None:
                 logger.error(f"User '{username}' not found")
                 return
             
-            print(f"Collecting film URLs for user: {username}")
+            # Films earlier runs could not download are scraped again; a resumed run finds
+            # them among the films it had collected
+            retry_urls = []
+            if resume:
+                previous_films = resume.previous_films
+                previous_hours = resume.previous_hours
+                retry_urls = resume.film_urls
+            elif incremental:
+                previous_films = stats.films_count
+                previous_hours = stats.total_hours
+                retry_urls = stats.take_pending_urls()
+            else:
+                previous_films = 0
+                previous_hours = 0.0
+                stats.reset()
+            
+            print(f"Analyzing films for user {username} with async scraper...")
             start_time = time.time()
             
-            # Collect all film URLs with async pagination
-            all_film_urls = []
-            page_num = 1
-            
-            while True:
-                url = f"https://letterboxd.com/{username}/films/page/{page_num}/"
-                film_urls, has_next = await self._get_films_from_page_async(url)
-                
-                all_film_urls.extend(film_urls)
-                
-                if not has_next or not film_urls:
-                    break
-                    
-                page_num += 1
-                await asyncio.sleep(self.request_delay)  # Rate limiting
-            
-            # Store URLs in app context
-            self.app_context.stats_data.reset()
-            for url in all_film_urls:
-                self.app_context.stats_data.add_url(url)
-            
-            # Process all films concurrently with async
-            print(f"Analyzing films with async scraper...")
-            analysis_start = time.time()
-            
-            # Reset progress counter
-            self.processed_count = 0
+            # Reset progress counters; total grows while listing pages arrive
+            self.processed_count = len(resume.done) if resume else 0
+            self.total_films = 0
+            self.progress = ProgressBar()
+            if resume and self.snapshots:
+                self.snapshots.films = previous_films + len(resume.done)
             
-            # Create async tasks for all films with total count and start time for ETA
-            total_films = len(all_film_urls)
-            tasks = [self._scrape_film_page_async(url, total_films, analysis_start) for url in all_film_urls]
-            
-            # Process in aggressive batches for maximum speed
-            batch_size = 100  # Large batches
+            queue = asyncio.Queue()
             runtime_list = []
+            pages = {}
+            if self.checkpoint:
+                self.checkpoint.start(
+                    incremental, previous_films, previous_hours, len(stats.url_list),
+                    lambda: [url for page_num in sorted(pages) for url in pages[page_num]],
+                    lambda: self.fetcher.failed_urls
+                )
+            workers = [
+                asyncio.create_task(self._film_worker(queue, runtime_list))
+                for _ in range(self.max_concurrency_limit)
+            ]
+            
+            try:
+                await self._produce_film_urls(username, first_page, queue, known_urls, pages, resume, retry_urls)
+                if self.checkpoint:
+                    self.checkpoint.listing_complete = True
+                for _ in workers:
+                    queue.put_nowait(None)
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+            
+            self.progress.finish()
+            
+            # Store URLs in app context in listing order
+            all_film_urls = [url for page_num in sorted(pages) for url in pages[page_num]]
+            for url in all_film_urls:
+                stats.add_url(url)
+            if incremental:
+                print(f"Incremental mode: {len(all_film_urls)} new films since last run")
+            
+            # Give films that exhausted their retries one more pass at the adapted concurrency
+            film_url_set = set(all_film_urls)
+            failed_urls = self.fetcher.failed_urls
+            retry_urls = [url for url in failed_urls if url in film_url_set]
+            if retry_urls:
+                failed_urls[:] = [url for url in failed_urls if url not in film_url_set]
+                print(f"Retrying {len(retry_urls)} films that failed to download...")
+                retry_workers = min(len(retry_urls), self.max_concurrency_limit)
+                retry_queue = asyncio.Queue()
+                for url in retry_urls + [None] * retry_workers:
+                    retry_queue.put_nowait(url)
+                await asyncio.gather(*(
+                    self._film_worker(retry_queue, runtime_list) for _ in range(retry_workers)
+                ))
+                self.progress.finish()
+            if failed_urls:
+                logger.warning(f"{len(failed_urls)} pages could not be downloaded and were skipped")
+            # Films without a record are left out of the result and retried by the next incremental run
+            missing_urls = [url for url in all_film_urls if url not in stats.film_table]
+            stats.defer_urls(missing_urls)
+            # The counters were updated per film; the film table holds the authoritative records
+            with self.metrics.time('aggregate'):
+                stats.rebuild_counters()
+            if self.snapshots:
+                self.snapshots.flush()  # Publish the films counted since the last snapshot
             
-            for i in range(0, len(tasks), batch_size):
-                batch = tasks[i:i + batch_size]
-                batch_results = await asyncio.gather(*batch, return_exceptions=True)
-                
-                # Filter out exceptions and collect runtimes
-                for result in batch_results:
-                    if isinstance(result, (int, float)) and result > 0:
-                        runtime_list.append(result)
-                
-                # No delays between batches for maximum speed
-            
-            print()  # New line after progress bar
-            
-            analysis_time = time.time() - analysis_start
             total_time = time.time() - start_time
             
-            # Transfer aggregated data to app context
-            self._transfer_aggregated_data()
-            
             # Calculate final statistics
-            films_num = len(all_film_urls)
-            hrs = sum(runtime_list) / 60
+            total_films = len(all_film_urls) - len(missing_urls)
+            films_num = previous_films + total_films
+            hrs = previous_hours + (sum(runtime_list) + (resume.done_minutes if resume else 0)) / 60
             dys = hrs / 24
             
-            print(f"\nFilms analyzed: {films_num}")
+            print(f"\nFilms analyzed: {total_films}")
             print(f"Total time: {total_time:.1f}s")
-            print(f"Speed: {films_num/total_time:.1f} films/second")
-            print(f"Time per film: {total_time/films_num:.3f}s")
+            if self.not_modified_count:
+                print(f"Pages not modified since last run: {self.not_modified_count}")
+            if total_films:
+                print(f"Speed: {total_films/total_time:.1f} films/second")
+                print(f"Time per film: {total_time/total_films:.3f}s")
+            
+            finish_run(self.metrics, self.app_context.config, username, profile='async', films=total_films)
             
             # Set meta data
             scraped_when = time.strftime("%d/%m/%Y", time.localtime())
-            self.app_context.stats_data.set_meta_data(films_num, hrs, dys, scraped_when)
-            
-        except Exception as e:
-            logger.error(f"Error in async scraping: {e}")
+            stats.set_meta_data(films_num, hrs, dys, scraped_when)
+            index_profile(self.app_context, username, stats)
+            if self.checkpoint:
+                self.checkpoint.discard()
+            
+        except BaseException as e:
+            if isinstance(e, Exception):
+                logger.error(f"Error in async scraping: {e}")
+            # Keep the films counted so far for the next run
+            if self.checkpoint:
+                self.checkpoint.save()
             raise
         finally:
-            if self.session:
-                await self.session.close()
+            await self._close()
 
-    def _transfer_aggregated_data(self):
-        """Transfer aggregated data to app context statistics."""
-        stats = self.app_context.stats_data
+    async def _start(self):
+        """Open the fetcher, caches and parser pool shared by all requests of a run."""
+        self.metrics = Metrics()
+        self._queued_at.clear()
+        self.app_context.track_metrics(self.metrics)
+        self.fetcher = self._create_fetcher()
+        await self.fetcher.open()
+        self.film_cache = self.app_context.film_cache
+        self.validator_store = self.app_context.validator_store
+        self.parser_backend = resolve_backend(self.app_context.config.parser_backend)
         
-        # Transfer dictionaries
-        stats.lang_dict.update(self.stats_aggregator['languages'])
-        stats.country_dict.update(self.stats_aggregator['countries'])
-        stats.genre_dict.update(self.stats_aggregator['genres'])
-        stats.director_dict.update(self.stats_aggregator['directors'])
-        stats.actor_dict.update(self.stats_aggregator['actors'])
-        stats.decade_dict.update(self.stats_aggregator['decades'])
+        # Film page parsing is offloaded to worker processes when configured
+        if self.app_context.config.parser_processes > 0:
+            self.parse_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.app_context.config.parser_processes
+            )
+
+    async def _close(self):
+        """Release the fetcher session and parser pool opened by _start."""
+        if self.fetcher:
+            await self.fetcher.close()
+        if self.film_cache:
+            self.film_cache.flush()
+        if self.parse_executor:
+            self.parse_executor.shutdown(wait=False, cancel_futures=True)
+            self.parse_executor = None
 
-    def scrape_user_profile(self, username):
+    def scrape_user_profile(self, username, incremental=False):
         """Synchronous wrapper for async scraping."""
-        return asyncio.run(self.scrape_user_profile_async(username))
\ No newline at end of file
+        return asyncio.run(self.scrape_user_profile_async(username, incremental))
\ No newline at end of file
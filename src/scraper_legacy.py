@@ -2,14 +2,16 @@
 Legacy web scraping functionality.
 Handles scraping Letterboxd profiles and extracting film data.
 """
-import requests
 import re
 import time
 import json
 import concurrent.futures
 import logging
-import sys
 from bs4 import BeautifulSoup
+from .fetch import SyncFetcher
+from .film_index import index_profile
+from .metrics import Metrics, finish_run
+from .progress import ProgressBar
 
 
 # Configure logging
@@ -21,68 +23,58 @@ class LegacyLetterboxdScraper:
     
     def __init__(self, app_context):
         self.app_context = app_context
-        self.session = None
-        self.debug_times = {
-            'time_1': -1,
-            'tot_time_1': 0,
-            'time_2': -1,
-            'tot_time_2': 0,
-            'time_3': -1,
-            'tot_time_3': 0
-        }
+        self.base_url = app_context.config.base_url.rstrip('/')
+        self.fetcher = None
+        self.snapshots = None  # Optional SnapshotPublisher for live results
+        self.metrics = None
     
-    def _create_session(self):
-        """Create a requests session with proper headers."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+    def _create_fetcher(self):
+        """Create the fetcher shared by the worker threads (no streaming: pages are parsed whole)."""
+        return SyncFetcher(pool_size=self.app_context.config.max_threads, metrics=self.metrics)
     
-    def _scrape_film_page(self, url_film_page):
-        """Scrape data from a single film page."""
-        debug_start = time.time()
-        source = self.session.get(url_film_page)
-        end_time = time.time() - debug_start
-        
-        with self.app_context.stats_data.lock:
-            self.debug_times['tot_time_1'] += end_time
-            if end_time >= self.debug_times['time_1']:
-                self.debug_times['time_1'] = end_time
-        
-        soup = BeautifulSoup(source.content, 'lxml')
-        
-        # Per-film unique buckets to avoid double counting
-        film_languages = set()
-        film_countries = set()
-        film_genres = set()
-        film_directors = set()
-        film_actors = set()
-        
-        # Find release year
-        year_found = self._extract_year(soup)
-        decade = None
-        if year_found is not None:
-            decade = f"{year_found // 10 * 10}s"
+    def _scrape_film_page(self, url_film_page, queued_at=None):
+        """Scrape data from a single film page. Returns its runtime, or None if it could not be downloaded."""
+        if queued_at is not None:
+            self.metrics.observe('queue_wait', time.perf_counter() - queued_at)
+        result = self.fetcher.get(url_film_page)
+        if not result.ok:
+            logger.warning(f"Request failed for {url_film_page}: HTTP {result.status or 'error'}")
+            return None
+        with self.metrics.time('parse'):
+            soup = BeautifulSoup(result.content, 'lxml')
         
-        # Find runtime
-        runtime = self._extract_runtime(soup)
-        
-        # Extract film data
-        self._extract_languages(soup, film_languages)
-        self._extract_countries(soup, film_countries)
-        self._extract_genres(soup, film_genres)
-        self._extract_directors(soup, film_directors)
-        self._extract_actors(soup, film_actors)
+        with self.metrics.time('extract'):
+            # Per-film unique buckets to avoid double counting
+            film_languages = set()
+            film_countries = set()
+            film_genres = set()
+            film_directors = set()
+            film_actors = set()
+            
+            # Find release year
+            year_found = self._extract_year(soup)
+            decade = None
+            if year_found is not None:
+                decade = f"{year_found // 10 * 10}s"
+            
+            # Find runtime
+            runtime = self._extract_runtime(soup)
+            
+            # Extract film data
+            self._extract_languages(soup, film_languages)
+            self._extract_countries(soup, film_countries)
+            self._extract_genres(soup, film_genres)
+            self._extract_directors(soup, film_directors)
+            self._extract_actors(soup, film_actors)
         
         # Add to global statistics
-        self.app_context.stats_data.add_film_data(
-            film_languages, film_countries, film_genres,
-            film_directors, film_actors, decade
-        )
+        with self.metrics.time('aggregate'):
+            self.app_context.stats_data.add_film_data(
+                film_languages, film_countries, film_genres,
+                film_directors, film_actors, decade
+            )
+        if self.snapshots:
+            self.snapshots.films_added()
         
         return runtime
     
@@ -215,10 +207,13 @@ class LegacyLetterboxdScraper:
         except Exception:
             pass
     
-    def _get_films_from_page(self, url_table_page):
-        """Get film URLs from a user's films page."""
-        url_ltbxd = "https://letterboxd.com"
-        source = self.session.get(url_table_page).text
+    def _get_films_from_page(self, url_table_page, known_urls=None):
+        """
+        Get film URLs from a user's films page.
+        Returns True if a URL from known_urls was reached (collection stops there).
+        """
+        url_ltbxd = self.base_url
+        source = self.fetcher.get(url_table_page).content or b''
         soup = BeautifulSoup(source, 'lxml')
         
         # Posters rendered as LazyPoster react components
@@ -233,43 +228,67 @@ class LegacyLetterboxdScraper:
             elif slug:
                 film_url = f"{url_ltbxd}/film/{slug}/"
             if film_url:
+                if known_urls and film_url in known_urls:
+                    return True
                 self.app_context.stats_data.add_url(film_url)
                 count += 1
                 if count >= 72:
                     break
+        return False
     
-    def scrape_user_profile(self, username):
-        """Scrape a complete user profile and return statistics."""
-        self.app_context.stats_data.reset()
-        self._create_session()
+    def scrape_user_profile(self, username, incremental=False):
+        """
+        Scrape a complete user profile and return statistics.
+        With incremental=True only films added since the loaded result are scraped.
+        """
+        stats = self.app_context.stats_data
+        if incremental and not stats.url_list:
+            logger.warning("No previous film list available, running a full scrape")
+            incremental = False
         
-        logger.debug(f"Session: {self.session}")
+        if incremental:
+            known_urls = set(stats.url_set)
+            previous_films = stats.films_count
+            previous_hours = stats.total_hours
+        else:
+            known_urls = None
+            previous_films = 0
+            previous_hours = 0.0
+            stats.reset()
+        self.metrics = Metrics()
+        self.app_context.track_metrics(self.metrics)
+        self.fetcher = self._create_fetcher().open()
+        try:
+            return self._scrape(username, stats, incremental, known_urls, previous_films, previous_hours)
+        finally:
+            self.fetcher.close()
+    
+    def _scrape(self, username, stats, incremental, known_urls, previous_films, previous_hours):
+        """Collect the film URLs of a profile and scrape them on a thread pool."""
         logger.info(f"Analyzing user: {username}")
         
         # Verify that the user exists
-        cnt = 1
-        r = requests.get("https://letterboxd.com/" + username + "/films/page/" + str(cnt) + "/")
-        soup = BeautifulSoup(r.text, 'lxml')
-        str_match = str(soup)
-        
-        while "Sorry, we can't find the page" in str_match:
+        r = self.fetcher.get(self.base_url + "/" + username + "/films/page/1/")
+        if r.status == 404 or b"Sorry, we can't find the page" in (r.content or b''):
             logger.error(f"User '{username}' not found")
-            username = input('Insert your Letterboxd username: ')
-            cnt = 1
-            r = requests.get("https://letterboxd.com/" + username + "/films/page/" + str(cnt) + "/")
-            soup = BeautifulSoup(r.text, 'lxml')
-            str_match = str(soup)
+            return None
+        if not r.ok:
+            logger.error(f"Error verifying user: HTTP {r.status or 'error'}")
+            return None
         
         logger.info("Collecting film URLs...")
         print("Analyzing films with legacy scraper...")
         start_time = time.time()
         # Traverse pages by following pagination
         cnt = 1
+        first_new_index = len(stats.url_list)
         while True:
-            st = "https://letterboxd.com/" + username + "/films/page/" + str(cnt) + "/"
-            self._get_films_from_page(st)
-            r = self.session.get(st)
-            soup = BeautifulSoup(r.text, 'lxml')
+            st = self.base_url + "/" + username + "/films/page/" + str(cnt) + "/"
+            # Pages are ordered newest first, so a known film means the rest is already analyzed
+            if self._get_films_from_page(st, known_urls):
+                break
+            r = self.fetcher.get(st)
+            soup = BeautifulSoup(r.content or b'', 'lxml')
             # Look for next page link
             next_link = (
                 soup.select_one('div.pagination a.next') or
@@ -279,57 +298,46 @@ class LegacyLetterboxdScraper:
             if next_link is None:
                 break
             cnt += 1
+        # Films earlier runs could not download are scraped again
+        if incremental:
+            for url in stats.take_pending_urls():
+                stats.add_url(url)
+        film_urls = stats.url_list[first_new_index:]
+        if incremental:
+            logger.info(f"Incremental mode: {len(film_urls)} new films since last run")
         # Scrape all film pages with progress tracking
-        analysis_start = time.time()
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.app_context.config.max_threads) as executor:
-            futures = [executor.submit(self._scrape_film_page, url) 
-                      for url in self.app_context.stats_data.url_list]
+            futures = {executor.submit(self._scrape_film_page, url, time.perf_counter()): url
+                       for url in film_urls}
             runtime_list = []
-            completed = 0
-            total = len(self.app_context.stats_data.url_list)
-            last_progress_update = 0
-            for future in concurrent.futures.as_completed(futures):
+            failed_urls = []
+            progress = ProgressBar(len(film_urls))
+            for completed, future in enumerate(concurrent.futures.as_completed(futures), 1):
                 try:
                     runtime = future.result()
-                    runtime_list.append(runtime)
-                    completed += 1
-                    current_time = time.time()
-                    # Only update progress bar every 0.1s or on completion
-                    if current_time - last_progress_update >= 0.1 or completed == total:
-                        last_progress_update = current_time
-                        elapsed_time = current_time - analysis_start
-                        progress = (completed / total) * 100
-                        bar_length = 40
-                        filled = int(bar_length * completed / total)
-                        bar = '█' * filled + '░' * (bar_length - filled)
-                        remaining = total - completed
-                        if completed > 0 and elapsed_time > 0:
-                            speed = completed / elapsed_time
-                            eta_seconds = remaining / speed if speed > 0 else 0
-                            if eta_seconds < 60:
-                                eta_str = f"{int(eta_seconds)}s"
-                            else:
-                                minutes = int(eta_seconds // 60)
-                                seconds = int(eta_seconds % 60)
-                                eta_str = f"{minutes}m{seconds}s"
-                            sys.stdout.write(f"\r{' ' * 120}\r[{bar}] {progress:.1f}% | {completed}/{total} films | {remaining} remaining | ETA: {eta_str}")
-                            sys.stdout.flush()
-                        else:
-                            sys.stdout.write(f"\r{' ' * 120}\r[{bar}] {progress:.1f}% | {completed}/{total} films | {remaining} remaining")
-                            sys.stdout.flush()
                 except Exception as e:
                     logger.warning(f"Failed to process film: {e}")
-                    runtime_list.append(0)
+                    runtime = None
+                if runtime is None:
+                    failed_urls.append(futures[future])
+                else:
+                    runtime_list.append(runtime)
+                progress.update(completed)
         
-        print()  # New line after progress bar
+        progress.finish()
+        if self.snapshots:
+            self.snapshots.flush()  # Publish the films counted since the last snapshot
+        # Films that were not counted are left out of the result and retried by the next incremental run
+        stats.defer_urls(failed_urls)
+        total = len(film_urls) - len(failed_urls)
         
-        films_num = len(self.app_context.stats_data.url_list)
+        films_num = previous_films + total
         total_time = time.time() - start_time
         
-        print(f"\nFilms analyzed: {films_num}")
-        logger.info(f"Analysis complete - {films_num} films processed")
+        print(f"\nFilms analyzed: {total}")
+        logger.info(f"Analysis complete - {total} films processed")
         
-        hrs = sum(runtime_list) / 60
+        hrs = previous_hours + sum(runtime_list) / 60
         dys = hrs / 24
         
         print("Note: one film can have multiple languages and/or countries, so the sum of all percentages may be more than 100%.\n")
@@ -341,10 +349,14 @@ class LegacyLetterboxdScraper:
             scraped_when = ""
         
         self.app_context.stats_data.set_meta_data(films_num, hrs, dys, scraped_when)
+        # No film table here, so only the watch list is indexed
+        index_profile(self.app_context, username)
         
         print(f"\nScraping time: {total_time:.2f} seconds.")
-        print(f"Speed: {films_num/total_time:.1f} films/second")
-        print(f"Time per film: {total_time/films_num:.3f}s")
+        if total:
+            print(f"Speed: {total/total_time:.1f} films/second")
+            print(f"Time per film: {total_time/total:.3f}s")
+        finish_run(self.metrics, self.app_context.config, username, profile='legacy', films=total)
         
         return {
             'films_num': films_num,
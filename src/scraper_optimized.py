@@ -1,16 +1,17 @@
 """
 Enhanced scraper with performance improvements for faster analysis.
 """
-import json
-import re
 import time
-import requests
+import itertools
 import concurrent.futures
 import logging
-import sys
-from bs4 import BeautifulSoup
-from collections import defaultdict
 import threading
+from .film_parser import OPTIMIZED_RULES, parse_film_page_timed, parse_listing_page, resolve_backend
+from .fetch import SyncFetcher
+from .checkpoint import Checkpointer, load_checkpoint
+from .film_index import index_profile
+from .metrics import Metrics, finish_run
+from .progress import ProgressBar
 
 
 # Configure logging
@@ -27,288 +28,188 @@ class LetterboxdScraper:
     
     def __init__(self, app_context):
         self.app_context = app_context
-        self.session = None
+        self.base_url = app_context.config.base_url.rstrip('/')
+        self.fetcher = None
+        self.metrics = None
+        self.film_cache = None
+        self.validator_store = None
+        self.not_modified_count = 0
+        self.snapshots = None  # Optional SnapshotPublisher for live results
+        self.checkpoint = None
+        self.parser_backend = 'bs4'
+        self.extraction_rules = OPTIMIZED_RULES  # Every parser backend applies these rules
         # Batch processing for reduced lock contention
         self.batch_data = []
         self.batch_lock = threading.Lock()
         self.batch_size = 50
     
-    def _create_session(self):
-        """Create an optimized requests session with connection pooling."""
-        self.session = requests.Session()
-        
-        # Optimize session for performance
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,  # Connection pool size
-            pool_maxsize=50,      # Max connections in pool
-            max_retries=3,        # Retry failed requests
-            pool_block=False      # Don't block on pool exhaustion
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
-        
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            # Keep connections alive
-            'Keep-Alive': 'timeout=30, max=100'
-        })
+    def _create_fetcher(self):
+        """Create the pooled fetcher shared by all worker threads."""
+        return SyncFetcher.from_config(self.app_context.config, pool_size=50, max_retries=3,
+                                       metrics=self.metrics)
     
-    def _scrape_film_page_optimized(self, url_film_page):
+    def _scrape_film_page_optimized(self, url_film_page, queued_at=None):
         """Optimized film page scraping with reduced parsing overhead."""
-        try:
-            # Use shorter timeout for faster failure detection
-            response = self.session.get(url_film_page, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            logger.warning(f"Request failed for {url_film_page}: {e}")
+        if queued_at is not None:
+            self.metrics.observe('queue_wait', time.perf_counter() - queued_at)
+        
+        # Serve previously extracted records from the on-disk cache without any request
+        film_data = self.film_cache.get(url_film_page, self.extraction_rules.name) if self.film_cache else None
+        if film_data is not None:
+            self.metrics.inc('cache_hits')
+            self._add_to_batch(url_film_page, film_data)
+            return film_data['runtime']
+        
+        # An expired record can still be revalidated with a conditional request
+        validators = self.validator_store.get(url_film_page) if self.film_cache and self.validator_store else None
+        result = self.fetcher.get(url_film_page, validators=validators, film_page=True)
+        if result.not_modified:
+            # The expired record is still current
+            film_data = self.film_cache.get(url_film_page, self.extraction_rules.name, allow_stale=True)
+            if film_data is not None:
+                self.film_cache.put(url_film_page, self.extraction_rules.name, film_data)  # Restart the TTL
+                self.validator_store.touch(url_film_page)
+                with self.batch_lock:
+                    self.not_modified_count += 1
+                self._add_to_batch(url_film_page, film_data)
+                return film_data['runtime']
+            # Record evicted since the validators were stored
+            result = self.fetcher.get(url_film_page, film_page=True)
+        if not result.ok:
+            logger.warning(f"Request failed for {url_film_page}: HTTP {result.status or 'error'}")
             return 0
+        content = result.content
         
-        # Use faster parser when possible
-        soup = BeautifulSoup(response.content, 'lxml')
+        film_data, parse_time, extract_time = parse_film_page_timed(content, self.parser_backend, self.extraction_rules)
+        self.metrics.observe('parse', parse_time)
+        self.metrics.observe('extract', extract_time)
         
-        # Batch data collection to reduce lock contention
-        film_data = {
-            'languages': set(),
-            'countries': set(),
-            'genres': set(),
-            'directors': set(),
-            'actors': set(),
-            'decade': None,
-            'runtime': 0
-        }
+        if self.film_cache:
+            self.film_cache.put(url_film_page, self.extraction_rules.name, film_data)
+            if result.validators and self.validator_store:
+                self.validator_store.put(url_film_page, *result.validators)
         
-        # Extract all data at once to minimize DOM traversals
-        self._extract_all_film_data(soup, film_data)
+        self._add_to_batch(url_film_page, film_data)
         
-        # Add to batch for bulk processing
+        return film_data['runtime']
+    
+    def _add_to_batch(self, url_film_page, film_data):
+        """Add a film record to the batch, flushing it into the statistics when full."""
         with self.batch_lock:
-            self.batch_data.append(film_data)
+            self.batch_data.append((url_film_page, film_data))
             if len(self.batch_data) >= self.batch_size:
                 self._process_batch()
-        
-        return film_data['runtime']
-    
-    def _extract_all_film_data(self, soup, film_data):
-        """Extract all film data in a single DOM traversal for efficiency."""
-        # Get year/decade first
-        year_found = self._extract_year_fast(soup)
-        if year_found:
-            film_data['decade'] = f"{year_found // 10 * 10}s"
-        
-        # Get runtime
-        film_data['runtime'] = self._extract_runtime_fast(soup)
-        
-        # Extract all text data in one pass to minimize DOM queries
-        try:
-            # Details section (languages, countries)
-            details_section = soup.select_one('#tab-details')
-            if details_section:
-                # Languages
-                for a_tag in details_section.select('.text-sluglist a[href^="/films/language/"]'):
-                    lang = self._clean_text(a_tag.text)
-                    if lang and lang != "No spoken language":
-                        film_data['languages'].add("None" if lang == "No spoken language" else lang)
-                
-                # Countries
-                for a_tag in details_section.select('a[href^="/films/country/"]'):
-                    country = self._clean_text(a_tag.text)
-                    if country:
-                        film_data['countries'].add(country)
-            
-            # Genres
-            genres_section = soup.select_one('#tab-genres')
-            if genres_section:
-                for a_tag in genres_section.select('a[href^="/films/genre/"]'):
-                    genre = self._clean_text(a_tag.text)
-                    if genre:
-                        film_data['genres'].add(genre.capitalize())
-            
-            # Directors
-            credits = soup.select_one('section.production-masthead .details .credits')
-            if credits:
-                for a_tag in credits.select('a[href^="/director/"]'):
-                    director = self._clean_text(a_tag.text)
-                    if director:
-                        film_data['directors'].add(director)
-            
-            # Actors
-            cast_items = soup.select('#tab-cast .cast-list a.text-slug, .cast-list.text-sluglist a.text-slug')
-            for a_tag in cast_items:
-                actor = self._clean_text(a_tag.text)
-                if actor and not any(x in actor.lower() for x in ['show all', 'show ']):
-                    film_data['actors'].add(actor)
-        
-        except Exception as e:
-            logger.error(f"Error extracting film data: {e}")
-            # Continue processing even if this film fails
-    
-    def _clean_text(self, text):
-        """Clean and process text."""
-        if not text:
-            return None
-        cleaned = text.strip()
-        if ',' in cleaned:
-            cleaned = cleaned.partition(',')[0]
-        return cleaned if cleaned else None
-    
-    def _extract_year_fast(self, soup):
-        """Optimized year extraction with early termination."""
-        try:
-            # Try visible date first (fastest)
-            releasedate_link = soup.select_one('span.releasedate a')
-            if releasedate_link and releasedate_link.text:
-                match = re.search(r'(\d{4})', releasedate_link.text)
-                if match:
-                    return int(match.group(1))
-            
-            # Fall back to JSON-LD if needed
-            script_tags = soup.select('script[type="application/ld+json"]')
-            for tag in script_tags[:2]:  # Limit search to first 2 scripts
-                try:
-                    data = json.loads(tag.string or '{}')
-                    if isinstance(data, dict) and data.get('@type') in ('Movie', 'VideoObject'):
-                        # Check release events
-                        if isinstance(data.get('releasedEvent'), list) and data['releasedEvent']:
-                            dt = data['releasedEvent'][0].get('startDate')
-                            if dt:
-                                match = re.search(r'(\d{4})', str(dt))
-                                if match:
-                                    return int(match.group(1))
-                        
-                        # Check date fields
-                        for field in ['dateCreated', 'datePublished']:
-                            dt = data.get(field)
-                            if dt:
-                                match = re.search(r'(\d{4})', str(dt))
-                                if match:
-                                    return int(match.group(1))
-                except json.JSONDecodeError:
-                    continue
-        except Exception:
-            pass
-        return None
-    
-    def _extract_runtime_fast(self, soup):
-        """Optimized runtime extraction."""
-        try:
-            # Try footer first
-            footer = soup.select_one('.text-link.text-footer')
-            if footer:
-                match = re.search(r'(\d+)\s*min', footer.get_text(' '), re.I)
-                if match:
-                    return int(match.group(1))
-        except Exception:
-            pass
-        return 0
     
     def _process_batch(self):
         """Process accumulated batch data to reduce lock contention."""
         if not self.batch_data:
             return
         
-        # Aggregate all batch data
-        aggregated = {
-            'languages': defaultdict(int),
-            'countries': defaultdict(int),
-            'genres': defaultdict(int),
-            'directors': defaultdict(int),
-            'actors': defaultdict(int),
-            'decades': defaultdict(int)
-        }
-        
-        for film_data in self.batch_data:
-            for lang in film_data['languages']:
-                aggregated['languages'][lang] += 1
-            for country in film_data['countries']:
-                aggregated['countries'][country] += 1
-            for genre in film_data['genres']:
-                aggregated['genres'][genre] += 1
-            for director in film_data['directors']:
-                aggregated['directors'][director] += 1
-            for actor in film_data['actors']:
-                aggregated['actors'][actor] += 1
-            if film_data['decade']:
-                aggregated['decades'][film_data['decade']] += 1
-        
-        # Single lock acquisition for all updates
-        with self.app_context.stats_data.lock:
-            for lang, count in aggregated['languages'].items():
-                self.app_context.stats_data.lang_dict[lang] = self.app_context.stats_data.lang_dict.get(lang, 0) + count
-            for country, count in aggregated['countries'].items():
-                self.app_context.stats_data.country_dict[country] = self.app_context.stats_data.country_dict.get(country, 0) + count
-            for genre, count in aggregated['genres'].items():
-                self.app_context.stats_data.genre_dict[genre] = self.app_context.stats_data.genre_dict.get(genre, 0) + count
-            for director, count in aggregated['directors'].items():
-                self.app_context.stats_data.director_dict[director] = self.app_context.stats_data.director_dict.get(director, 0) + count
-            for actor, count in aggregated['actors'].items():
-                self.app_context.stats_data.actor_dict[actor] = self.app_context.stats_data.actor_dict.get(actor, 0) + count
-            for decade, count in aggregated['decades'].items():
-                self.app_context.stats_data.decade_dict[decade] += count
+        # Single lock acquisition for the whole batch
+        with self.metrics.time('aggregate'):
+            self.app_context.stats_data.add_film_records(self.batch_data)
+        if self.snapshots:
+            self.snapshots.films_added(len(self.batch_data))
+        if self.checkpoint:
+            self.checkpoint.films_added(len(self.batch_data))
         
         self.batch_data.clear()
     
-    def _get_films_from_page_optimized(self, url_table_page):
-        """Optimized film URL extraction with pagination detection."""
-        try:
-            response = self.session.get(url_table_page, timeout=15)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            logger.error(f"Failed to get films page {url_table_page}: {e}")
+    def _get_films_from_page_optimized(self, url_table_page, known_urls=None):
+        """
+        Optimized film URL extraction with pagination detection.
+        When a URL from known_urls is found, collection stops and no next page is reported.
+        """
+        # Unchanged listing pages are answered from the film URLs stored with their validators
+        validators = self.validator_store.get_listing(url_table_page) if self.validator_store else None
+        result = self.fetcher.get(url_table_page, validators=validators, timeout=15)
+        if result.not_modified:
+            self.validator_store.touch(url_table_page)
+            self.not_modified_count += 1
+            film_urls, has_next_page = validators[2][0], validators[2][1]
+        elif result.ok:
+            film_urls, has_next_page, last_page = parse_listing_page(result.content, self.base_url)
+            if result.validators and film_urls and self.validator_store:
+                self.validator_store.put_listing(url_table_page, *result.validators,
+                                                 film_urls, has_next_page, last_page)
+        else:
+            logger.error(f"Failed to get films page {url_table_page}: HTTP {result.status or 'error'}")
             return 0, False
         
-        soup = BeautifulSoup(response.text, 'lxml')
-        url_ltbxd = "https://letterboxd.com"
-        
-        # Get posters
-        posters = soup.select('div.react-component[data-component-class="LazyPoster"]')
         count = 0
-        
-        for comp in posters:
-            link = comp.get('data-item-link') or ''
-            slug = comp.get('data-item-slug') or ''
-            film_url = None
-            
-            if link:
-                film_url = url_ltbxd + link
-            elif slug:
-                film_url = f"{url_ltbxd}/film/{slug}/"
-            
-            if film_url:
-                self.app_context.stats_data.add_url(film_url)
-                count += 1
-                if count >= 72:  # Letterboxd's page limit
-                    break
-        
-        # Check if there's a next page link
-        next_link = (
-            soup.select_one('div.pagination a.next') or
-            soup.select_one('a.next[rel="next"]') or
-            soup.select_one('div.paginate-nextprev a.next')
-        )
-        has_next_page = next_link is not None
+        for film_url in film_urls:
+            # Pages are ordered newest first, so a known film means the rest is already analyzed
+            if known_urls and film_url in known_urls:
+                return count, False
+            self.app_context.stats_data.add_url(film_url)
+            count += 1
         
         return count, has_next_page
     
-    def scrape_user_profile(self, username):
-        """Optimized profile scraping with performance improvements."""
-        self.app_context.stats_data.reset()
-        self._create_session()
+    def scrape_user_profile(self, username, incremental=False):
+        """
+        Optimized profile scraping with performance improvements.
+        With incremental=True the statistics already held in the app context are kept and
+        only films added since that result are scraped and merged into the existing counts.
+        An interrupted scrape of the same user is resumed from its checkpoint instead.
+        """
+        stats = self.app_context.stats_data
+        resume = load_checkpoint(self.app_context, username, 'optimized')
+        if resume:
+            incremental = resume.incremental
+        elif incremental and not stats.url_list:
+            logger.warning("No previous film list available, running a full scrape")
+            incremental = False
+        
+        if resume:
+            known_urls = set(resume.known_urls) if incremental else None
+            previous_films = resume.previous_films
+            previous_hours = resume.previous_hours
+            if self.snapshots:
+                self.snapshots.films = previous_films + len(resume.done)
+        elif incremental:
+            known_urls = set(stats.url_set)
+            previous_films = stats.films_count
+            previous_hours = stats.total_hours
+        else:
+            known_urls = None
+            previous_films = 0
+            previous_hours = 0.0
+            stats.reset()
+        self.metrics = Metrics()
+        self.app_context.track_metrics(self.metrics)
+        self.checkpoint = Checkpointer.for_user(self.app_context, username, 'optimized')
+        self.fetcher = self._create_fetcher().open()
+        try:
+            return self._scrape(username, stats, incremental, known_urls, previous_films, previous_hours, resume)
+        except BaseException:
+            # Keep the films counted so far for the next run
+            if self.checkpoint:
+                with self.batch_lock:
+                    self._process_batch()
+                self.checkpoint.save()
+            raise
+        finally:
+            self.fetcher.close()
+            if self.film_cache:
+                self.film_cache.flush()
+    
+    def _scrape(self, username, stats, incremental, known_urls, previous_films, previous_hours, resume=None):
+        """Collect the film URLs of a profile and analyze them on the worker pool."""
+        self.film_cache = self.app_context.film_cache
+        self.validator_store = self.app_context.validator_store
+        self.parser_backend = resolve_backend(self.app_context.config.parser_backend)
         
         print("Analyzing user:", username)
         
         # Verify user exists
-        test_url = f"https://letterboxd.com/{username}/films/"
-        try:
-            r = self.session.get(test_url, timeout=10)
-            if "Sorry, we can't find the page" in r.text:
-                logger.error(f"User '{username}' not found")
-                return None
-        except requests.RequestException as e:
-            logger.error(f"Error verifying user: {e}")
+        test_url = f"{self.base_url}/{username}/films/"
+        result = self.fetcher.get(test_url)
+        if result.status == 404 or (result.ok and b"Sorry, we can't find the page" in result.content):
+            logger.error(f"User '{username}' not found")
+            return None
+        if not result.ok:
+            logger.error(f"Error verifying user: HTTP {result.status or 'error'}")
             return None
         
         print("Collecting film URLs...")
@@ -316,10 +217,14 @@ class LetterboxdScraper:
         
         # Collect all film URLs first
         page_num = 1
-        
-        while True:
-            url = f"https://letterboxd.com/{username}/films/page/{page_num}/"
-            films_found, has_next_page = self._get_films_from_page_optimized(url)
+        first_new_index = len(stats.url_list)
+        if resume:
+            for url in resume.film_urls:
+                stats.add_url(url)
+        
+        while not (resume and resume.listing_complete):
+            url = f"{self.base_url}/{username}/films/page/{page_num}/"
+            films_found, has_next_page = self._get_films_from_page_optimized(url, known_urls)
             
             # Use the same pagination logic as original scraper
             if not has_next_page:
@@ -332,78 +237,91 @@ class LetterboxdScraper:
                 print("Reached maximum page limit (1000)")
                 break
         
-        if not self.app_context.stats_data.url_list:
-            logger.warning("No films found for user")
+        # Films earlier runs could not download are scraped again (a resumed run already listed them)
+        if incremental and not resume:
+            for url in stats.take_pending_urls():
+                stats.add_url(url)
+        film_urls = stats.url_list[first_new_index:]
+        if incremental:
+            print(f"Incremental mode: {len(film_urls)} new films since last run")
+        
+        if not film_urls:
+            if incremental:
+                scraped_when = time.strftime("%d/%m/%Y", time.localtime())
+                stats.set_meta_data(previous_films, previous_hours, previous_hours / 24, scraped_when)
+            else:
+                logger.warning("No films found for user")
             return None
         
+        # The collected URL list is checkpointed before any film is analyzed
+        if self.checkpoint:
+            self.checkpoint.start(incremental, previous_films, previous_hours, first_new_index,
+                                  lambda: stats.url_list[first_new_index:], lambda: self.fetcher.failed_urls)
+            self.checkpoint.listing_complete = True
+            self.checkpoint.save()
+        # Films counted before an interruption are not scraped again
+        pending_urls = [url for url in film_urls if url not in resume.done] if resume else film_urls
+        
         # Process films with optimized threading
         print("Analyzing films with optimized scraper...")
-        analysis_start = time.time()
         
         # Use adaptive thread count based on number of films
-        max_workers = min(self.app_context.config.max_threads, len(self.app_context.stats_data.url_list))
+        max_workers = min(self.app_context.config.max_threads, max(len(pending_urls), 1))
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Add progress tracking
-            futures = [executor.submit(self._scrape_film_page_optimized, url) 
-                      for url in self.app_context.stats_data.url_list]
-            
-            runtime_list = []
+            # Sliding window: a short backlog keeps every worker busy without creating a
+            # future per film up front, so memory stays flat however large the profile is
+            window = max_workers * 2
+            url_iter = iter(pending_urls)
+            in_flight = set()
+            runtime_total = 0
             completed = 0
-            
-            last_progress_update = 0
-            total = len(self.app_context.stats_data.url_list)
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    runtime = future.result()
-                    runtime_list.append(runtime)
+            progress = ProgressBar(len(pending_urls))
+            while True:
+                for url in itertools.islice(url_iter, window - len(in_flight)):
+                    in_flight.add(executor.submit(self._scrape_film_page_optimized, url, time.perf_counter()))
+                if not in_flight:
+                    break
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        runtime_total += future.result()
+                    except Exception as e:
+                        logger.warning(f"Failed to process film: {e}")
                     completed += 1
-                    current_time = time.time()
-                    # Only update progress bar every 0.1s or on completion
-                    if current_time - last_progress_update >= 0.1 or completed == total:
-                        last_progress_update = current_time
-                        elapsed_time = current_time - analysis_start
-                        progress = (completed / total) * 100
-                        bar_length = 40
-                        filled = int(bar_length * completed / total)
-                        bar = '█' * filled + '░' * (bar_length - filled)
-                        remaining = total - completed
-                        if completed > 0 and elapsed_time > 0:
-                            speed = completed / elapsed_time
-                            eta_seconds = remaining / speed if speed > 0 else 0
-                            if eta_seconds < 60:
-                                eta_str = f"{int(eta_seconds)}s"
-                            else:
-                                minutes = int(eta_seconds // 60)
-                                seconds = int(eta_seconds % 60)
-                                eta_str = f"{minutes}m{seconds}s"
-                            sys.stdout.write(f"\r{' ' * 120}\r[{bar}] {progress:.1f}% | {completed}/{total} films | {remaining} remaining | ETA: {eta_str}")
-                            sys.stdout.flush()
-                        else:
-                            sys.stdout.write(f"\r{' ' * 120}\r[{bar}] {progress:.1f}% | {completed}/{total} films | {remaining} remaining")
-                            sys.stdout.flush()
-                except Exception as e:
-                    logger.warning(f"Failed to process film: {e}")
-                    runtime_list.append(0)
+                progress.update(completed)
         
         # Process any remaining batch data
         with self.batch_lock:
             if self.batch_data:
                 self._process_batch()
+        # The counters were updated per batch; the film table holds the authoritative records
+        with self.metrics.time('aggregate'):
+            stats.rebuild_counters()
+        if self.snapshots:
+            self.snapshots.flush()  # Publish the films counted since the last snapshot
+        # Films without a record are left out of the result and retried by the next incremental run
+        missing_urls = [url for url in film_urls if url not in stats.film_table]
+        stats.defer_urls(missing_urls)
+        film_urls = [url for url in film_urls if url in stats.film_table]
         
         total_time = time.time() - start_time
         
         # Calculate statistics
-        films_num = len(self.app_context.stats_data.url_list)
-        hrs = sum(runtime_list) / 60
+        films_num = previous_films + len(film_urls)
+        hrs = previous_hours + (runtime_total + (resume.done_minutes if resume else 0)) / 60
         dys = hrs / 24
         
         # Move to new line after progress bar
-        print()
-        print(f"Films analyzed: {films_num}")
+        progress.finish()
+        print(f"Films analyzed: {len(film_urls)}")
         print(f"Total time: {total_time:.1f}s")
-        print(f"Speed: {films_num/total_time:.1f} films/second")
-        print(f"Time per film: {total_time/films_num:.3f}s")
+        if self.not_modified_count:
+            print(f"Pages not modified since last run: {self.not_modified_count}")
+        if film_urls:
+            print(f"Speed: {len(film_urls)/total_time:.1f} films/second")
+            print(f"Time per film: {total_time/len(film_urls):.3f}s")
+        finish_run(self.metrics, self.app_context.config, username, profile='optimized', films=len(film_urls))
         
         # Set meta data
         try:
@@ -412,6 +330,9 @@ class LetterboxdScraper:
             scraped_when = ""
         
         self.app_context.stats_data.set_meta_data(films_num, hrs, dys, scraped_when)
+        index_profile(self.app_context, username)
+        if self.checkpoint:
+            self.checkpoint.discard()
         
         return {
             'films_num': films_num,
@@ -0,0 +1,43 @@
+"""
+Scraper factory.
+Maps scraper profiles to their implementations, importing only the one that is used.
+"""
+import logging
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCRAPER_PROFILES = ('legacy', 'optimized', 'async')
+
+
+def create_scraper(app_context, profile=None):
+    """Create the scraper for a profile (default: the configured scraperProfile)."""
+    profile = profile or app_context.config.scraper_profile
+    if profile == "legacy":
+        from .scraper_legacy import LegacyLetterboxdScraper
+        return LegacyLetterboxdScraper(app_context)
+    if profile == "async":
+        from .scraper_async import AsyncLetterboxdScraper
+        return AsyncLetterboxdScraper(app_context)
+    if profile != "optimized":
+        logger.warning(f"Unknown scraper profile '{profile}', using the optimized scraper")
+    from .scraper_optimized import LetterboxdScraper
+    return LetterboxdScraper(app_context)
+
+
+def run_scrape(scraper, stats_data, username, incremental=False):
+    """
+    Scrape one profile into stats_data. Returns False if it could not be analyzed
+    (user not found, site unreachable), in which case callers should not treat the
+    statistics as a new result.
+    """
+    # Scrapers only stamp the result date once an analysis has completed, so the stamp
+    # of a result loaded for an incremental run must not pass for a new one
+    previous_stamp = stats_data.gui_scraped_at
+    stats_data.gui_scraped_at = ""
+    scraper.scrape_user_profile(username, incremental=incremental)
+    if stats_data.gui_scraped_at:
+        return True
+    stats_data.gui_scraped_at = previous_stamp
+    return False
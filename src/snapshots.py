@@ -0,0 +1,83 @@
+"""
+Live result snapshots.
+Publishes throttled, ranked copies of the statistics while a scrape is running so a
+frontend can show partial results before the analysis completes.
+"""
+import time
+import logging
+import threading
+from .data_models import CATEGORY_FIELDS, InternedCounter
+from .ranking import top_items
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def take_snapshot(stats_data, films_count, limit=None):
+    """
+    Build a snapshot of the current statistics:
+    {'films': films_count, 'decade_dict': [...], <counter attribute>: [(name, count), ...]}
+    with every list ranked and cut to limit entries. Counts are copied under the stats lock
+    and ranked afterwards, so scrapers are only blocked for the copy.
+    """
+    attrs = [attr for _, attr in CATEGORY_FIELDS] + ['decade_dict']
+    with stats_data.lock:
+        copies = [
+            (attr, getattr(stats_data, attr).vocabulary(), getattr(stats_data, attr).counts[:])
+            for attr in attrs
+        ]
+    snapshot = {'films': films_count}
+    for attr, names, counts in copies:
+        snapshot[attr] = top_items(InternedCounter.from_counts(names, counts), limit)
+    return snapshot
+
+
+class SnapshotPublisher:
+    """
+    Throttles snapshots of one analysis. Scrapers call films_added() after counting films;
+    a snapshot is passed to the callback at most every `interval` seconds or every
+    `every` films, whichever comes first. Safe to call from several threads.
+    """
+
+    def __init__(self, stats_data, callback, limit=None, every=100, interval=0.25):
+        self.stats_data = stats_data
+        self.callback = callback
+        self.limit = limit
+        self.every = every
+        self.interval = interval
+        # Incremental runs start from the films of the previous result
+        self.films = stats_data.films_count
+        self._pending = 0
+        self._last_publish = time.monotonic()
+        self._lock = threading.Lock()
+
+    def films_added(self, count=1):
+        """Record newly counted films and publish a snapshot if one is due."""
+        with self._lock:
+            self.films += count
+            self._pending += count
+            now = time.monotonic()
+            if self._pending < self.every and now - self._last_publish < self.interval:
+                return
+            self._pending = 0
+            self._last_publish = now
+            films = self.films
+        self._publish(films)
+
+    def flush(self):
+        """Publish the films counted since the last snapshot, if any."""
+        with self._lock:
+            if not self._pending:
+                return
+            self._pending = 0
+            self._last_publish = time.monotonic()
+            films = self.films
+        self._publish(films)
+
+    def _publish(self, films):
+        try:
+            self.callback(take_snapshot(self.stats_data, films, self.limit))
+        except Exception as e:
+            # A failing frontend must never interrupt the scrape
+            logger.warning(f"Failed to publish results snapshot: {e}")
@@ -0,0 +1,57 @@
+"""
+Shared fixtures: an application context whose files all live in a temporary directory,
+and the benchmark's stand-in server serving a small fixture corpus on a free local port.
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'bench'))
+
+from stand_in_server import FixtureCorpus, StandInServer, StandInSite  # noqa: E402
+
+
+@pytest.fixture
+def app_context(tmp_path, monkeypatch):
+    """A fresh AppContext reading and writing its config, caches and checkpoints under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    from src.context import AppContext
+    context = AppContext()
+    config = context.config
+    config.film_cache_path = str(tmp_path / 'film_cache.sqlite')
+    config.checkpoint_dir = str(tmp_path / 'checkpoints')
+    config.film_index_enabled = False
+    config.parser_processes = 0
+    config.metrics_file = ""
+    config.metrics_port = 0
+    yield context
+    if context._film_cache is not None:
+        context._film_cache.close()
+    if context._validator_store is not None:
+        context._validator_store.close()
+
+
+@pytest.fixture
+def stand_in():
+    """
+    Start stand-in servers: stand_in(films) returns the base URL of one serving that many films,
+    stand_in(site) one serving a prepared StandInSite.
+    """
+    servers = []
+
+    def start(site, **site_options):
+        if isinstance(site, int):
+            site = StandInSite(FixtureCorpus(site), **site_options)
+        server = StandInServer(('127.0.0.1', 0), site)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,122 @@
+"""
+Binary (.lpb) save format: the container itself and statistics saved through it.
+"""
+from array import array
+
+import pytest
+
+from src.binary_format import BinaryFile, is_binary_file, write_file
+from src.checkpoint import COUNTER_ATTRS
+from src.data_manager import StatisticsBinaryHandler, StatisticsCSVHandler
+from src.data_models import StatisticsData
+from src.film_parser import OPTIMIZED_RULES, parse_film_page
+from stand_in_server import FixtureCorpus
+
+
+def test_container_round_trip(tmp_path):
+    path = str(tmp_path / 'blocks.lpb')
+    blocks = {
+        'names': ['Akira Kurosawa', 'Agnès Varda', ''],
+        'empty': [],
+        'counts': array('I', [0, 1, 2 ** 32 - 1]),
+        'small': array('H', [7, 65535]),
+    }
+    write_file(path, {'username': 'someuser', 'films': 3}, blocks)
+
+    assert is_binary_file(path)
+    with BinaryFile(path) as f:
+        assert f.meta == {'username': 'someuser', 'films': 3}
+        assert f.strings('names') == blocks['names']
+        assert f.strings('empty') == []
+        assert f.ints('counts') == blocks['counts']
+        assert f.ints('small') == blocks['small']
+        assert 'missing' not in f
+        with pytest.raises(ValueError):
+            f.strings('counts')
+
+
+def test_container_rejects_nul_in_strings(tmp_path):
+    with pytest.raises(ValueError):
+        write_file(str(tmp_path / 'bad.lpb'), {}, {'names': ['a\x00b']})
+
+
+def test_other_files_are_not_containers(tmp_path):
+    csv_path = tmp_path / 'stats.csv'
+    csv_path.write_text("section,name,count\n")
+    empty_path = tmp_path / 'empty.lpb'
+    empty_path.write_bytes(b"")
+
+    assert not is_binary_file(str(csv_path))
+    for path in (csv_path, empty_path):
+        with pytest.raises(ValueError):
+            BinaryFile(str(path))
+
+
+def _stats(films=40):
+    corpus = FixtureCorpus(films)
+    stats = StatisticsData()
+    records = [(f"https://letterboxd.com/film/{slug}/", parse_film_page(corpus.film_page(slug), 'bs4', OPTIMIZED_RULES))
+               for slug in corpus.slugs]
+    stats.add_film_records(records)
+    for url, _ in records:
+        stats.add_url(url)
+    stats.pending_urls.append("https://letterboxd.com/film/not-downloaded/")
+    hours = sum(film_data['runtime'] for _, film_data in records) / 60
+    stats.set_meta_data(len(records), hours, hours / 24, "17/10/2026")
+    return stats
+
+
+def _content(stats):
+    content = {attr: dict(getattr(stats, attr)) for attr in COUNTER_ATTRS}
+    content.update(films=stats.films_count, hours=round(stats.total_hours, 6), scraped_at=stats.gui_scraped_at,
+                   urls=stats.url_list, pending=stats.pending_urls, table=stats.film_table.to_dict())
+    return content
+
+
+def _save(stats, path):
+    StatisticsBinaryHandler(stats).save_to_binary(
+        'someuser', stats.gui_scraped_at, stats.films_count, stats.total_hours, stats.total_days, path
+    )
+
+
+def test_statistics_round_trip(tmp_path):
+    path = str(tmp_path / 'someuser.lpb')
+    stats = _stats()
+    _save(stats, path)
+
+    loaded = StatisticsData()
+    meta = StatisticsBinaryHandler(loaded).load_from_binary(path)
+    assert (meta.username, meta.films_num, meta.scraped_at) == ('someuser', 40, "17/10/2026")
+    assert loaded.table_complete
+    assert _content(loaded) == _content(stats)
+
+
+def test_binary_and_csv_saves_load_the_same_statistics(tmp_path):
+    stats = _stats()
+    _save(stats, str(tmp_path / 'someuser.lpb'))
+    StatisticsCSVHandler(stats).save_to_csv(
+        'someuser', stats.gui_scraped_at, stats.films_count, stats.total_hours, stats.total_days,
+        str(tmp_path / 'someuser.csv')
+    )
+
+    from_binary = StatisticsData()
+    StatisticsBinaryHandler(from_binary).load_from_binary(str(tmp_path / 'someuser.lpb'))
+    from_csv = StatisticsData()
+    StatisticsCSVHandler(from_csv).load_from_csv(str(tmp_path / 'someuser.csv'))
+    assert _content(from_binary) == _content(from_csv)
+
+
+def test_incomplete_film_table_is_not_saved(tmp_path):
+    path = str(tmp_path / 'someuser.lpb')
+    stats = _stats()
+    # A film counted without a table row, as the legacy scraper counts films
+    stats.add_film_data({'English'}, {'USA'}, {'Drama'}, {'Director A'}, {'Actor A'}, '1990s')
+    expected = {attr: dict(getattr(stats, attr)) for attr in COUNTER_ATTRS}
+    _save(stats, path)
+
+    with BinaryFile(path) as f:
+        assert 'table.urls' not in f
+    loaded = StatisticsData()
+    StatisticsBinaryHandler(loaded).load_from_binary(path)
+    assert not loaded.table_complete
+    assert {attr: dict(getattr(loaded, attr)) for attr in COUNTER_ATTRS} == expected
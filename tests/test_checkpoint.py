@@ -0,0 +1,95 @@
+"""
+Scrape checkpoints: saving, restoring and resuming interrupted scrapes.
+"""
+import os
+
+from src.checkpoint import COUNTER_ATTRS, Checkpointer, checkpoint_path, load_checkpoint
+from src.film_parser import ASYNC_RULES, parse_film_page
+from src.scrapers import create_scraper
+from stand_in_server import FixtureCorpus
+
+
+def _records(count, rules=ASYNC_RULES):
+    corpus = FixtureCorpus(count)
+    return [(f"https://letterboxd.com/film/{slug}/", parse_film_page(corpus.film_page(slug), 'bs4', rules))
+            for slug in corpus.slugs]
+
+
+def _result(stats):
+    """The counted statistics of a scrape, comparable between runs."""
+    result = {attr: dict(getattr(stats, attr)) for attr in COUNTER_ATTRS}
+    result['films'] = stats.films_count
+    result['hours'] = round(stats.total_hours, 6)
+    return result
+
+
+def _save_checkpoint(app_context, profile, records, film_urls):
+    stats = app_context.stats_data
+    stats.add_film_records(records)
+    checkpointer = Checkpointer.for_user(app_context, 'someuser', profile)
+    checkpointer.start(False, 0, 0.0, 0, lambda: film_urls, lambda: [])
+    checkpointer.listing_complete = True
+    checkpointer.save()
+    return checkpointer
+
+
+def test_checkpoint_restores_counted_films(app_context):
+    records = _records(12)
+    film_urls = [url for url, _ in records]
+    _save_checkpoint(app_context, 'async', records[:8], film_urls)
+    expected = _result(app_context.stats_data)
+
+    app_context.stats_data.reset()
+    resume = load_checkpoint(app_context, 'someuser', 'async')
+
+    assert resume is not None
+    assert resume.film_urls == film_urls
+    assert resume.done == set(film_urls[:8])
+    assert resume.done_minutes == sum(film_data['runtime'] for _, film_data in records[:8])
+    assert resume.listing_complete
+    assert _result(app_context.stats_data) == expected
+    assert len(app_context.stats_data.film_table) == 8
+
+
+def test_checkpoint_of_another_profile_is_ignored(app_context):
+    records = _records(6)
+    _save_checkpoint(app_context, 'async', records, [url for url, _ in records])
+    app_context.stats_data.reset()
+
+    assert load_checkpoint(app_context, 'someuser', 'optimized') is None
+    assert len(app_context.stats_data.film_table) == 0
+
+
+def test_checkpoint_is_discarded(app_context):
+    records = _records(3)
+    checkpointer = _save_checkpoint(app_context, 'optimized', records, [url for url, _ in records])
+    checkpointer.discard()
+
+    assert load_checkpoint(app_context, 'someuser', 'optimized') is None
+
+
+def _scrape(app_context, profile):
+    app_context.stats_data.reset()
+    create_scraper(app_context, profile).scrape_user_profile('someuser')
+    return _result(app_context.stats_data)
+
+
+def test_resume_across_profiles_matches_a_clean_run(app_context, stand_in, monkeypatch):
+    config = app_context.config
+    config.base_url = stand_in(90)
+    config.film_cache_enabled = False
+    clean_optimized = _scrape(app_context, 'optimized')
+    clean_async = _scrape(app_context, 'async')
+    # The async rules cap actors, so the two profiles' results differ
+    assert clean_optimized != clean_async
+
+    # An async scrape that stops before discarding its checkpoint, as an interrupted run would
+    config.checkpoint_interval = 1e-9
+    with monkeypatch.context() as patch:
+        patch.setattr(Checkpointer, 'discard', lambda self: None)
+        _scrape(app_context, 'async')
+    assert os.path.exists(checkpoint_path(config, 'someuser'))
+
+    # Resumed by the other profile, it must not mix the async records into the result
+    assert _scrape(app_context, 'optimized') == clean_optimized
+    assert not os.path.exists(checkpoint_path(config, 'someuser'))
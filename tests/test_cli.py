@@ -0,0 +1,46 @@
+"""
+Headless CLI: exit codes and output files of analyses that cannot complete.
+"""
+import shutil
+
+import pytest
+
+from src.cli import analyze_user, main
+from src.scrapers import SCRAPER_PROFILES
+
+
+@pytest.fixture
+def cli_dir(tmp_path, monkeypatch):
+    """Run the CLI from tmp_path, with a config that keeps the film index out of the way."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'cfg').mkdir()
+    (tmp_path / 'cfg' / 'config.txt').write_text("filmIndexEnabled:false\ncheckpointInterval:0\nparserProcesses:0\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize('profile', SCRAPER_PROFILES)
+def test_unknown_user_fails_without_prompting(app_context, stand_in, profile):
+    # stdin is not readable under pytest, so a prompt for another username would raise here
+    app_context.config.base_url = stand_in(10)
+    assert analyze_user(app_context, 'missing', profile) is False
+    assert app_context.stats_data.gui_scraped_at == ""
+
+
+@pytest.mark.parametrize('profile', SCRAPER_PROFILES)
+def test_failed_incremental_run_keeps_the_saved_file(cli_dir, stand_in, profile):
+    base_url = stand_in(30)
+    output = cli_dir / 'out'
+    common = ['--format', 'csv', '-o', str(output), '--base-url', base_url, '--profile', profile, '-q']
+    assert main(['someuser', *common]) == 0
+
+    saved = (output / 'someuser.csv').read_text(encoding='utf-8')
+    shutil.copy(output / 'someuser.csv', output / 'missing.csv')
+    assert main(['missing', '--incremental', *common]) == 1
+    assert (output / 'missing.csv').read_text(encoding='utf-8') == saved
+
+    assert main(['someuser', '--incremental', *common]) == 0
+
+
+def test_unreachable_site_fails(cli_dir):
+    # Nothing listens on port 9 (discard) on the loopback interface
+    assert main(['someuser', '--base-url', 'http://127.0.0.1:9', '--profile', 'legacy', '-q']) == 1
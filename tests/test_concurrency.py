@@ -0,0 +1,97 @@
+"""
+Adaptive (AIMD) concurrency limiter and Retry-After parsing.
+"""
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from src.concurrency import (OUTCOME_ERROR, OUTCOME_OK, OUTCOME_THROTTLED, OUTCOME_TIMEOUT,
+                             AdaptiveConcurrencyLimiter, parse_retry_after)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 5 ") == 5.0
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def _run(limiter, outcomes, latency=0.01):
+    """Acquire and release one slot per outcome."""
+    async def run():
+        for outcome in outcomes:
+            await limiter.acquire()
+            await limiter.release(latency, outcome)
+    asyncio.run(run())
+
+
+def test_initial_limit_is_clamped():
+    assert AdaptiveConcurrencyLimiter(1, min_limit=4).limit == 4
+    assert AdaptiveConcurrencyLimiter(500, max_limit=200).limit == 200
+
+
+def test_successes_grow_the_window_additively():
+    limiter = AdaptiveConcurrencyLimiter(10, max_limit=12)
+    _run(limiter, [OUTCOME_OK] * 10)
+    # About one slot per full window of successes
+    assert 10.9 < limiter.limit < 11.1
+    _run(limiter, [OUTCOME_OK] * 100)
+    assert limiter.limit == 12
+    assert limiter.in_flight == 0
+
+
+def test_throttling_and_timeouts_shrink_the_window_once_per_cooldown():
+    limiter = AdaptiveConcurrencyLimiter(40, min_limit=4, cooldown=60)
+    _run(limiter, [OUTCOME_THROTTLED, OUTCOME_THROTTLED, OUTCOME_TIMEOUT])
+    assert limiter.limit == 20  # A burst of failures counts as one signal
+    assert limiter.throttled_count == 2
+
+    limiter.cooldown = 0
+    _run(limiter, [OUTCOME_TIMEOUT] * 10)
+    assert limiter.limit == 4  # Never below min_limit
+
+
+def test_plain_errors_leave_the_window_alone():
+    limiter = AdaptiveConcurrencyLimiter(16, cooldown=0)
+    _run(limiter, [OUTCOME_ERROR] * 5)
+    assert limiter.limit == 16
+
+
+def test_rising_tail_latency_shrinks_the_window():
+    limiter = AdaptiveConcurrencyLimiter(20, latency_window=40, latency_tolerance=2.0, cooldown=0)
+    _run(limiter, [OUTCOME_OK] * 40, latency=0.01)
+    assert limiter.baseline_p95 == 0.01
+    grown = limiter.limit
+
+    _run(limiter, [OUTCOME_OK] * 20, latency=0.05)
+    assert limiter.limit < grown / 1.9
+    assert limiter.baseline_p95 is None  # Re-measured at the new window size
+
+
+def test_acquire_waits_for_a_free_slot():
+    async def run():
+        limiter = AdaptiveConcurrencyLimiter(4, min_limit=4, max_limit=4)
+        for _ in range(4):
+            await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        await limiter.release(0.01, OUTCOME_OK)
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 4
+    asyncio.run(run())
+
+
+def test_retry_after_pauses_new_requests():
+    async def run():
+        limiter = AdaptiveConcurrencyLimiter(8)
+        await limiter.acquire()
+        await limiter.release(0.01, OUTCOME_THROTTLED, retry_after=0.3)
+        start = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - start
+    assert asyncio.run(run()) >= 0.25
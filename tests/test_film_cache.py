@@ -0,0 +1,174 @@
+"""
+Persistent film cache: records keyed by extraction rules, TTL expiry, LRU eviction and
+buffered access times.
+"""
+import sqlite3
+
+import pytest
+
+from src import film_cache
+from src.film_cache import CACHE_SCHEMA_VERSION, FilmCache, film_key
+from src.scrapers import create_scraper
+
+RECORD = {
+    'languages': {'English'}, 'countries': {'USA', 'UK'}, 'genres': {'Drama'},
+    'directors': {'Director A'}, 'actors': {'Actor A', 'Actor B'},
+    'year': 1999, 'decade': '1990s', 'runtime': 120,
+}
+
+
+class Clock:
+    """Stand-in for time.time in the cache module."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(film_cache.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'film_cache.sqlite')
+
+
+def _url(slug):
+    return f"https://letterboxd.com/film/{slug}/"
+
+
+def test_film_key_ignores_host_and_query():
+    assert film_key("https://letterboxd.com/film/seven-samurai/?ref=x") == "/film/seven-samurai/"
+    assert film_key("http://127.0.0.1:8000/film/seven-samurai/") == "/film/seven-samurai/"
+
+
+def test_record_round_trip(cache_path, clock):
+    cache = FilmCache(cache_path)
+    assert cache.get(_url('a'), 'async') is None
+    cache.put(_url('a'), 'async', RECORD)
+
+    assert cache.get(_url('a'), 'async') == RECORD
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    # Records survive reopening
+    cache = FilmCache(cache_path)
+    assert cache.get(_url('a'), 'async') == RECORD
+    cache.close()
+
+
+def test_records_are_kept_apart_per_extraction_rules(cache_path, clock):
+    cache = FilmCache(cache_path)
+    capped = dict(RECORD, actors={'Actor A'})
+    cache.put(_url('a'), 'async', capped)
+
+    assert cache.get(_url('a'), 'optimized') is None
+    cache.put(_url('a'), 'optimized', RECORD)
+    assert cache.get(_url('a'), 'async') == capped
+    assert cache.get(_url('a'), 'optimized') == RECORD
+    cache.close()
+
+
+def test_expired_records_are_misses_until_revalidated(cache_path, clock):
+    cache = FilmCache(cache_path, ttl_seconds=100)
+    cache.put(_url('a'), 'async', RECORD)
+    clock.now += 101
+
+    assert cache.get(_url('a'), 'async') is None
+    assert cache.get(_url('a'), 'async', allow_stale=True) == RECORD
+    # Storing the record again (after a 304) restarts its TTL
+    cache.put(_url('a'), 'async', RECORD)
+    assert cache.get(_url('a'), 'async') == RECORD
+    cache.close()
+
+
+def test_prune_drops_records_past_twice_the_ttl(cache_path, clock):
+    cache = FilmCache(cache_path, ttl_seconds=100)
+    cache.put(_url('old'), 'async', RECORD)
+    clock.now += 150
+    cache.put(_url('new'), 'async', RECORD)
+    clock.now += 60
+    cache.prune()
+
+    assert cache.get(_url('old'), 'async', allow_stale=True) is None
+    assert cache.get(_url('new'), 'async', allow_stale=True) == RECORD
+    cache.close()
+
+
+def test_least_recently_used_records_are_evicted(cache_path, clock):
+    cache = FilmCache(cache_path, max_entries=3)
+    for slug in 'abc':
+        clock.now += 1
+        cache.put(_url(slug), 'async', RECORD)
+    clock.now += 1
+    assert cache.get(_url('a'), 'async') is not None  # 'b' is now the least recently used
+
+    clock.now += 1
+    cache.put(_url('d'), 'async', RECORD)
+    assert [slug for slug in 'abcd' if cache.get(_url(slug), 'async')] == ['a', 'c', 'd']
+    cache.close()
+
+
+def test_access_times_are_written_in_batches(cache_path, clock, monkeypatch):
+    monkeypatch.setattr(film_cache, 'ACCESS_FLUSH_SIZE', 3)
+    cache = FilmCache(cache_path)
+    for slug in 'abc':
+        cache.put(_url(slug), 'async', RECORD)
+
+    def last_access(slug):
+        return cache.conn.execute(
+            "SELECT last_access FROM films WHERE slug = ?", (film_key(_url(slug)),)
+        ).fetchone()[0]
+
+    clock.now += 10
+    cache.get(_url('a'), 'async')
+    cache.get(_url('b'), 'async')
+    assert last_access('a') == clock.now - 10  # Buffered
+    cache.get(_url('c'), 'async')
+    assert last_access('a') == clock.now  # The third hit wrote the batch
+
+    clock.now += 10
+    cache.get(_url('a'), 'async')
+    cache.flush()
+    assert last_access('a') == clock.now
+    cache.close()
+
+
+def test_cache_from_before_rules_keying_is_dropped(cache_path):
+    conn = sqlite3.connect(cache_path)
+    conn.execute("CREATE TABLE films (slug TEXT PRIMARY KEY, record TEXT NOT NULL, "
+                 "stored_at REAL NOT NULL, last_access REAL NOT NULL)")
+    conn.execute("INSERT INTO films VALUES ('/film/a/', '{}', 0, 0)")
+    conn.commit()
+    conn.close()
+
+    cache = FilmCache(cache_path)
+    assert cache.conn.execute("PRAGMA user_version").fetchone()[0] == CACHE_SCHEMA_VERSION
+    assert cache.get(_url('a'), 'async', allow_stale=True) is None
+    cache.put(_url('a'), 'async', RECORD)
+    assert cache.get(_url('a'), 'async') == RECORD
+    cache.close()
+
+
+def _actor_credits(app_context, profile):
+    app_context.stats_data.reset()
+    create_scraper(app_context, profile).scrape_user_profile('someuser')
+    return sum(app_context.stats_data.actor_dict.values())
+
+
+def test_profiles_sharing_a_cache_keep_their_own_records(app_context, stand_in):
+    app_context.config.base_url = stand_in(80)
+    app_context.config.film_cache_enabled = False
+    clean = {profile: _actor_credits(app_context, profile) for profile in ('async', 'optimized')}
+    assert clean['async'] < clean['optimized']  # Only the async rules cap actors
+
+    app_context.config.film_cache_enabled = True
+    for profile in ('async', 'optimized', 'async', 'optimized'):
+        assert _actor_credits(app_context, profile) == clean[profile], profile
+    assert app_context.film_cache.hits >= 160  # The second round came from the cache
@@ -0,0 +1,102 @@
+"""
+Incremental runs: a saved result is extended with the films added since, and films a run
+could not download are retried instead of being taken for analyzed ones.
+"""
+import pytest
+
+from src.checkpoint import COUNTER_ATTRS
+from src.data_manager import StatisticsCSVHandler
+from src.scrapers import SCRAPER_PROFILES, create_scraper
+from stand_in_server import FILM_PATTERN, FixtureCorpus, StandInSite
+
+
+class EditableSite(StandInSite):
+    """A stand-in site whose listed films and missing film pages change between runs."""
+
+    def __init__(self, films):
+        super().__init__(FixtureCorpus(films))
+        self.all_slugs = list(self.corpus.slugs)
+        self.missing = set()
+
+    def list_films(self, slugs):
+        self.corpus.slugs = list(slugs)
+        self.corpus.slug_set = set(slugs)
+
+    def respond(self, path, if_none_match=None, accept_encoding=None):
+        match = FILM_PATTERN.match(path)
+        if match and match.group(1) in self.missing:
+            return 404, self.corpus.not_found_page, None
+        return super().respond(path, if_none_match, accept_encoding)
+
+
+def _result(stats):
+    result = {attr: dict(getattr(stats, attr)) for attr in COUNTER_ATTRS}
+    result['films'] = stats.films_count
+    result['hours'] = round(stats.total_hours, 6)
+    result['urls'] = sorted(stats.url_list)
+    return result
+
+
+def _scrape(app_context, profile, incremental=False):
+    if not incremental:
+        app_context.stats_data.reset()
+    create_scraper(app_context, profile).scrape_user_profile('someuser', incremental=incremental)
+    return _result(app_context.stats_data)
+
+
+def _save_and_reload(app_context, tmp_path):
+    stats = app_context.stats_data
+    path = str(tmp_path / 'someuser.csv')
+    handler = StatisticsCSVHandler(stats)
+    handler.save_to_csv('someuser', stats.gui_scraped_at, stats.films_count, stats.total_hours,
+                        stats.total_days, path)
+    handler.load_from_csv(path)
+
+
+@pytest.fixture
+def site(app_context, stand_in):
+    site = EditableSite(150)
+    app_context.config.base_url = stand_in(site)
+    app_context.config.film_cache_enabled = False
+    return site
+
+
+@pytest.mark.parametrize('profile', SCRAPER_PROFILES)
+def test_incremental_run_adds_the_new_films(app_context, site, profile, tmp_path):
+    clean = _scrape(app_context, profile)
+
+    # Listings are newest first: the first 40 films are added after the saved run
+    site.list_films(site.all_slugs[40:])
+    _scrape(app_context, profile)
+    assert app_context.stats_data.films_count == 110
+    _save_and_reload(app_context, tmp_path)
+
+    site.list_films(site.all_slugs)
+    assert _scrape(app_context, profile, incremental=True) == clean
+
+
+@pytest.mark.parametrize('profile', SCRAPER_PROFILES)
+def test_failed_films_are_retried_by_the_next_incremental_run(app_context, site, profile, tmp_path):
+    clean = _scrape(app_context, profile)
+    base_url = app_context.config.base_url
+    # One film near the top of the listing and one deep inside it
+    site.missing = {site.all_slugs[3], site.all_slugs[120]}
+    failed_urls = [f"{base_url}/film/{slug}/" for slug in sorted(site.missing)]
+
+    _scrape(app_context, profile)
+    stats = app_context.stats_data
+    assert stats.films_count == 148
+    assert sorted(stats.pending_urls) == failed_urls
+    assert not stats.url_set & set(failed_urls)
+
+    _save_and_reload(app_context, tmp_path)
+    assert sorted(app_context.stats_data.pending_urls) == failed_urls
+
+    # Still missing: the films stay pending and nothing is counted twice
+    _scrape(app_context, profile, incremental=True)
+    assert app_context.stats_data.films_count == 148
+    assert sorted(app_context.stats_data.pending_urls) == failed_urls
+
+    site.missing = set()
+    assert _scrape(app_context, profile, incremental=True) == clean
+    assert app_context.stats_data.pending_urls == []
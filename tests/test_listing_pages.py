@@ -0,0 +1,75 @@
+"""
+Listing pages: pagination detection and the payloads stored with their validators.
+"""
+import logging
+
+from src.film_cache import ValidatorStore
+from src.film_parser import parse_listing_page
+from src.scrapers import create_scraper
+from stand_in_server import FixtureCorpus
+
+BASE_URL = "https://letterboxd.com"
+
+
+def test_parse_listing_page_detects_the_next_page():
+    corpus = FixtureCorpus(150)  # Three listing pages
+    film_urls, has_next, last_page = parse_listing_page(corpus.listing_page('someuser', 1), BASE_URL)
+
+    assert film_urls == [f"{BASE_URL}/film/{slug}/" for slug in corpus.slugs[:72]]
+    assert has_next
+    assert last_page == 3
+
+
+def test_parse_listing_page_ignores_the_disabled_next_button():
+    corpus = FixtureCorpus(150)
+    page = corpus.listing_page('someuser', 3)
+    assert b'<span class="next">' in page
+
+    film_urls, has_next, last_page = parse_listing_page(page, BASE_URL)
+    assert len(film_urls) == 150 - 2 * 72
+    assert not has_next
+    assert last_page == 3
+
+
+def test_listing_payload_round_trip(tmp_path):
+    store = ValidatorStore(str(tmp_path / 'cache.sqlite'))
+    url = f"{BASE_URL}/someuser/films/"
+    store.put_listing(url, '"etag"', None, [f"{BASE_URL}/film/a/"], True, 4)
+
+    assert store.get_listing(url) == ('"etag"', None, ([f"{BASE_URL}/film/a/"], True, 4))
+    store.close()
+
+
+def test_unversioned_listing_payload_is_not_reused(tmp_path):
+    # Payloads written before listings were parsed by one shared parser
+    store = ValidatorStore(str(tmp_path / 'cache.sqlite'))
+    url = f"{BASE_URL}/someuser/films/page/3/"
+    store.put(url, '"etag"', None, payload=[[f"{BASE_URL}/film/a/"], True, None])
+
+    assert store.get_listing(url) is None
+    assert store.get(url)[0] == '"etag"'
+    store.close()
+
+
+def _scrape(app_context, profile):
+    app_context.stats_data.reset()
+    scraper = create_scraper(app_context, profile)
+    scraper.scrape_user_profile('someuser')
+    return scraper, sum(app_context.stats_data.actor_dict.values())
+
+
+def test_listing_payloads_are_shared_between_profiles(app_context, stand_in, caplog):
+    app_context.config.base_url = stand_in(150)
+    _, clean_actors = _scrape(app_context, 'optimized')
+    with app_context.validator_store.conn:
+        app_context.validator_store.conn.execute("DELETE FROM validators")
+
+    # The async run stores the listing payloads the optimized run then revalidates
+    _scrape(app_context, 'async')
+    with caplog.at_level(logging.ERROR):
+        scraper, actors = _scrape(app_context, 'optimized')
+
+    assert not caplog.records, [record.getMessage() for record in caplog.records]
+    assert scraper.not_modified_count == 2  # Pages 2 and 3: the async profile stores page 1 as /films/
+    assert actors == clean_actors
+    assert app_context.stats_data.films_count == 150
@@ -0,0 +1,56 @@
+"""
+Parser backend parity: every extractor backend must build exactly the record the
+BeautifulSoup reference builds, under each scraper's extraction rules.
+"""
+import pytest
+
+from src.film_parser import EXTRACTION_RULES, PARSER_BACKENDS, SelectolaxParser, parse_film_page
+from stand_in_server import FixtureCorpus
+
+# Pages exercising the rule differences: JSON-LD only years, foreign @types, split footers
+EDGE_PAGES = {
+    'ld-json-year': (
+        b'<html><head><script type="application/ld+json">'
+        b'{"@type":"Movie","releasedEvent":[{"startDate":"1975-03-01"}]}</script></head>'
+        b'<body><span class="releasedate"><a></a></span></body></html>'
+    ),
+    'ld-json-foreign-type': (
+        b'<html><head><script type="application/ld+json">{"@type":"TVSeries","dateCreated":"1999"}</script>'
+        b'</head><body><p class="text-link text-footer"><span>95</span>mins</p></body></html>'
+    ),
+    'third-ld-json-script': (
+        b'<html><head><script type="application/ld+json">{}</script>'
+        b'<script type="application/ld+json">not json</script>'
+        b'<script type="application/ld+json">{"@type":"Movie","datePublished":"2004"}</script></head></html>'
+    ),
+}
+
+
+def _pages():
+    corpus = FixtureCorpus(60)
+    pages = {slug: corpus.film_page(slug) for slug in corpus.slugs}
+    pages.update(EDGE_PAGES)
+    return pages
+
+
+PAGES = _pages()
+BACKENDS = [
+    pytest.param(backend, marks=pytest.mark.skipif(
+        backend == 'selectolax' and SelectolaxParser is None, reason="selectolax is not installed"))
+    for backend in PARSER_BACKENDS if backend != 'bs4'
+]
+
+
+@pytest.mark.parametrize('rules', sorted(EXTRACTION_RULES))
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_backend_matches_bs4(backend, rules):
+    rules = EXTRACTION_RULES[rules]
+    for slug, page in PAGES.items():
+        assert parse_film_page(page, backend, rules) == parse_film_page(page, 'bs4', rules), slug
+
+
+def test_rules_keep_their_actor_limits():
+    # Stand-in films list up to 40 actors: only the async rules cap them
+    page = max(PAGES.values(), key=lambda page: page.count(b'/actor/'))
+    assert len(parse_film_page(page, 'bs4', EXTRACTION_RULES['async'])['actors']) == 20
+    assert len(parse_film_page(page, 'bs4', EXTRACTION_RULES['optimized'])['actors']) > 20
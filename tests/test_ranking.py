@@ -0,0 +1,68 @@
+"""
+Counter ranking: top-K selection and the rankings InternedCounters cache.
+"""
+import random
+from array import array
+
+import pytest
+
+from src import ranking
+from src.data_models import InternedCounter
+from src.ranking import top_ids, top_items
+
+
+def _reference(counter, k=None):
+    """Stable full sort: count descending, then first-interned first."""
+    ranked = sorted(((name, count) for name, count in counter.items() if count), key=lambda x: x[1], reverse=True)
+    return ranked if k is None else ranked[:k]
+
+
+def _counter(size, seed=0):
+    rng = random.Random(seed)
+    return InternedCounter({f"name {i}": rng.randint(0, 30) for i in range(size)})
+
+
+@pytest.mark.parametrize('k', [None, -1, 0, 1, 5, 50, 10000])
+def test_top_items_matches_a_full_sort(k):
+    counter = _counter(300)
+    expected = _reference(counter, None if k is None or k < 0 else k)
+    assert top_items(counter, k) == expected
+    assert top_items(dict(counter.items()), k) == expected
+
+
+@pytest.mark.skipif(ranking.numpy is None, reason="numpy is not installed")
+@pytest.mark.parametrize('k', [None, 1, 100, 5000])
+def test_numpy_selection_matches_heapq(k, monkeypatch):
+    counts = array('I', (random.Random(1).randint(0, 50) for _ in range(ranking.NUMPY_MIN_SIZE * 2)))
+    with_numpy = top_ids(counts, k)
+    monkeypatch.setattr(ranking, 'numpy', None)
+    assert with_numpy == top_ids(counts, k)
+
+
+def test_ranking_is_cached_until_the_counts_change():
+    counter = _counter(100)
+    first = counter.ranked(10)
+    assert counter.ranked(10) == first
+    # A longer cached ranking answers shorter requests
+    full = counter.ranked()
+    assert counter.ranked(3) == full[:3]
+
+    counter['new name'] = 1000
+    assert counter.ranked(1) == [('new name', 1000)]
+    del counter['new name']
+    assert counter.ranked(10) == first
+    counter.add_ids([counter.intern('name 0')], 100)
+    assert counter.ranked(1)[0][0] == 'name 0'
+
+
+def test_ranked_results_are_copies():
+    counter = _counter(20)
+    ranked = counter.ranked()
+    ranked.clear()
+    assert counter.ranked() == _reference(counter)
+
+
+def test_most_common_follows_counter_semantics():
+    counter = InternedCounter({'a': 2, 'b': 5, 'c': 0})
+    assert counter.most_common() == [('b', 5), ('a', 2)]
+    assert counter.most_common(1) == [('b', 5)]